@@ -13,6 +13,7 @@
 
 import os
 import json
+import codecs
 import glob
 import re
 import mimetypes
@@ -24,12 +25,19 @@
 import fnmatch
 import asyncio
 import subprocess
-from typing import Dict, List, Any, Optional, Union, Tuple, Annotated, Callable
+import stat
+import sys
+import importlib.util
+from typing import Dict, List, Any, Optional, Union, Tuple, Annotated, Callable, Sequence
 import tempfile
-from functools import wraps
+from functools import wraps, lru_cache
 import zipfile
 import tarfile
 import hashlib
+import mmap
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # 定义类型别名
 # 使用Any代替Callable以避免Pydantic JSON Schema生成问题
@@ -55,6 +63,99 @@
     PYGMENTS_AVAILABLE = False
     print("警告：未能导入 pygments，代码高亮功能将不可用。请运行 'pip install Pygments' 安装。")
 
+# 尝试导入 orjson 用于加速 JSON 序列化/解析
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("提示：未能导入 orjson，JSON 读写将使用标准库 json。可运行 'pip install orjson' 安装。")
+
+# cdifflib 提供 C 实现的 SequenceMatcher，计算文件相似度时比纯 Python 的 difflib 快得多
+try:
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+    CDIFFLIB_AVAILABLE = True
+except ImportError:
+    from difflib import SequenceMatcher
+    CDIFFLIB_AVAILABLE = False
+    print("提示：未能导入 cdifflib，文件比较将使用纯 Python 的 difflib。可运行 'pip install cdifflib' 安装。")
+
+# 非加密哈希（用于变更检测、去重等场景），比 SHA-256 快得多
+_FAST_HASHERS: Dict[str, Callable[[], Any]] = {}
+try:
+    import xxhash
+    _FAST_HASHERS.update({"xxh3": xxhash.xxh3_64, "xxh64": xxhash.xxh64, "xxh128": xxhash.xxh3_128})
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    print("提示：未能导入 xxhash，文件哈希将不支持 'xxh3'/'xxh64'/'xxh128' 算法。可运行 'pip install xxhash' 安装。")
+
+try:
+    import blake3
+    _FAST_HASHERS["blake3"] = blake3.blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+    print("提示：未能导入 blake3，文件哈希将不支持 'blake3' 算法。可运行 'pip install blake3' 安装。")
+
+# aiofile 基于 caio，在 Linux 上使用内核异步 I/O（io_uring/libaio）读取文件，大文件读取无需占用线程池
+try:
+    from aiofile import async_open
+    AIOFILE_AVAILABLE = True
+except ImportError:
+    AIOFILE_AVAILABLE = False
+    print("提示：未能导入 aiofile，大文件读取将在线程池中进行。可运行 'pip install aiofile' 安装。")
+
+# fastcrc 提供基于 PCLMULQDQ 指令的 CRC-32 实现，吞吐量远高于 zlib.crc32
+try:
+    import fastcrc
+    FASTCRC_AVAILABLE = True
+except ImportError:
+    FASTCRC_AVAILABLE = False
+    print("提示：未能导入 fastcrc，'crc32' 文件哈希将使用标准库 zlib。可运行 'pip install fastcrc' 安装。")
+
+# zlib-ng 与 zlib 接口兼容、输出格式相同，压缩速度快 2~3 倍。
+# zipfile 通过其模块属性 zlib 创建压缩器。为了不影响进程中其他 ZipFile 的使用者（如 openpyxl、python-docx），
+# 不修改标准库的 zipfile，而是另外加载一份独立的 zipfile 模块（见 _load_zipfile_with_zlib_ng），只用于 create_archive 写 ZIP
+def _load_zipfile_with_zlib_ng(zlib_module: Any) -> Any:
+    """加载一份独立于标准库 zipfile 的模块副本，并让它的压缩器使用 zlib_module。"""
+    stdlib_spec = importlib.util.find_spec('zipfile')
+    spec = importlib.util.spec_from_file_location(
+        '_file_utils_zipfile_ng', stdlib_spec.origin,
+        submodule_search_locations=stdlib_spec.submodule_search_locations
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # 包形式的 zipfile（3.12+）导入子模块时需要能找到父模块
+    spec.loader.exec_module(module)
+    module.zlib = zlib_module
+    return module
+
+
+try:
+    from zlib_ng import zlib_ng, gzip_ng
+    _zip_writer = _load_zipfile_with_zlib_ng(zlib_ng)
+    ZLIB_NG_AVAILABLE = True
+except ImportError:
+    _zip_writer = zipfile
+    ZLIB_NG_AVAILABLE = False
+    print("提示：未能导入 zlib-ng，创建 zip/tar.gz 压缩文件将使用标准库 zlib。可运行 'pip install zlib-ng' 安装。")
+
+# ISA-L 的 igzip_threaded 在后台线程中用 SIMD 解压 gzip，调用方处理上一块数据时下一块已在解压
+try:
+    from isal import igzip_threaded
+    ISAL_AVAILABLE = True
+except ImportError:
+    ISAL_AVAILABLE = False
+    print("提示：未能导入 isal，解压 tar.gz 文件将使用标准库 gzip。可运行 'pip install isal' 安装。")
+
+# pygit2（libgit2 绑定）可在进程内直接读取引用和提交，只读查询无需启动 git 子进程
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+    print("提示：未能导入 pygit2，Git 只读查询将通过 git 命令行执行。可运行 'pip install pygit2' 安装。")
+
 # 导入 AutoGen 相关模块
 try:
     from autogen_core.tools import FunctionTool
@@ -133,14 +234,448 @@ def __call__(self, *args, **kwargs):
     print("提示：未能导入 xml.etree.ElementTree，处理 .xml 文件的功能将受限（通常为标准库）。")
 
 
+def _json_separators(indent: Optional[int]) -> Tuple[str, str]:
+    """不缩进时使用最紧凑的分隔符，与 orjson 的输出保持一致。"""
+    return (',', ':') if indent is None else (',', ': ')
+
+
+def _json_dumps(content: Any, indent: Optional[int] = 2, ensure_ascii: bool = False) -> bytes:
+    """
+    将 Python 对象序列化为 UTF-8 编码的 JSON 字节串，优先使用 orjson。
+
+    orjson 直接输出 bytes，调用方可原样写盘，无需再经过 str 的编码/解码。
+    orjson 只支持 2 空格缩进且从不转义非 ASCII 字符，因此只有在 indent 为 None 或 2
+    且 ensure_ascii=False 时才走 orjson，其余情况以及 orjson 无法序列化的对象
+    （如超出 64 位的整数）回退到标准库 json。indent 为 None 时两种实现都输出紧凑格式（无空格分隔符）。
+    """
+    if ORJSON_AVAILABLE and not ensure_ascii and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS  # 与 json.dumps 一样允许非字符串键
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(content, option=option)
+        except TypeError:  # orjson.JSONEncodeError 是 TypeError 的子类
+            pass
+    return json.dumps(content, ensure_ascii=ensure_ascii, indent=indent, separators=_json_separators(indent)).encode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _compile_glob_patterns(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    将一组 fnmatch 通配符合并编译为单个正则，编译结果按模式元组缓存。
+
+    与 fnmatch.fnmatch 一致，模式会经过 os.path.normcase，匹配时调用方也应对名称做 normcase。
+    """
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+def _peek_json_root_type(file_path: str) -> Optional[type]:
+    """
+    只读取文件开头的少量字节，判断 JSON 顶层容器的类型。
+
+    Returns:
+        list 或 dict；文件为空或顶层不是数组/对象时返回 None。
+    """
+    with open(file_path, 'rb') as file:
+        head = file.read(4096)
+        if head.startswith(codecs.BOM_UTF8):
+            head = head[len(codecs.BOM_UTF8):]
+        while head and not head.lstrip(b' \t\r\n'):
+            head = file.read(4096)
+    first = head.lstrip(b' \t\r\n')[:1]
+    if first == b'[':
+        return list
+    if first == b'{':
+        return dict
+    return None
+
+
+def _create_temp_for(file_path: str) -> Tuple[int, str]:
+    """
+    在目标文件所在目录以 O_EXCL 创建唯一的临时文件，返回 (文件描述符, 临时文件路径)。
+
+    临时文件以 0o666 创建，由内核按 umask 得到新文件的默认权限；目标已存在时改为与目标相同的权限。
+    """
+    directory = os.path.dirname(file_path) or '.'
+    prefix = os.path.basename(file_path)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        temp_path = os.path.join(directory, f"{prefix}.{os.urandom(6).hex()}.tmp")
+        try:
+            fd = os.open(temp_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+    except FileNotFoundError:
+        pass
+    except BaseException:
+        os.close(fd)
+        os.remove(temp_path)
+        raise
+    return fd, temp_path
+
+
+def _splice_json_array_tail(file_path: str, items_json: bytes, indent: Optional[int], ensure_final_newline: bool) -> bool:
+    """
+    在不解析整个文件的前提下，把新元素拼接到顶层 JSON 数组的末尾。
+
+    原文件最后一个 ']' 之前的内容按块复制到同目录的临时文件，再写入新元素并 fsync 后替换原文件，
+    中途崩溃或磁盘写满时原文件保持不变。
+
+    Args:
+        file_path: 顶层为数组的 JSON 文件路径
+        items_json: 新元素序列化后的 JSON 数组字节串（含外层方括号）
+        indent: 序列化时使用的缩进，用于决定收尾方括号的排版
+        ensure_final_newline: 是否在文件末尾保留换行符
+
+    Returns:
+        成功拼接返回 True；文件不以 '[' 开头或末尾不是 ']'（即不是顶层数组）时返回 False，文件保持不变。
+    """
+    whitespace = b' \t\r\n'
+    inner = items_json.strip(whitespace)[1:-1].rstrip(whitespace)  # 去掉新数组的外层方括号
+    file_path = os.path.realpath(file_path)
+    if _peek_json_root_type(file_path) is not list:
+        return False
+    with open(file_path, 'rb') as file:
+        size = file.seek(0, os.SEEK_END)
+        window = 4096
+        while True:
+            start = max(0, size - window)
+            file.seek(start)
+            tail = file.read().rstrip(whitespace)
+            if not tail.endswith(b']'):
+                return False
+            before_bracket = tail[:-1].rstrip(whitespace)
+            if before_bracket or start == 0:
+                break
+            window *= 2  # 右方括号前全是空白，扩大窗口继续向前查找
+        if not before_bracket:
+            return False
+        separator = b'' if before_bracket.endswith(b'[') else b','
+        fd, temp_path = _create_temp_for(file_path)
+        try:
+            with open(fd, 'wb') as temp_file:
+                file.seek(0)
+                remaining = start + len(before_bracket)
+                while remaining:
+                    chunk = file.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        raise OSError(f"读取 {file_path} 时文件被截断")
+                    temp_file.write(chunk)
+                    remaining -= len(chunk)
+                temp_file.write(separator + inner + (b'\n]' if indent else b']') + (b'\n' if ensure_final_newline else b''))
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+    return True
+
+
+def _collect_archive_members(src_path: str) -> List[Tuple[str, str]]:
+    """
+    遍历一个压缩源路径，返回要写入压缩包的 (文件绝对路径, 包内名称) 列表。
+
+    目录会递归展开，包内名称相对于目录的父目录（即保留目录名本身）；单个文件使用其文件名。
+    """
+    if not os.path.isdir(src_path):
+        return [(src_path, os.path.basename(src_path))]
+    parent_dir = os.path.dirname(src_path)
+    members = []
+    for root, _, files in os.walk(src_path):
+        for file in files:
+            file_to_add = os.path.join(root, file)
+            members.append((file_to_add, os.path.relpath(file_to_add, parent_dir)))
+    return members
+
+
+def _write_json_stream(
+    file_path: str,
+    content: Any,
+    indent: Optional[int],
+    ensure_ascii: bool,
+    encoding: str,
+    ensure_final_newline: bool
+) -> Tuple[int, int, bool]:
+    """
+    用 json.JSONEncoder.iterencode 逐块序列化并写入文件，不在内存中拼出完整的 JSON 字符串。
+
+    先写入同目录下的唯一临时文件并 fsync，完成后再替换目标文件，序列化中途出错时不会留下半截文件；
+    目标是符号链接时替换的是链接指向的文件，并保留目标文件原有的权限。
+
+    Returns:
+        (写入的字节数, 行数, 是否以换行符结尾)
+    """
+    encoder = json.JSONEncoder(ensure_ascii=ensure_ascii, indent=indent, separators=_json_separators(indent))
+    file_path = os.path.realpath(file_path)
+    fd, temp_path = _create_temp_for(file_path)
+    newline_count = 0
+    last_chunk = ''
+    try:
+        with open(fd, 'w', encoding=encoding, newline='', buffering=1024 * 1024) as file:
+            for chunk in encoder.iterencode(content):
+                if chunk:
+                    newline_count += chunk.count('\n')
+                    last_chunk = chunk
+                    file.write(chunk)
+            ends_with_newline = last_chunk.endswith('\n')
+            if ensure_final_newline and not ends_with_newline:
+                file.write('\n')
+                newline_count += 1
+                ends_with_newline = True
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    line_count = newline_count if ends_with_newline or not last_chunk else newline_count + 1
+    return os.path.getsize(file_path), line_count, ends_with_newline
+
+
+class _Crc32Hasher:
+    """以 hashlib 风格（update/hexdigest）包装 CRC-32，供 get_file_hash 的 'crc32' 算法使用。"""
+
+    def __init__(self):
+        self._value = 0
+
+    def update(self, data: bytes) -> None:
+        self._value = _crc32(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+_FAST_HASHERS["crc32"] = _Crc32Hasher
+
+
+def _crc32(data: bytes, value: int = 0) -> int:
+    """
+    在 value 的基础上继续计算 CRC-32（ZIP 使用的 ISO-HDLC 多项式），fastcrc 可用时使用硬件加速实现。
+
+    fastcrc 的 initial 与 zlib.crc32 的第二个参数含义相同，都是上一段数据的 CRC 结果（已做输出异或），
+    value=0 即从头计算，逐块传入上一块的结果即可得到整段数据的 CRC。
+    """
+    if FASTCRC_AVAILABLE:
+        return fastcrc.crc32.iso_hdlc(data, initial=value)
+    return zlib.crc32(data, value)
+
+
+# 超过此大小的文件计算哈希时使用内存映射
+_MMAP_HASH_THRESHOLD = 8 * 1024 * 1024
+
+
+def _hash_file(file_path: str, algorithm: str) -> str:
+    """
+    增量计算文件哈希，峰值内存只占一个块。不支持的算法抛出 ValueError。
+
+    超过 _MMAP_HASH_THRESHOLD 的文件通过 mmap 直接把页缓存交给哈希函数，不再复制到读缓冲区；
+    其余情况下，Python 3.11+ 使用 hashlib.file_digest，读取与更新循环在 C 层完成（OpenSSL 算法计算时释放 GIL），
+    更早的版本退回到以 1 MiB 块手动 update 的循环。
+    'xxh3'、'xxh64'、'xxh128'、'blake3' 在安装了对应库时使用其流式接口；'crc32' 使用 _crc32（fastcrc 或 zlib.crc32）。
+    """
+    fast_hasher = _FAST_HASHERS.get(algorithm.lower())
+    with open(file_path, 'rb', buffering=0) as file:
+        if os.fstat(file.fileno()).st_size > _MMAP_HASH_THRESHOLD:
+            hasher = fast_hasher() if fast_hasher is not None else hashlib.new(algorithm)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+            return hasher.hexdigest()
+        if fast_hasher is None and hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(file, algorithm).hexdigest()
+        hasher = fast_hasher() if fast_hasher is not None else hashlib.new(algorithm)
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+
+def _common_affix_lengths(a: Sequence[Any], b: Sequence[Any]) -> Tuple[int, int]:
+    """
+    返回两个序列公共前缀和公共后缀的长度（两者不重叠）。
+
+    字符串按切片二分比较（比较在 C 层完成），其他序列（如行列表）逐项比较。
+    """
+    limit = min(len(a), len(b))
+    if isinstance(a, str):
+        low, high = 0, limit
+        while low < high:
+            mid = (low + high + 1) // 2
+            if a[:mid] == b[:mid]:
+                low = mid
+            else:
+                high = mid - 1
+        prefix = low
+        low, high = 0, limit - prefix
+        while low < high:
+            mid = (low + high + 1) // 2
+            if a[len(a) - mid:] == b[len(b) - mid:]:
+                low = mid
+            else:
+                high = mid - 1
+        return prefix, low
+
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+_UNIFIED_HUNK_HEADER = re.compile(r'^@@ -(\d+)((?:,\d+)?) \+(\d+)((?:,\d+)?) @@$')
+
+
+def _unified_diff_trimmed(a: List[str], b: List[str], fromfile: str, tofile: str, n: int) -> str:
+    """
+    生成与 ''.join(difflib.unified_diff(a, b, ...)) 格式相同的差异文本，但先去掉两边相同的开头和结尾再做比较。
+
+    只保留 n 行上下文所需的公共部分，差异算法处理的序列大幅缩短；
+    随后把被去掉的行数加回到每个 hunk 头部的行号上。存在多种等价对齐方式时，
+    选出的对齐可能与对完整文件比较时不同，但差异内容同样正确。
+    """
+    prefix, suffix = _common_affix_lengths(a, b)
+    offset = max(0, prefix - n)
+    keep_suffix = max(0, suffix - n)
+    diff_lines = difflib.unified_diff(a[offset:len(a) - keep_suffix], b[offset:len(b) - keep_suffix], fromfile=fromfile, tofile=tofile, n=n)
+    if not offset:
+        return ''.join(diff_lines)
+
+    def _shift(line: str) -> str:
+        match = _UNIFIED_HUNK_HEADER.match(line.rstrip('\n'))
+        if match is None:
+            return line
+        return f"@@ -{int(match.group(1)) + offset}{match.group(2)} +{int(match.group(3)) + offset}{match.group(4)} @@\n"
+
+    return ''.join(_shift(line) if line.startswith('@@') else line for line in diff_lines)
+
+
+def _chunk_paths(paths: List[str], max_count: int = 4096, max_bytes: int = 128 * 1024) -> List[List[str]]:
+    """
+    把路径列表切分为若干批，每批的路径数和总长度都不超过上限，
+    以便一次命令行调用处理一整批路径而不超出系统的参数长度限制（ARG_MAX / Windows 命令行长度）。
+    """
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_bytes = 0
+    for path in paths:
+        size = len(path.encode('utf-8')) + 1
+        if current and (len(current) >= max_count or current_bytes + size > max_bytes):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(path)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _git_stdin_path(path: str) -> str:
+    """
+    返回可按行写入 git --stdin-paths 的路径。
+
+    Git 把以双引号开头的行当作 C 风格转义的路径，这类路径按同样的规则转义反斜杠和双引号后加上引号，其余路径原样返回。
+    """
+    if not path.startswith('"'):
+        return path
+    return '"' + path.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+# Git 仓库根目录查找缓存：目录绝对路径 -> 所属仓库根目录。只缓存找到仓库的结果，
+# 之后在其他地方新建的仓库不会被旧的"未找到"结果挡住；命中时会确认仓库仍然存在。
+# init/clone 成功后清空，以免沿用旧的查找结果
+_GIT_ROOT_CACHE: Dict[str, str] = {}
+
+
+# 预读 ZIP 条目时，单个文件整体读入内存的大小上限；更大的文件按原方式用 ZipFile.write 流式写入
+_ZIP_PREFETCH_MAX_MEMBER_BYTES = 64 * 1024 * 1024
+
+
+def _read_zip_member(file_path: str, arcname: str) -> Tuple[zipfile.ZipInfo, Optional[bytes]]:
+    """
+    为单个文件生成 ZipInfo（保留修改时间与权限）并读入其内容。
+
+    文件超过 _ZIP_PREFETCH_MAX_MEMBER_BYTES 时不读取，数据返回 None，由调用方用 ZipFile.write 流式写入。
+    """
+    zinfo = _zip_writer.ZipInfo.from_file(file_path, arcname)
+    if zinfo.file_size > _ZIP_PREFETCH_MAX_MEMBER_BYTES:
+        return zinfo, None
+    with open(file_path, 'rb') as file:
+        return zinfo, file.read()
+
+
+def _write_zip_members_prefetched(zf: zipfile.ZipFile, members: List[Tuple[str, str]], compresslevel: Optional[int]) -> None:
+    """
+    在线程池中预读各个文件，主线程按原顺序通过 ZipFile.writestr 压缩并写入 ZIP。
+
+    zf 需由 _zip_writer.ZipFile 创建（ZipInfo 与之来自同一模块）。
+    写入只走 ZipFile 的公开接口，条目登记、重名检查与 ZIP64 处理都由 ZipFile 完成；
+    文件读取与主线程的压缩重叠进行（zlib 压缩时释放 GIL）。
+    同时在途的任务数有上限，内存中最多保留约 2 倍线程数个文件的内容。
+    """
+    workers = os.cpu_count() or 1
+    pending = deque()
+    member_iter = iter(members)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def _submit_next():
+            member = next(member_iter, None)
+            if member is not None:
+                pending.append((member, pool.submit(_read_zip_member, member[0], member[1])))
+
+        for _ in range(workers * 2):
+            _submit_next()
+        while pending:
+            (file_path, arcname), future = pending.popleft()
+            _submit_next()
+            zinfo, data = future.result()
+            if data is None:
+                zf.write(file_path, arcname)
+            else:
+                zf.writestr(zinfo, data, compress_type=zf.compression, compresslevel=compresslevel)
+
+
+def _json_loads(text: Union[str, bytes]) -> Any:
+    """解析 JSON 文本，优先使用 orjson。解析失败时统一抛出 json.JSONDecodeError。"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # 交给标准库给出一致的错误信息（以及对 NaN 等扩展语法的兼容）
+    return json.loads(text)
+
+
 # 只有在 watchdog 可用时才定义 FileChangeHandler 类
 if WATCHDOG_AVAILABLE:
     class FileChangeHandler(FileSystemEventHandler):
-        """文件变更处理器"""
-        def __init__(self, callback: FileChangeCallbackType, path_to_monitor: str):
+        """
+        文件变更处理器
+
+        指定 batch_window 时，事件不再逐个回调：在事件循环上收集窗口期内的所有事件，
+        去掉重复的 (事件类型, 路径) 后以列表形式一次性调用回调。
+        """
+        def __init__(
+            self,
+            callback: FileChangeCallbackType,
+            path_to_monitor: str,
+            batch_window: Optional[float] = None,
+            loop: Optional[asyncio.AbstractEventLoop] = None
+        ):
             self.callback = callback
             self.path_to_monitor = os.path.abspath(path_to_monitor)
             self.last_event_time = {} # 用于处理重复事件
+            self.batch_window = batch_window
+            self._loop = loop
+            self._pending_events = deque()  # 仅在事件循环线程中访问
+            self._flush_handle: Optional[asyncio.TimerHandle] = None
 
         def on_any_event(self, event):
             """处理任何文件系统事件"""
@@ -163,7 +698,28 @@ def on_any_event(self, event):
 
             # 对于重命名事件，event.dest_path 才是新路径
             path_to_report = event.dest_path if event.event_type == 'moved' else event.src_path
-            self.callback(event.event_type, path_to_report)
+            if self.batch_window is None:
+                self.callback(event.event_type, path_to_report)
+                return
+            try:
+                # watchdog 在自己的线程中回调，转交给事件循环线程排队
+                self._loop.call_soon_threadsafe(self._enqueue_event, event.event_type, path_to_report)
+            except RuntimeError:
+                pass  # 事件循环已关闭，丢弃事件
+
+        def _enqueue_event(self, event_type: str, path: str):
+            """在事件循环线程中登记事件；窗口期内的第一个事件负责安排一次批量回调。"""
+            self._pending_events.append((event_type, path))
+            if self._flush_handle is None:
+                self._flush_handle = self._loop.call_later(self.batch_window, self._flush_events)
+
+        def _flush_events(self):
+            """取出窗口期内收集到的事件，去重后一次性交给回调。"""
+            self._flush_handle = None
+            events = list(dict.fromkeys(self._pending_events))
+            self._pending_events.clear()
+            if events:
+                self.callback(events)
 
 class FileUtils:
     """
@@ -172,6 +728,43 @@ class FileUtils:
     路径参数可以是绝对路径，也可以是相对于当前工作目录的相对路径。
     """
 
+    # git() 的分发表：Git 操作名 -> GitManager 方法名
+    _GIT_ACTIONS = {
+        "init": "init_repo",
+        "clone": "clone",
+        "commit": "commit",
+        "push": "push",
+        "pull": "pull",
+        "status": "status",
+        "log": "log",
+        "branch": "create_branch",
+        "checkout": "checkout_branch",
+        "merge": "merge_branch",
+        "add": "add",
+        "commit_files": "commit_files",
+        "bulk_commit": "bulk_commit",
+        "reset": "reset",
+        "stash": "stash",
+        "tag": "tag",
+        "remote": "remote",
+        "info": "get_repo_info",
+    }
+    _GIT_NO_PARAM_ACTIONS = frozenset({"status", "info"})
+    # directory_operation('list', include_metadata=True) 并发获取元数据时的最大并发数
+    _METADATA_CONCURRENCY = 64
+    # JSON 追加合并：超过此大小的文件只探测顶层类型，数组直接在文件末尾拼接而不整体解析
+    _JSON_STREAM_APPEND_THRESHOLD = 1024 * 1024
+    # JSON 追加合并：顶层为对象时，超过此大小的文件不再整体读入合并
+    _JSON_MERGE_MAX_BYTES = 64 * 1024 * 1024
+    # JSON 追加合并：超过此大小的文件合并后以流式序列化写回，避免整份 JSON 文本驻留内存
+    _JSON_STREAM_WRITE_THRESHOLD = 10 * 1024 * 1024
+    # 不小于此大小的文件在 aiofile 可用时通过内核异步 I/O 读取，较小的文件仍一次性在线程池中读取
+    _AIO_READ_THRESHOLD = 8 * 1024 * 1024
+    # compare_files：两个文本长度之差超过较长者的此比例时，相似度按长度估计上界，不做逐字符匹配
+    _COMPARE_ESTIMATE_LENGTH_RATIO = 0.9
+    # 工具规格缓存：类 -> [(方法名, 描述), ...]。方法列表和文档字符串都属于类，所有实例共享
+    _tool_specs_cache: Dict[type, List[Tuple[str, str]]] = {}
+
     def __init__(self, base_path: Optional[str] = None):
         """
         初始化文件操作工具类。
@@ -182,6 +775,48 @@ def __init__(self, base_path: Optional[str] = None):
         """
         self.base_path = base_path or os.getcwd()
         self._file_monitors = {}  # 存储文件监控器
+        self._autogen_tools: Optional[List[FunctionTool]] = None  # get_autogen_tools 的缓存结果
+        self._git_manager: Optional[GitManager] = None  # 延迟创建并复用的 GitManager
+        self._git_lock = asyncio.Lock()  # Git 命令在线程池中执行，同一实例的 Git 操作串行进行，避免争用 index.lock
+
+        # 通用操作函数的分发表：operation 名称 -> 适配协程（一次字典查找代替 if/elif 链）。
+        # 键均为小写；调用方传入的通常已是小写，先直接查找，未命中再转小写重试
+        self._file_ops = {
+            'read': self._file_op_read,
+            'read_lines': self._file_op_read_lines,
+            'write': self._file_op_write,
+            'write_lines': self._file_op_write_lines,
+            'append': self._file_op_append,
+            'edit': self._file_op_edit,
+            'touch': self._file_op_touch,
+            'delete': self._file_op_delete,
+        }
+        self._directory_ops = {
+            'list': self._directory_op_list,
+            'create': self._directory_op_create,
+            'structure': self._directory_op_structure,
+            'search': self._directory_op_search,
+        }
+        self._file_management_ops = {
+            'move': self.move_item,
+            'copy': self.copy_item,
+        }
+        self._file_analysis_ops = {
+            'compare': self._file_analysis_op_compare,
+            'metadata': self._file_analysis_op_metadata,
+            'hash': self._file_analysis_op_hash,
+            'highlight': self._file_analysis_op_highlight,
+            'diagnostics': self._file_analysis_op_diagnostics,
+        }
+        self._archive_ops = {
+            'create': self._archive_op_create,
+            'extract': self._archive_op_extract,
+        }
+        self._monitor_ops = {
+            'start': self._monitor_op_start,
+            'stop': self._monitor_op_stop,
+            'status': self._monitor_op_status,
+        }
 
         # 文件格式支持状态
         self.format_support = {
@@ -213,11 +848,87 @@ def _ensure_directory_exists(self, file_path: str) -> None:
         if directory and not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
 
-    def _git_commit(self, file_path: str, operation: str, role: Optional[str] = None) -> Dict[str, Any]:
+    def _read_bytes(self, file_path: str) -> bytes:
+        """
+        一次性读取文件的全部字节。open/read/close 在同一次调用中完成，
+        以便整体放入 asyncio.to_thread，只占用一次线程池往返。
+
+        Args:
+            file_path: 文件的完整路径
+
+        Returns:
+            文件内容的字节串
+        """
+        with open(file_path, 'rb') as file:
+            return file.read()
+
+    async def _read_bytes_async(self, file_path: str) -> bytes:
+        """
+        异步读取文件的全部字节。
+
+        aiofile 可用且文件不小于 _AIO_READ_THRESHOLD 时使用内核异步 I/O 读取；
+        否则（包括小文件）整体放入 asyncio.to_thread 调用 _read_bytes。
+
+        Args:
+            file_path: 文件的完整路径
+
+        Returns:
+            文件内容的字节串
+        """
+        if AIOFILE_AVAILABLE and os.path.getsize(file_path) >= self._AIO_READ_THRESHOLD:
+            async with async_open(file_path, 'rb') as file:
+                return await file.read()
+        return await asyncio.to_thread(self._read_bytes, file_path)
+
+    async def _read_text(self, file_path: str, encoding: Optional[str] = None) -> str:
+        """
+        读取文本文件并直接返回字符串，不包装为结果字典。
+
+        Args:
+            file_path: 文件路径（相对于 base_path 或绝对路径）
+            encoding: 文件编码。为 None 时依次尝试 utf-8、gbk、latin-1。
+
+        Returns:
+            文件内容，换行符已统一为 \\n（与文本模式 open() 一致）
+
+        Raises:
+            OSError: 文件无法读取
+            UnicodeDecodeError: 无法用指定编码解码
+        """
+        absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
+        raw_bytes = await self._read_bytes_async(absolute_file_path)
+        encodings_to_try = [encoding] if encoding else ['utf-8', 'gbk', 'latin-1']
+        for enc in encodings_to_try[:-1]:
+            try:
+                text = raw_bytes.decode(enc)
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            text = raw_bytes.decode(encodings_to_try[-1])
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def _write_bytes(self, file_path: str, *chunks: bytes) -> int:
+        """
+        将字节数据原样写入文件（覆盖），不做任何编码或换行符处理。
+
+        Args:
+            file_path: 文件的完整路径
+            chunks: 依次写入的字节块
+
+        Returns:
+            写入的总字节数
+        """
+        self._ensure_directory_exists(file_path)
+        with open(file_path, 'wb') as file:
+            return sum(file.write(chunk) for chunk in chunks)
+
+    async def _git_commit(self, file_path: str, operation: str, role: Optional[str] = None) -> Dict[str, Any]:
         """
         执行 git 提交操作，将修改的文件提交到 git 仓库。
 
         此方法使用 GitManager 类来执行 git 操作，提供了更强大和灵活的 git 功能。
+        git 子进程在线程池中运行，等待期间不阻塞事件循环。
 
         Args:
             file_path: 被修改的文件路径
@@ -228,8 +939,19 @@ def _git_commit(self, file_path: str, operation: str, role: Optional[str] = None
             包含 git 操作结果的字典
         """
         # 使用 GitManager 类执行 git 提交
-        git_manager = GitManager()
-        return git_manager.commit_file(file_path, operation, role)
+        git_manager = self._get_git_manager()
+        async with self._git_lock:
+            return await asyncio.to_thread(git_manager.commit_file, file_path, operation, role)
+
+    def _get_git_manager(self) -> "GitManager":
+        """
+        获取本实例复用的 GitManager，首次调用时创建。
+
+        仓库根目录只在创建时查找一次；通过 git('init')/git('clone') 切换的仓库路径会在后续调用中保留。
+        """
+        if self._git_manager is None:
+            self._git_manager = GitManager()
+        return self._git_manager
 
 
     async def read_file(
@@ -270,16 +992,18 @@ async def read_file(
 
             # 如果是已知的文本文件扩展名，或者没有特定处理方式，尝试作为文本读取
             if ext in known_text_extensions or (ext not in ['docx', 'xlsx', 'xls', 'pdf']):
+                # 在线程池中一次性读出字节，再依次尝试各编码解码，避免每种编码都重新打开文件
+                raw_bytes = await self._read_bytes_async(absolute_file_path)
                 for enc in encodings_to_try:
                     if enc is None: continue
                     try:
-                        with open(absolute_file_path, 'r', encoding=enc) as file:
-                            content = file.read()
+                        # 与文本模式 open() 的通用换行一致：\r\n 和 \r 都转换为 \n
+                        content = raw_bytes.decode(enc).replace('\r\n', '\n').replace('\r', '\n')
                         detected_encoding = enc
                         break
                     except UnicodeDecodeError:
                         continue
-                    except Exception: # 其他可能的读取错误
+                    except Exception: # 其他可能的解码错误（如未知编码）
                         continue
 
                 if content is not None:
@@ -432,7 +1156,6 @@ async def write_file(
         """
         absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
         try:
-            self._ensure_directory_exists(absolute_file_path)
             processed_content = content
             if normalize_line_endings:
                 # 处理实际的回车换行符
@@ -442,8 +1165,8 @@ async def write_file(
             if ensure_final_newline and processed_content and not processed_content.endswith('\n'):
                 processed_content += '\n'
 
-            with open(absolute_file_path, 'wb') as file: # 以二进制模式写入以精确控制字节
-                file.write(processed_content.encode(encoding))
+            # 以二进制模式写入以精确控制字节；打开/写入/关闭在线程池中一次完成，不阻塞事件循环
+            size_bytes = await asyncio.to_thread(self._write_bytes, absolute_file_path, processed_content.encode(encoding))
 
             # 计算行数
             line_count = processed_content.count('\n')
@@ -454,12 +1177,12 @@ async def write_file(
                 "status": "成功",
                 "message": f"内容已写入文件 {absolute_file_path}",
                 "path": absolute_file_path,
-                "size_bytes": len(processed_content.encode(encoding)),
+                "size_bytes": size_bytes,
                 "line_count": line_count,
                 "ends_with_newline": processed_content.endswith('\n') if processed_content else False
             }
             if auto_commit:
-                git_result = self._git_commit(absolute_file_path, "write", role)
+                git_result = await self._git_commit(absolute_file_path, "write", role)
                 result["git_result"] = git_result
             else:
                 result["git_result"] = {"git_status": "跳过", "message": "Git提交被禁用 (auto_commit=False)"}
@@ -569,29 +1292,35 @@ async def append_to_file(
         """
         absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
         try:
-            self._ensure_directory_exists(absolute_file_path)
             processed_content = content
             if normalize_line_endings:
                 processed_content = processed_content.replace('\r\n', '\n').replace('\r', '\n')
 
-            prefix_newline = ''
-            file_existed = os.path.exists(absolute_file_path)
-            file_ended_with_newline_before_append = False
+            def _append_sync():
+                # 检查末尾换行和追加写入都在同一次线程池调用中完成
+                self._ensure_directory_exists(absolute_file_path)
+                prefix_newline = ''
+                file_existed = os.path.exists(absolute_file_path)
+                ended_with_newline = False
 
-            if file_existed and os.path.getsize(absolute_file_path) > 0:
-                with open(absolute_file_path, 'rb') as f_check:
-                    f_check.seek(-1, os.SEEK_END) # 移动到倒数第一个字节
-                    if f_check.read(1) == b'\n':
-                        file_ended_with_newline_before_append = True
-                if not file_ended_with_newline_before_append and processed_content:
-                    prefix_newline = '\n'
+                if file_existed and os.path.getsize(absolute_file_path) > 0:
+                    with open(absolute_file_path, 'rb') as f_check:
+                        f_check.seek(-1, os.SEEK_END) # 移动到倒数第一个字节
+                        if f_check.read(1) == b'\n':
+                            ended_with_newline = True
+                    if not ended_with_newline and processed_content:
+                        prefix_newline = '\n'
 
-            final_content_to_append = prefix_newline + processed_content
-            if ensure_final_newline and final_content_to_append and not final_content_to_append.endswith('\n'):
-                final_content_to_append += '\n'
+                final_content = prefix_newline + processed_content
+                if ensure_final_newline and final_content and not final_content.endswith('\n'):
+                    final_content += '\n'
 
-            with open(absolute_file_path, 'ab') as file: # 以二进制追加模式打开
-                file.write(final_content_to_append.encode(encoding))
+                with open(absolute_file_path, 'ab') as file: # 以二进制追加模式打开
+                    written = file.write(final_content.encode(encoding))
+                return final_content, written, file_existed, ended_with_newline
+
+            (final_content_to_append, appended_bytes, file_existed,
+             file_ended_with_newline_before_append) = await asyncio.to_thread(_append_sync)
 
             appended_lines = final_content_to_append.count('\n')
             if final_content_to_append and not final_content_to_append.endswith('\n'):
@@ -601,13 +1330,13 @@ async def append_to_file(
                 "status": "成功",
                 "message": f"内容已追加到文件 {absolute_file_path}",
                 "path": absolute_file_path,
-                "appended_bytes": len(final_content_to_append.encode(encoding)),
+                "appended_bytes": appended_bytes,
                 "appended_lines": appended_lines,
                 "file_existed": file_existed,
                 "file_ended_with_newline_before_append": file_ended_with_newline_before_append
             }
             if auto_commit:
-                git_result = self._git_commit(absolute_file_path, "append", role)
+                git_result = await self._git_commit(absolute_file_path, "append", role)
                 result["git_result"] = git_result
             else:
                 result["git_result"] = {"git_status": "跳过", "message": "Git提交被禁用 (auto_commit=False)"}
@@ -636,6 +1365,22 @@ async def list_directory(
             如果与 directory_operation 函数一起使用并设置 include_metadata=True，
             则文件项目还将包含详细的元数据。
         """
+        return self._list_directory_sync(directory_path, recursive, max_depth)
+
+    def _list_directory_sync(
+        self,
+        directory_path: str,
+        recursive: bool,
+        max_depth: Optional[int],
+        stat_cache: Optional[Dict[str, Tuple[os.stat_result, bool]]] = None
+    ) -> Dict[str, Any]:
+        """
+        list_directory 的同步实现。
+
+        使用 os.scandir 遍历，每个条目只 stat 一次。传入 stat_cache 时，
+        会把文件项的 (stat 结果, 是否符号链接) 按相对路径记录下来，
+        供 include_metadata 时直接复用，避免再次 stat。
+        """
         absolute_dir_path = os.path.abspath(os.path.join(self.base_path, directory_path))
         if not os.path.exists(absolute_dir_path):
             return {"error": f"目录 {absolute_dir_path} 不存在"}
@@ -644,35 +1389,40 @@ async def list_directory(
 
         items_list = []
 
-        def _scan_dir(current_path, current_depth):
+        def _scan_dir(current_path, relative_dir, current_depth):
             if max_depth is not None and current_depth > max_depth:
                 return
 
             try:
-                for item_name in os.listdir(current_path):
-                    item_full_path = os.path.join(current_path, item_name)
-                    item_relative_path = os.path.relpath(item_full_path, absolute_dir_path)
+                with os.scandir(current_path) as entries:
+                    entries = list(entries)
+                for entry in entries:
+                    item_name = entry.name
+                    item_relative_path = os.path.join(relative_dir, item_name) if relative_dir else item_name
 
-                    if os.path.isdir(item_full_path):
+                    if entry.is_dir():
                         items_list.append({
                             "name": item_name,
                             "path": item_relative_path,
                             "type": "directory",
-                            "modified_time": os.path.getmtime(item_full_path),
+                            "modified_time": entry.stat().st_mtime,
                             "size_bytes": None, # 目录大小通常不直接计算
                             "depth": current_depth  # 添加深度信息
                         })
                         if recursive and (max_depth is None or current_depth < max_depth):
-                            _scan_dir(item_full_path, current_depth + 1)
-                    elif os.path.isfile(item_full_path):
+                            _scan_dir(entry.path, item_relative_path, current_depth + 1)
+                    elif entry.is_file():
+                        stat_info = entry.stat()
+                        if stat_cache is not None:
+                            stat_cache[item_relative_path] = (stat_info, entry.is_symlink())
                         _, ext = os.path.splitext(item_name)
-                        mime_type, _ = mimetypes.guess_type(item_full_path)
+                        mime_type, _ = mimetypes.guess_type(item_name)
                         items_list.append({
                             "name": item_name,
                             "path": item_relative_path,
                             "type": "file",
-                            "size_bytes": os.path.getsize(item_full_path),
-                            "modified_time": os.path.getmtime(item_full_path),
+                            "size_bytes": stat_info.st_size,
+                            "modified_time": stat_info.st_mtime,
                             "extension": ext.lower().lstrip('.') if ext else "",
                             "mime_type": mime_type or "application/octet-stream",
                             "depth": current_depth  # 添加深度信息
@@ -680,7 +1430,7 @@ def _scan_dir(current_path, current_depth):
             except PermissionError:
                  items_list.append({
                      "name": os.path.basename(current_path),
-                     "path": os.path.relpath(current_path, absolute_dir_path),
+                     "path": relative_dir or ".",
                      "type": "directory",
                      "error": "权限不足",
                      "depth": current_depth
@@ -688,13 +1438,13 @@ def _scan_dir(current_path, current_depth):
             except Exception as e:
                  items_list.append({
                      "name": os.path.basename(current_path),
-                     "path": os.path.relpath(current_path, absolute_dir_path),
+                     "path": relative_dir or ".",
                      "type": "directory",
                      "error": str(e),
                      "depth": current_depth
                  })
 
-        _scan_dir(absolute_dir_path, 0)
+        _scan_dir(absolute_dir_path, "", 0)
 
         return {
             "base_path": absolute_dir_path,
@@ -823,7 +1573,7 @@ async def delete_item(
             }
 
             if auto_commit:
-                git_result = self._git_commit(absolute_path, "delete", role)
+                git_result = await self._git_commit(absolute_path, "delete", role)
                 result["git_result"] = git_result
             else:
                 result["git_result"] = {"git_status": "跳过", "message": "Git提交被禁用 (auto_commit=False)"}
@@ -960,7 +1710,7 @@ async def write_lines(
 
             # 执行 git 提交
             if auto_commit:
-                git_result = self._git_commit(absolute_file_path, "write_lines", role)
+                git_result = await self._git_commit(absolute_file_path, "write_lines", role)
                 result["git_result"] = git_result
             else:
                 result["git_result"] = {"git_status": "跳过", "message": "Git提交被禁用 (auto_commit=False)"}
@@ -991,11 +1741,13 @@ async def search_files(
             return {"error": f"指定的搜索目录 {search_root} 不是一个有效的目录。"}
 
         found_files = []
+        matcher = _compile_glob_patterns((pattern,)).match
+        normcase = os.path.normcase
         try:
             if recursive:
                 for root, _, files in os.walk(search_root):
                     for filename in files:
-                        if fnmatch.fnmatch(filename, pattern):
+                        if matcher(normcase(filename)):
                             full_path = os.path.join(root, filename)
                             relative_path = os.path.relpath(full_path, search_root)
                             found_files.append({
@@ -1008,7 +1760,7 @@ async def search_files(
             else:
                 for filename in os.listdir(search_root):
                     full_path = os.path.join(search_root, filename)
-                    if os.path.isfile(full_path) and fnmatch.fnmatch(filename, pattern):
+                    if os.path.isfile(full_path) and matcher(normcase(filename)):
                          relative_path = os.path.relpath(full_path, search_root)
                          found_files.append({
                             "name": filename,
@@ -1167,7 +1919,7 @@ async def edit_text_file(
             }
 
             if auto_commit: # MODIFIED: Conditional Git commit
-                git_result = self._git_commit(absolute_file_path, "edit", role)
+                git_result = await self._git_commit(absolute_file_path, "edit", role)
                 result["git_result"] = git_result
             else:
                 result["git_result"] = {"git_status": "跳过", "message": "Git提交被禁用 (auto_commit=False)"}
@@ -1249,7 +2001,8 @@ async def compare_files(
         self,
         file1_path: Annotated[str, "第一个要比较的文件的路径。"],
         file2_path: Annotated[str, "第二个要比较的文件的路径。"],
-        context_lines: Annotated[int, "差异上下文中显示的行数。"] = 3
+        context_lines: Annotated[int, "差异上下文中显示的行数。"] = 3,
+        include_html: Annotated[bool, "是否同时生成 HTML 格式的并排差异（html_diff）。"] = False
     ) -> Dict[str, Any]:
         """
         比较两个文本文件的内容差异。
@@ -1258,9 +2011,11 @@ async def compare_files(
             file1_path: 第一个文件的路径。
             file2_path: 第二个文件的路径。
             context_lines: 差异上下文中显示的行数。
+            include_html: 是否生成 HTML 差异。difflib.HtmlDiff 的开销远大于统一差异和相似度计算，
+                          因此默认不生成，只有为 True 时结果中才包含 html_diff。
 
         Returns:
-            包含差异文本、HTML差异、相似度等信息的字典，或错误信息。
+            包含差异文本、相似度等信息（include_html 为 True 时还包含 HTML 差异）的字典，或错误信息。
         """
         abs_file1_path = os.path.abspath(os.path.join(self.base_path, file1_path))
         abs_file2_path = os.path.abspath(os.path.join(self.base_path, file2_path))
@@ -1274,27 +2029,66 @@ async def compare_files(
         if not os.path.isfile(abs_file2_path):
             return {"error": f"路径 {abs_file2_path} 不是文件"}
 
-        try:
+        def _compare():
             with open(abs_file1_path, 'r', encoding='utf-8') as f1:
                 file1_lines = f1.readlines()
-            with open(abs_file2_path, 'r', encoding='utf-8') as f2:
-                file2_lines = f2.readlines()
-
-            diff_text = ''.join(difflib.unified_diff(file1_lines, file2_lines, fromfile=file1_path, tofile=file2_path, n=context_lines))
-
-            html_diff_generator = difflib.HtmlDiff(tabsize=4, wrapcolumn=80)
-            html_diff = html_diff_generator.make_file(file1_lines, file2_lines, file1_path, file2_path, context=True, numlines=context_lines)
+            # 两个路径指向同一个文件（硬链接、不同写法的同一路径）时只读取一次
+            if os.path.samefile(abs_file1_path, abs_file2_path):
+                file2_lines = file1_lines
+            else:
+                with open(abs_file2_path, 'r', encoding='utf-8') as f2:
+                    file2_lines = f2.readlines()
+            file1_text = ''.join(file1_lines)
+            file2_text = ''.join(file2_lines)
+
+            html_diff = None
+            if include_html:
+                html_diff_generator = difflib.HtmlDiff(tabsize=4, wrapcolumn=80)
+                html_diff = html_diff_generator.make_file(file1_lines, file2_lines, file1_path, file2_path, context=True, numlines=context_lines)
+
+            # 内容相同：不需要任何差异计算
+            if file1_text == file2_text:
+                return file1_lines, file2_lines, "", html_diff, 100.0, False
+
+            # 先去掉相同的开头和结尾再做差异比较（许可证头、import 块等通常完全相同）
+            diff_text = _unified_diff_trimmed(file1_lines, file2_lines, file1_path, file2_path, context_lines)
+
+            # 逐字符的相似度计算是整个比较中最耗时的部分。匹配字符数不会超过较短文本的长度，
+            # 因此 2 * 较短长度 / 总长度 是相似度的上界；两个文本长度相差悬殊时上界已经很低，
+            # 直接以上界作为估计值，不再运行 SequenceMatcher
+            len1, len2 = len(file1_text), len(file2_text)
+            if abs(len1 - len2) > self._COMPARE_ESTIMATE_LENGTH_RATIO * max(len1, len2):
+                similarity = 2.0 * min(len1, len2) / (len1 + len2) * 100
+                return file1_lines, file2_lines, diff_text, html_diff, similarity, True
+
+            # 否则使用 SequenceMatcher（cdifflib 可用时为 C 实现）
+            # 相同的开头和结尾直接计入匹配字符数，只对中间不同的部分做匹配
+            prefix, suffix = _common_affix_lengths(file1_text, file2_text)
+            middle = SequenceMatcher(
+                None,
+                file1_text[prefix:len1 - suffix],
+                file2_text[prefix:len2 - suffix]
+            )
+            matches = prefix + suffix + sum(block.size for block in middle.get_matching_blocks())
+            similarity = 2.0 * matches / (len1 + len2) * 100
+            return file1_lines, file2_lines, diff_text, html_diff, similarity, False
 
-            matcher = difflib.SequenceMatcher(None, ''.join(file1_lines), ''.join(file2_lines))
-            similarity = matcher.ratio() * 100
+        try:
+            # 比较是 CPU 密集的操作，放到线程池中执行，不阻塞事件循环
+            file1_lines, file2_lines, diff_text, html_diff, similarity, estimated = await asyncio.to_thread(_compare)
 
-            return {
+            result = {
                 "diff_text": diff_text if diff_text else "文件内容相同。",
-                "html_diff": html_diff,
                 "similarity_percentage": round(similarity, 2),
                 "file1_info": {"path": abs_file1_path, "line_count": len(file1_lines), "size_bytes": os.path.getsize(abs_file1_path)},
                 "file2_info": {"path": abs_file2_path, "line_count": len(file2_lines), "size_bytes": os.path.getsize(abs_file2_path)},
             }
+            if estimated:
+                # 相似度为按长度估计的上界，而非逐字符匹配的结果
+                result["similarity_estimated"] = True
+            if include_html:
+                result["html_diff"] = html_diff
+            return result
         except Exception as e:
             return {"error": f"比较文件 {abs_file1_path} 和 {abs_file2_path} 时出错: {str(e)}"}
 
@@ -1326,19 +2120,18 @@ async def get_project_structure(
         default_excludes = ['.git', '.idea', '__pycache__', 'node_modules', '.venv', '.vscode', '*.pyc', '*.swp', '*.DS_Store']
         current_excludes = default_excludes + (exclude_patterns if exclude_patterns else [])
 
+        # 每组模式只编译一次为合并正则，遍历时每个条目只需一次正则匹配
+        normcase = os.path.normcase
+        exclude_match = _compile_glob_patterns(tuple(current_excludes)).match
+        include_match = _compile_glob_patterns(tuple(include_patterns)).match if include_patterns else None
+
         def _is_excluded(name, path):
-            for pattern in current_excludes:
-                if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern):
-                    return True
-            return False
+            return bool(exclude_match(normcase(name)) or exclude_match(normcase(path)))
 
         def _is_included(name, path):
-            if not include_patterns:
+            if include_match is None:
                 return True
-            for pattern in include_patterns:
-                if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern):
-                    return True
-            return False
+            return bool(include_match(normcase(name)) or include_match(normcase(path)))
 
         def _scan_dir_recursive(current_dir_path, current_depth):
             if max_depth is not None and current_depth > max_depth:
@@ -1396,7 +2189,8 @@ def _generate_tree_text(node, prefix="", is_last=True):
     async def start_file_monitor(
         self,
         path_to_monitor: Annotated[str, "要监控的文件或目录的路径。"],
-        on_change_callback: Annotated[Any, "当检测到文件更改时调用的回调函数。它接收两个参数：事件类型 (str) 和受影响文件的路径 (str)。"]
+        on_change_callback: Annotated[Any, "当检测到文件更改时调用的回调函数。它接收两个参数：事件类型 (str) 和受影响文件的路径 (str)。"],
+        batch_window: Annotated[Optional[float], "事件合并窗口（秒）。设置后回调改为接收一个 (事件类型, 路径) 列表，窗口内的事件合并为一次调用。"] = None
     ) -> Dict[str, Any]:
         """
         开始监控指定文件或目录的变化。
@@ -1404,6 +2198,10 @@ async def start_file_monitor(
         Args:
             path_to_monitor: 要监控的文件或目录的路径。
             on_change_callback: 文件变化时的回调函数。
+            batch_window: 事件合并窗口（秒），例如 0.005。为 None（默认）时每个事件单独回调
+                on_change_callback(事件类型, 路径)，回调在 watchdog 线程中执行；设置后在当前事件循环中
+                收集窗口期内的事件，去重后调用 on_change_callback([(事件类型, 路径), ...])，
+                适合批量编辑时短时间内产生大量事件的场景。
 
         Returns:
             包含监控状态信息的字典。
@@ -1419,7 +2217,12 @@ async def start_file_monitor(
             return {"status": "已在监控", "message": f"路径 {absolute_path} 已在监控中。", "monitor_id": absolute_path}
 
         try:
-            event_handler = FileChangeHandler(on_change_callback, absolute_path)
+            event_handler = FileChangeHandler(
+                on_change_callback,
+                absolute_path,
+                batch_window=batch_window,
+                loop=asyncio.get_running_loop() if batch_window is not None else None
+            )
             observer = Observer()
             observer.schedule(event_handler, absolute_path, recursive=True)
             observer.start()
@@ -1632,13 +2435,30 @@ async def get_file_metadata(
             包含文件元数据（大小、修改时间、创建时间、访问时间、MIME类型等）的字典，或错误信息。
         """
         absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
-        if not os.path.exists(absolute_file_path):
-            return {"error": f"文件 {absolute_file_path} 不存在。"}
-        if not os.path.isfile(absolute_file_path):
-            return {"error": f"路径 {absolute_file_path} 不是一个文件。"}
+        return self._get_file_metadata_sync(absolute_file_path)
+
+    def _get_file_metadata_sync(
+        self,
+        absolute_file_path: str,
+        stat_info: Optional[os.stat_result] = None,
+        is_link: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        get_file_metadata 的同步实现，便于批量调用时放入线程池执行。
+
+        调用方已持有该文件的 stat 结果（例如目录遍历时取得）时可直接传入，跳过存在性检查和 os.stat。
+        """
+        if stat_info is None:
+            if not os.path.exists(absolute_file_path):
+                return {"error": f"文件 {absolute_file_path} 不存在。"}
+            if not os.path.isfile(absolute_file_path):
+                return {"error": f"路径 {absolute_file_path} 不是一个文件。"}
 
         try:
-            stat_info = os.stat(absolute_file_path)
+            if stat_info is None:
+                stat_info = os.stat(absolute_file_path)
+            if is_link is None:
+                is_link = os.path.islink(absolute_file_path)
             mime_type, _ = mimetypes.guess_type(absolute_file_path)
             _, ext = os.path.splitext(absolute_file_path)
 
@@ -1656,12 +2476,12 @@ async def get_file_metadata(
                 "metadata_change_time_iso": datetime.datetime.fromtimestamp(stat_info.st_ctime).isoformat(),
                 "mime_type": mime_type or "application/octet-stream",
                 "extension": ext.lower().lstrip('.') if ext else "",
-                "is_link": os.path.islink(absolute_file_path),
+                "is_link": is_link,
             }
-            # 尝试获取更准确的创建时间 (Windows)
+            # 尝试获取更准确的创建时间 (Windows 上 st_ctime 即创建时间)
             if os.name == 'nt':
-                metadata["created_time_timestamp_windows"] = os.path.getctime(absolute_file_path)
-                metadata["created_time_iso_windows"] = datetime.datetime.fromtimestamp(os.path.getctime(absolute_file_path)).isoformat()
+                metadata["created_time_timestamp_windows"] = stat_info.st_ctime
+                metadata["created_time_iso_windows"] = datetime.datetime.fromtimestamp(stat_info.st_ctime).isoformat()
 
             return {"status": "成功", "metadata": metadata}
         except Exception as e:
@@ -1705,16 +2525,22 @@ async def create_archive(
                 # 对于 zipfile，compresslevel 参数在 Python 3.7+ 中可用
                 # 在 Python 3.6 及更早版本中，zipfile.ZipFile 不直接接受 compresslevel 参数
                 # 这里我们假设 Python 3.7+
-                with zipfile.ZipFile(absolute_archive_path, 'w', compress_type, compresslevel=compression_level if compression_level is not None else None) as zf:
-                    for src_path in processed_source_paths:
-                        if os.path.isdir(src_path):
-                            for root, _, files in os.walk(src_path):
-                                for file in files:
-                                    file_to_add = os.path.join(root, file)
-                                    arcname = os.path.relpath(file_to_add, os.path.dirname(src_path))
-                                    zf.write(file_to_add, arcname)
-                        else: # isfile
-                            zf.write(src_path, os.path.basename(src_path))
+                # 各个源路径的目录遍历在线程池中并行进行，之后按源路径顺序写入
+                collected = await asyncio.gather(
+                    *(asyncio.to_thread(_collect_archive_members, src_path) for src_path in processed_source_paths)
+                )
+
+                def _write_zip():
+                    with _zip_writer.ZipFile(absolute_archive_path, 'w', compress_type, compresslevel=compression_level if compression_level is not None else None) as zf:
+                        all_members = [member for members in collected for member in members]
+                        if len(all_members) > 1:
+                            # 多个文件时在线程池中预读各条目，主线程按顺序压缩写入
+                            _write_zip_members_prefetched(zf, all_members, compression_level)
+                        else:
+                            for file_to_add, arcname in all_members:
+                                zf.write(file_to_add, arcname)
+
+                await asyncio.to_thread(_write_zip)
             elif archive_format in ["tar", "gztar", "bztar"]:
                 mode = "w"
                 if archive_format == "gztar":
@@ -1724,9 +2550,18 @@ async def create_archive(
 
                 # tarfile 的 compresslevel 参数需要 Python 3.9+
                 # 我们将简单地使用默认压缩，或在未来版本中添加版本检查
-                with tarfile.open(absolute_archive_path, mode) as tf:
-                    for src_path in processed_source_paths:
-                        tf.add(src_path, arcname=os.path.basename(src_path))
+                def _write_tar():
+                    if archive_format == "gztar" and ZLIB_NG_AVAILABLE:
+                        # 用 zlib-ng 的 gzip 实现压缩 tar 流（压缩级别与 tarfile 默认的 9 相同）
+                        with gzip_ng.open(absolute_archive_path, 'wb', compresslevel=9) as gz, tarfile.open(fileobj=gz, mode="w") as tf:
+                            for src_path in processed_source_paths:
+                                tf.add(src_path, arcname=os.path.basename(src_path))
+                        return
+                    with tarfile.open(absolute_archive_path, mode) as tf:
+                        for src_path in processed_source_paths:
+                            tf.add(src_path, arcname=os.path.basename(src_path))
+
+                await asyncio.to_thread(_write_tar)
             else:
                 return {"error": f"不支持的压缩格式: {archive_format}。请使用 'zip', 'tar', 'gztar', 'bztar'。"}
 
@@ -1777,11 +2612,15 @@ async def extract_archive(
             else:
                 return {"error": f"无法从文件名推断压缩格式: {abs_archive_path}。请明确指定 archive_format。"}
 
-        try:
+        def _extract():
             if fmt == "zip":
                 with zipfile.ZipFile(abs_archive_path, 'r') as zf:
                     zf.extractall(abs_destination_dir)
-            elif fmt in ["tar", "gztar", "bztar"]:
+            elif fmt == "gztar" and ISAL_AVAILABLE:
+                # 解压在 igzip 的后台线程中进行，tarfile 以流模式顺序读取解压结果
+                with igzip_threaded.open(abs_archive_path, 'rb') as gz, tarfile.open(fileobj=gz, mode="r|") as tf:
+                    tf.extractall(abs_destination_dir)
+            else:
                 mode = "r"
                 if fmt == "gztar":
                     mode = "r:gz"
@@ -1789,8 +2628,13 @@ async def extract_archive(
                     mode = "r:bz2"
                 with tarfile.open(abs_archive_path, mode) as tf:
                     tf.extractall(abs_destination_dir)
-            else:
-                return {"error": f"不支持的解压格式: {fmt}。"}
+
+        if fmt not in ["zip", "tar", "gztar", "bztar"]:
+            return {"error": f"不支持的解压格式: {fmt}。"}
+
+        try:
+            # 解压是 CPU 和 I/O 密集的操作，放到线程池中执行，不阻塞事件循环
+            await asyncio.to_thread(_extract)
 
             return {"status": "成功", "message": f"文件已解压到 {abs_destination_dir}。"}
         except Exception as e:
@@ -1799,30 +2643,67 @@ async def extract_archive(
     async def get_file_hash(
         self,
         file_path: Annotated[str, "要计算哈希值的文件路径。"],
-        algorithm: Annotated[str, "哈希算法，例如 'md5', 'sha1', 'sha256', 'sha512'。"] = "sha256"
+        algorithm: Annotated[str, "哈希算法，例如 'md5', 'sha1', 'sha256', 'sha512'。仅用于变更检测时可用更快的 'xxh3'、'blake3'（需安装对应库）。"] = "sha256"
     ) -> Dict[str, Any]:
         """
         计算指定文件的哈希值。
 
         Args:
             file_path: 文件路径。
-            algorithm: 哈希算法。
+            algorithm: 哈希算法。默认 'sha256'；安装 xxhash / blake3 后还支持非加密用途的
+                'xxh3'、'xxh64'、'xxh128' 和 'blake3'，速度比 SHA-256 快数倍。也支持 'crc32' 校验和。
 
         Returns:
             包含哈希值或错误信息的字典。
         """
         absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
+        # 存在性检查、分块读取与哈希计算作为一个任务在线程池中进行，不阻塞事件循环
+        return await asyncio.to_thread(self._get_file_hash_sync, absolute_file_path, algorithm)
+
+    async def get_file_hashes(
+        self,
+        file_paths: Annotated[List[str], "要计算哈希值的文件路径列表。"],
+        algorithm: Annotated[str, "哈希算法，例如 'md5', 'sha1', 'sha256', 'sha512'。"] = "sha256"
+    ) -> Dict[str, Any]:
+        """
+        并发计算多个文件的哈希值。
+
+        每个文件的检查与哈希计算作为一个任务提交到线程池，并发数不超过 CPU 核数。
+
+        Args:
+            file_paths: 文件路径列表。
+            algorithm: 哈希算法。
+
+        Returns:
+            包含每个文件结果的字典。'results' 按输入顺序排列，每项与 get_file_hash 的返回格式相同。
+        """
+        semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+
+        async def _hash_one(file_path):
+            absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
+            async with semaphore:
+                return await asyncio.to_thread(self._get_file_hash_sync, absolute_file_path, algorithm)
+
+        results = await asyncio.gather(*(_hash_one(p) for p in file_paths))
+        failed = sum(1 for r in results if "error" in r)
+        return {
+            "status": "成功" if not failed else "部分成功或失败",
+            "algorithm": algorithm,
+            "results": results,
+            "total_files": len(results),
+            "failed_files": failed
+        }
+
+    def _get_file_hash_sync(self, absolute_file_path: str, algorithm: str) -> Dict[str, Any]:
+        """get_file_hash 的同步实现，便于在线程池中执行。"""
         if not os.path.exists(absolute_file_path):
             return {"error": f"文件 {absolute_file_path} 不存在。"}
         if not os.path.isfile(absolute_file_path):
             return {"error": f"路径 {absolute_file_path} 不是一个文件。"}
 
         try:
-            hasher = hashlib.new(algorithm)
-            with open(absolute_file_path, 'rb') as f:
-                while chunk := f.read(8192): # 8KB 块
-                    hasher.update(chunk)
-            return {"status": "成功", "algorithm": algorithm, "hash": hasher.hexdigest(), "file_path": absolute_file_path}
+            file_hash = _hash_file(absolute_file_path, algorithm)
+            return {"status": "成功", "algorithm": algorithm, "hash": file_hash, "file_path": absolute_file_path}
         except ValueError:
             return {"error": f"不支持的哈希算法: {algorithm}。请尝试 'md5', 'sha1', 'sha256', 'sha512' 等。"}
         except Exception as e:
@@ -2065,36 +2946,157 @@ async def file_operation(
             lines = ["第一行", "第二行", "第三行"]
             result = await file_utils.file_operation('write_lines', 'example.txt', lines=lines)
         """
-        operation = operation.lower()
-
-        if operation == 'read':
-            result = await self.read_file(file_path, encoding)
+        handler = self._file_ops.get(operation) or self._file_ops.get(operation.lower())
+        if handler is None:
+            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'read', 'write', 'append', 'edit', 'delete', 'touch', 'read_lines', 'write_lines'。"}
 
-            # 如果文件是JSON格式，尝试自动解析
-            if "error" not in result and file_path.lower().endswith('.json'):
-                try:
-                    content = result.get("content", "")
-                    if content.strip():  # 确保内容不为空
-                        parsed_json = json.loads(content)
-                        result["parsed_json"] = parsed_json
-                        result["is_json"] = True
-                except json.JSONDecodeError as e:
-                    result["json_parse_error"] = str(e)
-                    result["is_json"] = False
+        return await handler(
+            file_path,
+            content=content,
+            changes=changes,
+            lines=lines,
+            encoding=encoding,
+            normalize_line_endings=normalize_line_endings,
+            ensure_final_newline=ensure_final_newline,
+            create_if_not_exists=create_if_not_exists,
+            recursive=recursive,
+            force=force,
+            strip_newlines=strip_newlines,
+            ensure_newlines=ensure_newlines,
+            create_parents=create_parents,
+            indent=indent,
+            ensure_ascii=ensure_ascii,
+            role=role,
+            auto_commit=auto_commit
+        )
 
-            return result
+    # ---- file_operation 的操作适配器：校验所需参数后委托给具体实现，多余的关键字参数被忽略 ----
 
-        elif operation == 'read_lines':
-            return await self.read_lines(file_path, encoding, strip_newlines)
+    async def _file_op_read(self, file_path: str, *, encoding: str, **_) -> Dict[str, Any]:
+        result = await self.read_file(file_path, encoding)
 
-        elif operation == 'write':
-            if content is None:
-                return {"error": "写入操作需要提供content参数。"}
+        # 如果文件是JSON格式，尝试自动解析
+        if "error" not in result and file_path.lower().endswith('.json'):
+            try:
+                content = result.get("content", "")
+                if content.strip():  # 确保内容不为空
+                    parsed_json = json.loads(content)
+                    result["parsed_json"] = parsed_json
+                    result["is_json"] = True
+            except json.JSONDecodeError as e:
+                result["json_parse_error"] = str(e)
+                result["is_json"] = False
 
-            # 如果文件是JSON格式且content是字典或列表，自动转换为JSON字符串
-            if file_path.lower().endswith('.json') and isinstance(content, (dict, list)):
-                try:
-                    # 使用write_json_file处理JSON对象
+        return result
+
+    async def _file_op_read_lines(self, file_path: str, *, encoding: str, strip_newlines: bool, **_) -> Dict[str, Any]:
+        return await self.read_lines(file_path, encoding, strip_newlines)
+
+    async def _file_op_write(
+        self,
+        file_path: str,
+        *,
+        content: Optional[Union[str, Dict, List]],
+        encoding: str,
+        normalize_line_endings: bool,
+        ensure_final_newline: bool,
+        indent: Optional[int],
+        ensure_ascii: bool,
+        role: Optional[str],
+        auto_commit: bool,
+        **_
+    ) -> Dict[str, Any]:
+        if content is None:
+            return {"error": "写入操作需要提供content参数。"}
+
+        # 如果文件是JSON格式且content是字典或列表，自动转换为JSON字符串
+        if file_path.lower().endswith('.json') and isinstance(content, (dict, list)):
+            try:
+                # 使用write_json_file处理JSON对象
+                return await self.write_json_file(
+                    file_path,
+                    content,
+                    encoding=encoding,
+                    ensure_final_newline=ensure_final_newline,
+                    indent=indent,
+                    ensure_ascii=ensure_ascii,
+                    role=role,
+                    auto_commit=auto_commit
+                )
+            except Exception as e:
+                return {"error": f"将对象转换为JSON并写入文件 {file_path} 时出错: {str(e)}"}
+
+        # 处理普通文本内容
+        return await self.write_file(
+            file_path,
+            str(content),  # 确保content是字符串
+            encoding=encoding,
+            normalize_line_endings=normalize_line_endings,
+            ensure_final_newline=ensure_final_newline,
+            role=role,
+            auto_commit=auto_commit
+        )
+
+    async def _file_op_write_lines(
+        self,
+        file_path: str,
+        *,
+        lines: Optional[List[str]],
+        encoding: str,
+        ensure_newlines: bool,
+        ensure_final_newline: bool,
+        role: Optional[str],
+        auto_commit: bool,
+        **_
+    ) -> Dict[str, Any]:
+        if lines is None:
+            return {"error": "write_lines操作需要提供lines参数。"}
+        return await self.write_lines(
+            file_path,
+            lines,
+            encoding=encoding,
+            ensure_newlines=ensure_newlines,
+            ensure_final_newline=ensure_final_newline,
+            role=role,
+            auto_commit=auto_commit
+        )
+
+    async def _file_op_append(
+        self,
+        file_path: str,
+        *,
+        content: Optional[Union[str, Dict, List]],
+        encoding: str,
+        normalize_line_endings: bool,
+        ensure_final_newline: bool,
+        create_if_not_exists: bool,
+        indent: Optional[int],
+        ensure_ascii: bool,
+        role: Optional[str],
+        auto_commit: bool,
+        **_
+    ) -> Dict[str, Any]:
+        if content is None:
+            return {"error": "追加操作需要提供content参数。"}
+
+        if not (file_path.lower().endswith('.json') and isinstance(content, (dict, list))):
+            # 处理普通文本内容
+            return await self.append_to_file(
+                file_path,
+                str(content),  # 确保content是字符串
+                encoding=encoding,
+                normalize_line_endings=normalize_line_endings,
+                ensure_final_newline=ensure_final_newline,
+                role=role,
+                auto_commit=auto_commit
+            )
+
+        # 如果文件是JSON格式且content是字典或列表，尝试智能合并
+        try:
+            absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
+            if not os.path.isfile(absolute_file_path):
+                # 文件不存在，直接写入新内容
+                if create_if_not_exists:
                     return await self.write_json_file(
                         file_path,
                         content,
@@ -2105,152 +3107,174 @@ async def file_operation(
                         role=role,
                         auto_commit=auto_commit
                     )
-                except Exception as e:
-                    return {"error": f"将对象转换为JSON并写入文件 {file_path} 时出错: {str(e)}"}
-            else:
-                # 处理普通文本内容
-                return await self.write_file(
+                if os.path.exists(absolute_file_path):
+                    return {"error": f"路径 {absolute_file_path} 不是一个文件"}
+                return {"error": f"文件 {absolute_file_path} 不存在"}
+
+            if not content:
+                # 追加空列表/空字典不会改变文件内容，无需读取、解析和重写
+                return {
+                    "status": "成功",
+                    "message": f"追加内容为空，文件 {absolute_file_path} 未修改",
+                    "path": absolute_file_path,
+                    "appended_items": 0
+                }
+
+            file_size = os.path.getsize(absolute_file_path)
+            if file_size > self._JSON_STREAM_APPEND_THRESHOLD:
+                # 大文件：只读取开头判断顶层类型，避免为了选择合并方式而解析整个文件
+                root_type = await asyncio.to_thread(_peek_json_root_type, absolute_file_path)
+                if root_type is not None and not isinstance(content, root_type):
+                    return {"error": f"无法合并不同类型的JSON数据。现有数据类型: {root_type.__name__}, 新数据类型: {type(content).__name__}"}
+                if root_type is list and codecs.lookup(encoding).name == 'utf-8':
+                    return await self._append_json_array_in_place(
+                        absolute_file_path,
+                        content,
+                        indent=indent,
+                        ensure_ascii=ensure_ascii,
+                        ensure_final_newline=ensure_final_newline,
+                        role=role,
+                        auto_commit=auto_commit
+                    )
+                if root_type is dict and file_size > self._JSON_MERGE_MAX_BYTES:
+                    return {"error": f"JSON 文件 {absolute_file_path} 过大（{file_size} 字节），不支持读入整个对象后合并。请改用 'edit' 操作修改。"}
+
+            # 先读取现有JSON文件（直接取得文本，不经过 read_file 的结果字典）
+            try:
+                existing_content = await self._read_text(absolute_file_path, encoding)
+            except UnicodeDecodeError:
+                return {"error": f"无法使用编码 {encoding} 读取文件 {absolute_file_path}，无法进行JSON合并操作。"}
+
+            # 尝试解析现有JSON
+            if not existing_content.strip():
+                # 文件为空，直接写入新内容
+                return await self.write_json_file(
                     file_path,
-                    str(content),  # 确保content是字符串
+                    content,
                     encoding=encoding,
-                    normalize_line_endings=normalize_line_endings,
                     ensure_final_newline=ensure_final_newline,
+                    indent=indent,
+                    ensure_ascii=ensure_ascii,
                     role=role,
                     auto_commit=auto_commit
                 )
 
-        elif operation == 'write_lines':
-            if lines is None:
-                return {"error": "write_lines操作需要提供lines参数。"}
-            return await self.write_lines(
-                file_path,
-                lines,
-                encoding=encoding,
-                ensure_newlines=ensure_newlines,
-                ensure_final_newline=ensure_final_newline,
-                backup=backup,
-                role=role,
-                auto_commit=auto_commit
-            )
-
-        elif operation == 'append':
-            if content is None:
-                return {"error": "追加操作需要提供content参数。"}
-
-            # 如果文件是JSON格式且content是字典或列表，尝试智能合并
-            if file_path.lower().endswith('.json') and isinstance(content, (dict, list)):
-                try:
-                    # 先读取现有JSON文件
-                    read_result = await self.read_file(file_path, encoding)
-
-                    if "error" in read_result:
-                        # 文件不存在或读取错误，直接写入新内容
-                        if create_if_not_exists:
-                            return await self.write_json_file(
-                                file_path,
-                                content,
-                                encoding=encoding,
-                                ensure_final_newline=ensure_final_newline,
-                                indent=indent,
-                                ensure_ascii=ensure_ascii,
-                                role=role,
-                                auto_commit=auto_commit
-                            )
-                        else:
-                            return read_result  # 返回读取错误
-
-                    # 尝试解析现有JSON
-                    existing_content = read_result.get("content", "")
-                    if not existing_content.strip():
-                        # 文件为空，直接写入新内容
-                        return await self.write_json_file(
-                            file_path,
-                            content,
-                            encoding=encoding,
-                            ensure_final_newline=ensure_final_newline,
-                            indent=indent,
-                            ensure_ascii=ensure_ascii,
-                            role=role,
-                            auto_commit=auto_commit
-                        )
+            try:
+                existing_json = _json_loads(existing_content)
+
+                # 根据现有JSON和新内容的类型进行合并。existing_json 是刚解析出的临时对象，
+                # 直接原地合并，开销只与新内容大小相关，也不必再分配一份完整的副本
+                if isinstance(existing_json, list) and isinstance(content, list):
+                    # 列表合并
+                    existing_json.extend(content)
+                    merged_content = existing_json
+                elif isinstance(existing_json, dict) and isinstance(content, dict):
+                    # 字典合并（同名键以新内容为准）
+                    existing_json.update(content)
+                    merged_content = existing_json
+                else:
+                    # 类型不匹配，无法合并
+                    return {"error": f"无法合并不同类型的JSON数据。现有数据类型: {type(existing_json).__name__}, 新数据类型: {type(content).__name__}"}
 
-                    try:
-                        existing_json = json.loads(existing_content)
-
-                        # 根据现有JSON和新内容的类型进行合并
-                        if isinstance(existing_json, list) and isinstance(content, list):
-                            # 列表合并
-                            merged_content = existing_json + content
-                        elif isinstance(existing_json, dict) and isinstance(content, dict):
-                            # 字典合并
-                            merged_content = {**existing_json, **content}
-                        else:
-                            # 类型不匹配，无法合并
-                            return {"error": f"无法合并不同类型的JSON数据。现有数据类型: {type(existing_json).__name__}, 新数据类型: {type(content).__name__}"}
-
-                        # 写入合并后的内容
-                        return await self.write_json_file(
-                            file_path,
-                            merged_content,
-                            encoding=encoding,
-                            ensure_final_newline=ensure_final_newline,
-                            indent=indent,
-                            ensure_ascii=ensure_ascii,
-                            role=role,
-                            auto_commit=auto_commit
-                        )
-                    except json.JSONDecodeError:
-                        # 现有内容不是有效的JSON，作为普通文本追加
-                        return {"error": f"文件 {file_path} 内容不是有效的JSON，无法进行JSON合并操作。"}
-
-                except Exception as e:
-                    return {"error": f"处理JSON文件 {file_path} 的追加操作时出错: {str(e)}"}
-            else:
-                # 处理普通文本内容
-                return await self.append_to_file(
+                # 写入合并后的内容（大文件改为流式序列化，避免再生成一份完整的 JSON 文本）
+                return await self.write_json_file(
                     file_path,
-                    str(content),  # 确保content是字符串
+                    merged_content,
                     encoding=encoding,
-                    normalize_line_endings=normalize_line_endings,
                     ensure_final_newline=ensure_final_newline,
+                    indent=indent,
+                    ensure_ascii=ensure_ascii,
                     role=role,
-                    auto_commit=auto_commit
+                    auto_commit=auto_commit,
+                    stream=file_size > self._JSON_STREAM_WRITE_THRESHOLD
                 )
+            except json.JSONDecodeError:
+                # 现有内容不是有效的JSON，作为普通文本追加
+                return {"error": f"文件 {file_path} 内容不是有效的JSON，无法进行JSON合并操作。"}
 
-        elif operation == 'edit':
-            if changes is None:
-                return {"error": "编辑操作需要提供changes参数。"}
+        except Exception as e:
+            return {"error": f"处理JSON文件 {file_path} 的追加操作时出错: {str(e)}"}
 
-            # 如果文件是JSON格式且changes包含JSON特定操作，可以在这里添加特殊处理
-            # 目前先使用标准的edit_text_file函数
-            return await self.edit_text_file(
-                file_path,
-                changes,
-                encoding=encoding,
-                create_if_not_exists=create_if_not_exists,
-                normalize_line_endings=normalize_line_endings,
-                ensure_final_newline=ensure_final_newline,
-                role=role,
-                auto_commit=auto_commit
-            )
+    async def _append_json_array_in_place(
+        self,
+        absolute_file_path: str,
+        content: List[Any],
+        *,
+        indent: Optional[int],
+        ensure_ascii: bool,
+        ensure_final_newline: bool,
+        role: Optional[str],
+        auto_commit: bool
+    ) -> Dict[str, Any]:
+        """把列表元素直接拼接到顶层 JSON 数组文件的末尾，只序列化新元素，不解析已有内容。"""
+        items_json = _json_dumps(content, indent=indent, ensure_ascii=ensure_ascii)
+        spliced = await asyncio.to_thread(_splice_json_array_tail, absolute_file_path, items_json, indent, ensure_final_newline)
+        if not spliced:
+            return {"error": f"文件 {absolute_file_path} 内容不是有效的JSON，无法进行JSON合并操作。"}
+
+        result = {
+            "status": "成功",
+            "message": f"已将 {len(content)} 个元素追加到JSON数组文件 {absolute_file_path}",
+            "path": absolute_file_path,
+            "size_bytes": os.path.getsize(absolute_file_path),
+            "appended_items": len(content)
+        }
+        if auto_commit:
+            git_result = await self._git_commit(absolute_file_path, "append", role)
+            result["git_result"] = git_result
+        else:
+            result["git_result"] = {"git_status": "跳过", "message": "Git提交被禁用 (auto_commit=False)"}
+        return result
 
-        elif operation == 'touch':
-            return await self.touch_file(
-                file_path,
-                create_parents=create_parents
-            )
+    async def _file_op_edit(
+        self,
+        file_path: str,
+        *,
+        changes: Optional[List[Dict[str, Any]]],
+        encoding: str,
+        create_if_not_exists: bool,
+        normalize_line_endings: bool,
+        ensure_final_newline: bool,
+        role: Optional[str],
+        auto_commit: bool,
+        **_
+    ) -> Dict[str, Any]:
+        if changes is None:
+            return {"error": "编辑操作需要提供changes参数。"}
+
+        # 如果文件是JSON格式且changes包含JSON特定操作，可以在这里添加特殊处理
+        # 目前先使用标准的edit_text_file函数
+        return await self.edit_text_file(
+            file_path,
+            changes,
+            encoding=encoding,
+            create_if_not_exists=create_if_not_exists,
+            normalize_line_endings=normalize_line_endings,
+            ensure_final_newline=ensure_final_newline,
+            role=role,
+            auto_commit=auto_commit
+        )
 
-        elif operation == 'delete':
-            return await self.delete_item(
-                file_path,
-                recursive=recursive,
-                force=force,
-                role=role,
-                auto_commit=auto_commit
-            )
+    async def _file_op_touch(self, file_path: str, *, create_parents: bool, **_) -> Dict[str, Any]:
+        return await self.touch_file(file_path, create_parents=create_parents)
 
-        else:
-            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'read', 'write', 'append', 'edit', 'delete', 'touch', 'read_lines', 'write_lines'。"}
+    async def _file_op_delete(
+        self,
+        file_path: str,
+        *,
+        recursive: bool,
+        force: bool,
+        role: Optional[str],
+        auto_commit: bool,
+        **_
+    ) -> Dict[str, Any]:
+        return await self.delete_item(
+            file_path,
+            recursive=recursive,
+            force=force,
+            role=role,
+            auto_commit=auto_commit
+        )
 
     async def directory_operation(
         self,
@@ -2302,47 +3326,99 @@ async def directory_operation(
             # 搜索文件
             result = await file_utils.directory_operation('search', 'source_directory', pattern='*.py')
         """
-        operation = operation.lower()
+        handler = self._directory_ops.get(operation) or self._directory_ops.get(operation.lower())
+        if handler is None:
+            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'list', 'create', 'structure', 'search'。"}
 
-        if operation == 'list':
-            result = await self.list_directory(path, recursive=recursive, max_depth=max_depth)
+        return await handler(
+            path,
+            recursive=recursive,
+            pattern=pattern,
+            max_depth=max_depth,
+            output_format=output_format,
+            include_patterns=include_patterns,
+            exclude_patterns=exclude_patterns,
+            exist_ok=exist_ok,
+            include_metadata=include_metadata
+        )
 
-            # 如果需要包含详细元数据
-            if include_metadata and "items" in result:
-                for item in result["items"]:
-                    if item["type"] == "file":
-                        try:
-                            metadata_result = await self.get_file_metadata(os.path.join(path, item["path"]))
-                            if "metadata" in metadata_result:
-                                item["metadata"] = metadata_result["metadata"]
-                        except Exception as e:
-                            item["metadata_error"] = str(e)
+    # ---- directory_operation 的操作适配器 ----
 
-            return result
+    async def _directory_op_list(
+        self,
+        path: str,
+        *,
+        recursive: bool,
+        max_depth: Optional[int],
+        include_metadata: bool,
+        **_
+    ) -> Dict[str, Any]:
+        # 需要元数据时让遍历顺带记录每个文件的 stat 结果，后面直接复用
+        stat_cache: Optional[Dict[str, Tuple[os.stat_result, bool]]] = {} if include_metadata else None
+        result = self._list_directory_sync(path, recursive, max_depth, stat_cache)
+
+        # 如果需要包含详细元数据：并发地在线程池中获取（以信号量限制并发数），而不是逐个串行等待
+        if include_metadata and "items" in result:
+            file_items = [item for item in result["items"] if item["type"] == "file"]
+            semaphore = asyncio.Semaphore(self._METADATA_CONCURRENCY)
+            # list_directory 返回的 base_path 已是绝对路径，item["path"] 是规范化的相对路径，直接拼接即可
+            base_prefix = os.path.join(result["base_path"], '')
+
+            async def _fetch_metadata(item):
+                async with semaphore:
+                    cached = stat_cache.get(item["path"])
+                    if cached is None:
+                        return await asyncio.to_thread(self._get_file_metadata_sync, base_prefix + item["path"])
+                    return self._get_file_metadata_sync(base_prefix + item["path"], *cached)
+
+            metadata_results = await asyncio.gather(
+                *(_fetch_metadata(item) for item in file_items),
+                return_exceptions=True
+            )
+            for item, metadata_result in zip(file_items, metadata_results):
+                if isinstance(metadata_result, Exception):
+                    item["metadata_error"] = str(metadata_result)
+                elif "metadata" in metadata_result:
+                    item["metadata"] = metadata_result["metadata"]
 
-        elif operation == 'create':
-            return await self.create_directory(path, exist_ok=exist_ok)
+        return result
 
-        elif operation == 'structure':
-            return await self.get_project_structure(
-                path,
-                max_depth=max_depth,
-                include_patterns=include_patterns,
-                exclude_patterns=exclude_patterns,
-                output_format=output_format
-            )
+    async def _directory_op_create(self, path: str, *, exist_ok: bool, **_) -> Dict[str, Any]:
+        return await self.create_directory(path, exist_ok=exist_ok)
 
-        elif operation == 'search':
-            if pattern is None:
-                return {"error": "搜索操作需要提供pattern参数。"}
-            return await self.search_files(
-                pattern=pattern,
-                directory=path,
-                recursive=recursive
-            )
+    async def _directory_op_structure(
+        self,
+        path: str,
+        *,
+        max_depth: Optional[int],
+        include_patterns: Optional[List[str]],
+        exclude_patterns: Optional[List[str]],
+        output_format: str,
+        **_
+    ) -> Dict[str, Any]:
+        return await self.get_project_structure(
+            path,
+            max_depth=max_depth,
+            include_patterns=include_patterns,
+            exclude_patterns=exclude_patterns,
+            output_format=output_format
+        )
 
-        else:
-            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'list', 'create', 'structure', 'search'。"}
+    async def _directory_op_search(
+        self,
+        path: str,
+        *,
+        pattern: Optional[str],
+        recursive: bool,
+        **_
+    ) -> Dict[str, Any]:
+        if pattern is None:
+            return {"error": "搜索操作需要提供pattern参数。"}
+        return await self.search_files(
+            pattern=pattern,
+            directory=path,
+            recursive=recursive
+        )
 
     async def file_management(
         self,
@@ -2373,17 +3449,12 @@ async def file_management(
             # 复制目录
             result = await file_utils.file_management('copy', 'source_dir', 'backup_dir', overwrite=True)
         """
-        operation = operation.lower()
-
-        if operation == 'move':
-            return await self.move_item(source_path, destination_path, overwrite=overwrite)
-
-        elif operation == 'copy':
-            return await self.copy_item(source_path, destination_path, overwrite=overwrite)
-
-        else:
+        handler = self._file_management_ops.get(operation) or self._file_management_ops.get(operation.lower())
+        if handler is None:
             return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'move', 'copy'。"}
 
+        return await handler(source_path, destination_path, overwrite=overwrite)
+
     async def file_analysis(
         self,
         operation: Annotated[str, "要执行的操作类型，支持'compare'、'metadata'、'hash'、'highlight'、'diagnostics'。"],
@@ -2429,33 +3500,45 @@ async def file_analysis(
             # 使用自定义配置文件获取代码诊断信息
             result = await file_utils.file_analysis('diagnostics', 'script.py', config_path='.pylintrc')
         """
-        operation = operation.lower()
+        handler = self._file_analysis_ops.get(operation) or self._file_analysis_ops.get(operation.lower())
+        if handler is None:
+            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'compare', 'metadata', 'hash', 'highlight', 'diagnostics'。"}
 
-        if operation == 'compare':
-            if compare_path is None:
-                return {"error": "比较操作需要提供compare_path参数。"}
-            return await self.compare_files(file_path, compare_path)
+        return await handler(
+            file_path,
+            compare_path=compare_path,
+            algorithm=algorithm,
+            language=language,
+            config_path=config_path
+        )
+
+    # ---- file_analysis 的操作适配器 ----
 
-        elif operation == 'metadata':
-            return await self.get_file_metadata(file_path)
+    async def _file_analysis_op_compare(self, file_path: str, *, compare_path: Optional[str], **_) -> Dict[str, Any]:
+        if compare_path is None:
+            return {"error": "比较操作需要提供compare_path参数。"}
+        return await self.compare_files(file_path, compare_path)
 
-        elif operation == 'hash':
-            return await self.get_file_hash(file_path, algorithm=algorithm)
+    async def _file_analysis_op_metadata(self, file_path: str, **_) -> Dict[str, Any]:
+        return await self.get_file_metadata(file_path)
 
-        elif operation == 'highlight':
-            # 先读取文件内容
-            read_result = await self.read_file(file_path)
-            if "error" in read_result:
-                return read_result
+    async def _file_analysis_op_hash(self, file_path: str, *, algorithm: str, **_) -> Dict[str, Any]:
+        return await self.get_file_hash(file_path, algorithm=algorithm)
 
-            content = read_result.get("content", "")
-            return await self.highlight_code(content, language=language)
+    async def _file_analysis_op_highlight(self, file_path: str, *, language: Optional[str], **_) -> Dict[str, Any]:
+        # 先读取文件内容（直接取得文本，不经过 read_file 的结果字典）
+        absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
+        if not os.path.isfile(absolute_file_path):
+            return {"error": f"文件 {absolute_file_path} 不存在"}
+        try:
+            content = await self._read_text(absolute_file_path)
+        except Exception as e:
+            return {"error": f"读取文件 {absolute_file_path} 时出错: {str(e)}"}
 
-        elif operation == 'diagnostics':
-            return await self.get_diagnostics(file_path, config_path=config_path)
+        return await self.highlight_code(content, language=language)
 
-        else:
-            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'compare', 'metadata', 'hash', 'highlight', 'diagnostics'。"}
+    async def _file_analysis_op_diagnostics(self, file_path: str, *, config_path: Optional[str], **_) -> Dict[str, Any]:
+        return await self.get_diagnostics(file_path, config_path=config_path)
 
     async def archive_operation(
         self,
@@ -2488,23 +3571,39 @@ async def archive_operation(
             # 解压压缩文件
             result = await file_utils.archive_operation('extract', 'backup.zip', 'extracted_dir')
         """
-        operation = operation.lower()
+        handler = self._archive_ops.get(operation) or self._archive_ops.get(operation.lower())
+        if handler is None:
+            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'create', 'extract'。"}
 
-        if operation == 'create':
-            # 如果target_path是字符串，转换为列表
-            sources = [target_path] if isinstance(target_path, str) else target_path
-            return await self.create_archive(
-                archive_path,
-                sources,
-                archive_format=archive_format,
-                compression_level=compression_level
-            )
+        return await handler(
+            archive_path,
+            target_path,
+            archive_format=archive_format,
+            compression_level=compression_level
+        )
 
-        elif operation == 'extract':
-            return await self.extract_archive(archive_path, target_path)
+    # ---- archive_operation 的操作适配器 ----
 
-        else:
-            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'create', 'extract'。"}
+    async def _archive_op_create(
+        self,
+        archive_path: str,
+        target_path: Union[str, List[str]],
+        *,
+        archive_format: str,
+        compression_level: Optional[int],
+        **_
+    ) -> Dict[str, Any]:
+        # 如果target_path是字符串，转换为列表
+        sources = [target_path] if isinstance(target_path, str) else target_path
+        return await self.create_archive(
+            archive_path,
+            sources,
+            archive_format=archive_format,
+            compression_level=compression_level
+        )
+
+    async def _archive_op_extract(self, archive_path: str, target_path: str, **_) -> Dict[str, Any]:
+        return await self.extract_archive(archive_path, target_path)
 
     async def monitor_operation(
         self,
@@ -2539,23 +3638,26 @@ async def monitor_operation(
             #     print(f"文件变化: {event_type} - {src_path}")
             # result = await file_utils.start_file_monitor('important.txt', my_callback)
         """
-        operation = operation.lower()
+        handler = self._monitor_ops.get(operation) or self._monitor_ops.get(operation.lower())
+        if handler is None:
+            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'stop', 'status'。对于'start'操作，请直接使用start_file_monitor函数。"}
 
-        if operation == 'start':
-            return {
-                "error": "由于技术限制，'start'操作不能通过monitor_operation函数调用。请直接使用start_file_monitor函数，因为回调函数无法通过JSON Schema序列化。"
-            }
+        return await handler(monitor_id)
 
-        elif operation == 'stop':
-            if monitor_id is None:
-                return {"error": "停止监控操作需要提供monitor_id参数。"}
-            return await self.stop_file_monitor(monitor_id)
+    # ---- monitor_operation 的操作适配器 ----
 
-        elif operation == 'status':
-            return await self.get_file_monitor_status(monitor_id)
+    async def _monitor_op_start(self, monitor_id: Optional[str]) -> Dict[str, Any]:
+        return {
+            "error": "由于技术限制，'start'操作不能通过monitor_operation函数调用。请直接使用start_file_monitor函数，因为回调函数无法通过JSON Schema序列化。"
+        }
 
-        else:
-            return {"error": f"不支持的操作类型: {operation}。支持的操作有: 'stop', 'status'。对于'start'操作，请直接使用start_file_monitor函数。"}
+    async def _monitor_op_stop(self, monitor_id: Optional[str]) -> Dict[str, Any]:
+        if monitor_id is None:
+            return {"error": "停止监控操作需要提供monitor_id参数。"}
+        return await self.stop_file_monitor(monitor_id)
+
+    async def _monitor_op_status(self, monitor_id: Optional[str]) -> Dict[str, Any]:
+        return await self.get_file_monitor_status(monitor_id)
 
     async def git(
         self,
@@ -2582,6 +3684,12 @@ async def git(
             # 提交更改
             result = await file_utils.git("commit", {"message": "Initial commit", "all_changes": True})
 
+            # 一次性暂存并提交多个文件（只启动一次 git add 和一次 git commit）
+            result = await file_utils.git("commit_files", {"file_paths": ["a.txt", "b.txt"], "operation": "write"})
+
+            # 大批量提交生成的文件（通过底层命令直接构建树，git 进程数与文件数无关）
+            result = await file_utils.git("bulk_commit", {"file_paths": generated_files, "message": "更新生成文件"})
+
             # 克隆仓库
             result = await file_utils.git("clone", {"url": "https://github.com/user/repo.git", "target_path": "local_repo"})
 
@@ -2600,50 +3708,21 @@ async def git(
             # 获取日志
             result = await file_utils.git("log", {"max_count": 5})
         """
-        git_manager = GitManager()
-        params = params or {}
+        # 先校验操作名，未知操作无需创建 GitManager（查找仓库根目录）
+        method_name = self._GIT_ACTIONS.get(action)
+        if method_name is None:
+            return {"status": "失败", "message": f"不支持的 Git 操作: {action}"}
 
+        params = params or {}
         try:
-            if action == "init":
-                # 不再设置默认的用户信息，使用Git的全局配置
-                if params is None:
-                    params = {}
-                # 用户名和邮箱将由GitManager类根据Git全局配置处理
-                return git_manager.init_repo(**params)
-            elif action == "clone":
-                return git_manager.clone_repo(**params)
-            elif action == "commit":
-                # 如果params中包含role参数，传递给commit方法
-                role = params.pop("role", None) if params else None
-                return git_manager.commit(**params, role=role)
-            elif action == "push":
-                return git_manager.push(**params)
-            elif action == "pull":
-                return git_manager.pull(**params)
-            elif action == "status":
-                return git_manager.status()
-            elif action == "log":
-                return git_manager.log(**params)
-            elif action == "branch":
-                return git_manager.create_branch(**params)
-            elif action == "checkout":
-                return git_manager.checkout_branch(**params)
-            elif action == "merge":
-                return git_manager.merge_branch(**params)
-            elif action == "add":
-                return git_manager.add(**params)
-            elif action == "reset":
-                return git_manager.reset(**params)
-            elif action == "stash":
-                return git_manager.stash(**params)
-            elif action == "tag":
-                return git_manager.tag(**params)
-            elif action == "remote":
-                return git_manager.remote(**params)
-            elif action == "info":
-                return git_manager.get_repo_info()
-            else:
-                return {"status": "失败", "message": f"不支持的 Git 操作: {action}"}
+            method = getattr(self._get_git_manager(), method_name)
+            # status/info 不接受参数，忽略调用方传入的 params
+            # 用户名和邮箱（init）将由GitManager类根据Git全局配置处理；commit 的 role 作为关键字参数原样传递
+            if action in self._GIT_NO_PARAM_ACTIONS:
+                params = {}
+            # clone/pull/push 等可能耗时数秒，在线程池中执行，不阻塞事件循环
+            async with self._git_lock:
+                return await asyncio.to_thread(method, **params)
         except Exception as e:
             return {"status": "失败", "message": f"执行 Git 操作 {action} 时出错: {str(e)}"}
 
@@ -2657,7 +3736,8 @@ async def write_json_file(
         ensure_final_newline: Annotated[bool, "确保文件以换行符结束。"] = True,
         backup: Annotated[bool, "如果文件已存在，是否在覆盖前创建备份。"] = False,
         role: Annotated[Optional[str], "提交者的角色，如果提供，将添加到提交信息中。"] = None,
-        auto_commit: Annotated[bool, "是否在操作后自动执行Git提交。"] = True
+        auto_commit: Annotated[bool, "是否在操作后自动执行Git提交。"] = True,
+        stream: Annotated[bool, "是否逐块序列化写入，适合数十MB的大型JSON，可降低峰值内存。"] = False
     ) -> Dict[str, Any]:
         """
         将Python对象序列化为JSON并写入文件。专门用于处理JSON数据，避免换行符问题。
@@ -2677,6 +3757,8 @@ async def write_json_file(
             backup: 如果文件已存在，是否在覆盖前创建备份。
             role: 提交者的角色，如果提供，将添加到提交信息中。
             auto_commit: 是否在操作后自动执行Git提交。
+            stream: 是否逐块序列化写入。为True时使用标准库 json 的增量编码器边序列化边写盘，
+                不在内存中生成完整的JSON文本，速度比默认方式慢，但大型数据的峰值内存显著降低。
 
         Returns:
             包含操作状态和文件信息的字典，与write_file函数返回格式相同。
@@ -2699,39 +3781,77 @@ async def write_json_file(
             # 写入JSON并创建备份
             result = await file_utils.write_json_file("important_config.json", data, backup=True)
         """
+        absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
         try:
-            # 将Python对象序列化为JSON字符串
-            json_str = json.dumps(
-                content,
-                ensure_ascii=ensure_ascii,
-                indent=indent
-            )
+            backup_path = None
+            if backup and os.path.isfile(absolute_file_path):
+                backup_path = absolute_file_path + '.bak'
+                await asyncio.to_thread(shutil.copy2, absolute_file_path, backup_path)
 
-            # 确保文件以换行符结束
-            if ensure_final_newline and not json_str.endswith('\n'):
-                json_str += '\n'
-
-            # 使用write_file函数写入文件
-            # 注意：不需要规范化行尾，因为json.dumps已经处理了换行符
-            return await self.write_file(
-                file_path=file_path,
-                content=json_str,
-                encoding=encoding,
-                normalize_line_endings=False,  # JSON已经处理了换行符
-                ensure_final_newline=False,    # 我们已经手动处理了末尾换行符
-                backup=backup,                 # 传递备份参数
-                role=role,                     # 传递角色参数
-                auto_commit=auto_commit        # 传递自动提交参数
-            )
+            if stream:
+                self._ensure_directory_exists(absolute_file_path)
+                size_bytes, line_count, ends_with_newline = await asyncio.to_thread(
+                    _write_json_stream,
+                    absolute_file_path,
+                    content,
+                    indent,
+                    ensure_ascii,
+                    encoding,
+                    ensure_final_newline
+                )
+                return await self._json_write_result(absolute_file_path, size_bytes, line_count, ends_with_newline, backup_path, role, auto_commit)
+
+            # 直接序列化为字节并写盘，跳过 write_file 的换行符规范化和 str -> bytes 的二次编码
+            data = _json_dumps(content, indent=indent, ensure_ascii=ensure_ascii)
+            tail = b'\n' if ensure_final_newline and not data.endswith(b'\n') else b''
+
+            # 计算行数
+            ends_with_newline = bool(tail) or data.endswith(b'\n')
+            line_count = data.count(b'\n') + len(tail)
+            if data and not ends_with_newline:
+                line_count += 1
+
+            if codecs.lookup(encoding).name != 'utf-8':
+                data, tail = (data + tail).decode('utf-8').encode(encoding), b''
+
+            size_bytes = await asyncio.to_thread(self._write_bytes, absolute_file_path, data, tail)
+            return await self._json_write_result(absolute_file_path, size_bytes, line_count, ends_with_newline, backup_path, role, auto_commit)
         except Exception as e:
-            absolute_file_path = os.path.abspath(os.path.join(self.base_path, file_path))
             return {"error": f"写入JSON文件 {absolute_file_path} 时出错: {str(e)}"}
 
+    async def _json_write_result(
+        self,
+        absolute_file_path: str,
+        size_bytes: int,
+        line_count: int,
+        ends_with_newline: bool,
+        backup_path: Optional[str],
+        role: Optional[str],
+        auto_commit: bool
+    ) -> Dict[str, Any]:
+        """构造 write_json_file 的返回结果，并按需执行 Git 提交。"""
+        result = {
+            "status": "成功",
+            "message": f"内容已写入文件 {absolute_file_path}",
+            "path": absolute_file_path,
+            "size_bytes": size_bytes,
+            "line_count": line_count,
+            "ends_with_newline": ends_with_newline
+        }
+        if backup_path:
+            result["backup_path"] = backup_path
+        if auto_commit:
+            git_result = await self._git_commit(absolute_file_path, "write", role)
+            result["git_result"] = git_result
+        else:
+            result["git_result"] = {"git_status": "跳过", "message": "Git提交被禁用 (auto_commit=False)"}
+        return result
+
     def _get_tool_description(self, func_name: str, default_description: str) -> str:
         """辅助函数，获取工具的描述，优先使用函数的文档字符串。"""
         func = getattr(self, func_name, None)
         if func and func.__doc__:
-            return func.__doc__.strip().split('\n')[0] # 取文档字符串的第一行作为简短描述
+            return func.__doc__.strip().split('\n', 1)[0] # 取文档字符串的第一行作为简短描述
         return default_description
 
     def get_autogen_tools(self) -> List[FunctionTool]:
@@ -2748,6 +3868,10 @@ def get_autogen_tools(self) -> List[FunctionTool]:
 
         这些被整合的函数不会出现在工具列表中，但仍然可以在代码中直接调用。
 
+        要注册的方法名及其描述只取决于类，按类计算一次并缓存（见 _get_tool_specs）；
+        FunctionTool 通过其公开构造函数为每个实例构建一次，工具列表缓存在实例上，
+        之后的调用直接返回缓存列表的副本。
+
         Returns:
             一个 FunctionTool 列表，可以直接传递给 AssistantAgent 的 tools 参数。
         """
@@ -2755,8 +3879,32 @@ def get_autogen_tools(self) -> List[FunctionTool]:
             print("AutoGen 模块不可用，无法创建 FunctionTool 实例。")
             return []
 
+        if self._autogen_tools is not None:
+            return list(self._autogen_tools)
+
+        # FunctionTool 可以直接处理同步和异步函数
+        # AutoGen 的 AssistantAgent 会正确地 await 异步工具函数
+        tools = [
+            FunctionTool(func=getattr(self, method_name), name=method_name, description=description)
+            for method_name, description in self._get_tool_specs()
+        ]
+        self._autogen_tools = tools
+        return list(tools)
+
+    def _get_tool_specs(self) -> List[Tuple[str, str]]:
+        """
+        返回要注册为工具的 (方法名, 描述) 列表。
+
+        结果只取决于类本身（方法集合与文档字符串），按类缓存，同一个类的所有实例共享，
+        不必每个实例都重新遍历 dir() 和读取文档字符串。
+        """
+        cls = type(self)
+        specs = self._tool_specs_cache.get(cls)
+        if specs is not None:
+            return specs
+
         # 已被整合到通用操作函数中的函数，不在工具列表中显示
-        integrated_methods = [
+        integrated_methods = frozenset({
             # 整合到file_operation
             "read_file",
             "write_file",
@@ -2781,6 +3929,7 @@ def get_autogen_tools(self) -> List[FunctionTool]:
             "compare_files",
             "get_file_metadata",
             "get_file_hash",
+            "get_file_hashes",
             "highlight_code",
             "get_diagnostics",
 
@@ -2792,13 +3941,12 @@ def get_autogen_tools(self) -> List[FunctionTool]:
             # 注意：start_file_monitor 需要直接使用，因为它接受回调函数参数
             "stop_file_monitor",
             "get_file_monitor_status"
-        ]
+        })
 
-        tools = []
         # 获取所有公共方法，排除已整合的方法
         public_methods = [
-            method_name for method_name in dir(self)
-            if callable(getattr(self, method_name))
+            method_name for method_name in dir(cls)
+            if callable(getattr(cls, method_name))
             and not method_name.startswith("_")
             and method_name != "get_autogen_tools"
             and method_name not in integrated_methods  # 排除已整合的方法
@@ -2821,15 +3969,12 @@ def get_autogen_tools(self) -> List[FunctionTool]:
             "write_json_file": "将Python对象(字典或列表)序列化为JSON并写入文件，自动处理换行符和特殊字符。"
         }
 
-        for method_name in public_methods:
-            method = getattr(self, method_name)
-            description = self._get_tool_description(method_name, method_descriptions.get(method_name, f"{method_name} 文件操作。"))
-
-            # FunctionTool 可以直接处理同步和异步函数
-            # AutoGen 的 AssistantAgent 会正确地 await 异步工具函数
-            tools.append(FunctionTool(func=method, name=method_name, description=description))
-
-        return tools
+        specs = [
+            (method_name, self._get_tool_description(method_name, method_descriptions.get(method_name, f"{method_name} 文件操作。")))
+            for method_name in public_methods
+        ]
+        self._tool_specs_cache[cls] = specs
+        return specs
 
 # 示例用法和注册为AutoGen工具
 if __name__ == '__main__':
@@ -2895,7 +4040,9 @@ async def example_usage():
         await file_ops.write_file("file2.txt", "Line 1 modified\nLine 2\nLine 4 new\nLine 3 common")
         compare_result = await file_ops.compare_files("file1.txt", "file2.txt")
         print(f"文件比较结果 (相似度 {compare_result.get('similarity_percentage')}%):\n{compare_result.get('diff_text')}")
-        # print(f"HTML Diff: {compare_result.get('html_diff')}") # HTML Diff 较长，选择性打印
+        # HTML Diff 较长且生成较慢，需要时传入 include_html=True
+        # html_result = await file_ops.compare_files("file1.txt", "file2.txt", include_html=True)
+        # print(f"HTML Diff: {html_result.get('html_diff')}")
 
         # 11. 获取文件元数据
         metadata_result = await file_ops.get_file_metadata("example.txt")
@@ -2996,6 +4143,8 @@ def __init__(self, repo_path: Optional[str] = None, user_name: Optional[str] = N
         self.repo_path = repo_path or self._find_git_root()
         self.user_name = user_name
         self.user_email = user_email
+        self._pygit2_repo = None  # (仓库路径, pygit2.Repository)，仓库路径变化后重新打开
+        self._repo_prefix = None  # (仓库路径, 规范化的仓库根目录前缀)，仓库路径变化后重新计算
 
         # 如果找到了仓库且提供了用户信息，则设置
         if self.repo_path and (self.user_name or self.user_email): # MODIFIED: only set if provided
@@ -3011,22 +4160,43 @@ def _find_git_root(self) -> Optional[str]:
             Git 仓库根目录的路径，如果未找到则返回 None。
         """
         current_path = os.getcwd()
+        visited = []
+        git_root = None
         while current_path:
-            if os.path.exists(os.path.join(current_path, '.git')):
-                return current_path
+            cached_root = _GIT_ROOT_CACHE.get(current_path)
+            if cached_root is not None:
+                if os.path.exists(os.path.join(cached_root, '.git')):
+                    git_root = cached_root
+                    break
+                # 仓库已被删除，丢弃所有指向它的缓存项后照常查找
+                for path in [path for path, root in _GIT_ROOT_CACHE.items() if root == cached_root]:
+                    del _GIT_ROOT_CACHE[path]
+            visited.append(current_path)
+            try:
+                os.stat(os.path.join(current_path, '.git'))  # 一次 stat 即可，.git 可以是目录也可以是文件（worktree/子模块）
+                git_root = current_path
+                break
+            except OSError:
+                pass
             parent_path = os.path.dirname(current_path)
             if parent_path == current_path:  # 已到达根目录
                 break
             current_path = parent_path
-        return None
 
-    def _run_git_command(self, command: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+        # 找到仓库时记录沿途经过的每一级目录，之后从这些目录（或其子目录）查找时可直接命中
+        if git_root is not None:
+            for path in visited:
+                _GIT_ROOT_CACHE[path] = git_root
+        return git_root
+
+    def _run_git_command(self, command: List[str], cwd: Optional[str] = None, input: Optional[str] = None) -> Dict[str, Any]:
         """
         执行 Git 命令。
 
         Args:
             command: Git 命令及其参数的列表。
             cwd: 执行命令的工作目录。如果为 None，则使用 repo_path。
+            input: 写入命令标准输入的文本（用于 --stdin-paths、--index-info 等批量输入）。
 
         Returns:
             包含命令执行结果的字典。
@@ -3041,7 +4211,8 @@ def _run_git_command(self, command: List[str], cwd: Optional[str] = None) -> Dic
                 cwd=working_dir,
                 check=True,
                 capture_output=True,
-                text=True
+                text=True,
+                input=input
             )
             return {
                 "status": "成功",
@@ -3065,6 +4236,71 @@ def _run_git_command(self, command: List[str], cwd: Optional[str] = None) -> Dic
                 "working_dir": working_dir
             }
 
+    def _get_pygit2_repo(self) -> Optional["pygit2.Repository"]:
+        """
+        返回当前仓库对应的 pygit2.Repository，首次使用时打开并缓存。
+
+        pygit2 不可用、未找到仓库或打开失败时返回 None，调用方应回退到 git 命令行。
+        """
+        if not PYGIT2_AVAILABLE or not self.repo_path:
+            return None
+        if self._pygit2_repo is None or self._pygit2_repo[0] != self.repo_path:
+            try:
+                self._pygit2_repo = (self.repo_path, pygit2.Repository(self.repo_path))
+            except Exception:
+                return None
+        return self._pygit2_repo[1]
+
+    def _run_git_commands(self, commands: List[List[str]], cwd: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        并发执行多条互不依赖的只读 Git 命令。
+
+        先启动全部进程再依次收集输出，总耗时约等于其中最慢的一条，而不是逐条累加。
+
+        Args:
+            commands: Git 命令列表，每条命令为参数列表。
+            cwd: 执行命令的工作目录。如果为 None，则使用 repo_path。
+
+        Returns:
+            与 commands 一一对应的结果字典列表，格式与 _run_git_command 相同。
+        """
+        working_dir = cwd or self.repo_path
+        if not working_dir:
+            return [{"status": "失败", "message": "未找到 Git 仓库根目录"} for _ in commands]
+
+        processes = []
+        for command in commands:
+            try:
+                process = subprocess.Popen(
+                    ['git'] + command,
+                    cwd=working_dir,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True
+                )
+            except Exception as e:
+                process = e
+            processes.append(process)
+
+        results = []
+        for command, process in zip(commands, processes):
+            command_text = ' '.join(['git'] + command)
+            if isinstance(process, Exception):
+                results.append({"status": "失败", "message": str(process), "command": command_text, "working_dir": working_dir})
+                continue
+            stdout, stderr = process.communicate()
+            if process.returncode == 0:
+                results.append({"status": "成功", "message": stdout.strip(), "command": command_text, "working_dir": working_dir})
+            else:
+                results.append({
+                    "status": "失败",
+                    "message": stderr.strip(),
+                    "command": command_text,
+                    "working_dir": working_dir,
+                    "error_code": process.returncode
+                })
+        return results
+
     def commit_file(self, file_path: str, operation: str, role: Optional[str] = None) -> Dict[str, Any]:
         """
         提交文件更改到 Git 仓库。
@@ -3074,27 +4310,51 @@ def commit_file(self, file_path: str, operation: str, role: Optional[str] = None
             operation: 执行的操作类型，如 'write', 'edit', 'delete' 等。
             role: 提交者的角色，如果提供，将添加到提交信息中。
 
+        Returns:
+            包含 Git 操作结果的字典。
+        """
+        return self.commit_files([file_path], operation, role)
+
+    def commit_files(self, file_paths: List[str], operation: str, role: Optional[str] = None) -> Dict[str, Any]:
+        """
+        将多个文件的更改作为一次提交写入 Git 仓库。
+
+        所有文件通过一次（路径过多时分批）git add 暂存，再执行一次 git commit，
+        批量操作时不必为每个文件各启动一组 git 进程。
+
+        Args:
+            file_paths: 要提交的文件路径列表。
+            operation: 执行的操作类型，如 'write', 'edit', 'delete' 等。
+            role: 提交者的角色，如果提供，将添加到提交信息中。
+
         Returns:
             包含 Git 操作结果的字典。
         """
         if not self.repo_path:
             return {"git_status": "失败", "message": "未找到 Git 仓库根目录"}
+        if not file_paths:
+            return {"git_status": "成功", "message": "没有更改需要提交", "repo_root": self.repo_path}
 
         try:
             # 构建相对于仓库根目录的文件路径
-            abs_file_path = os.path.abspath(file_path)
-            rel_file_path = os.path.relpath(abs_file_path, self.repo_path)
+            rel_file_paths = [self._repo_relative_path(file_path) for file_path in file_paths]
 
             # 构建提交信息
-            commit_message = f"{operation} {rel_file_path}"
+            if len(rel_file_paths) == 1:
+                commit_message = f"{operation} {rel_file_paths[0]}"
+            else:
+                shown = ', '.join(rel_file_paths[:5])
+                more = f" 等 {len(rel_file_paths)} 个文件" if len(rel_file_paths) > 5 else ""
+                commit_message = f"{operation} {shown}{more}"
             if role:
                 commit_message = f"[{role}] {commit_message}"
 
             # 添加文件到暂存区
             if operation != 'delete':  # 如果不是删除操作
-                add_result = self._run_git_command(['add', rel_file_path])
-                if add_result["status"] == "失败":
-                    return {"git_status": "失败", "message": f"Git add 失败: {add_result['message']}"}
+                for chunk in _chunk_paths(rel_file_paths):
+                    add_result = self._run_git_command(['add', '--'] + chunk)
+                    if add_result["status"] == "失败":
+                        return {"git_status": "失败", "message": f"Git add 失败: {add_result['message']}"}
 
             # 提交更改
             commit_result = self._run_git_command(['commit', '-m', commit_message])
@@ -3108,6 +4368,129 @@ def commit_file(self, file_path: str, operation: str, role: Optional[str] = None
         except Exception as e:
             return {"git_status": "失败", "message": f"Git 提交失败: {str(e)}"}
 
+    def bulk_commit(self, file_paths: List[str], message: str, role: Optional[str] = None) -> Dict[str, Any]:
+        """
+        使用 Git 底层命令将大量文件的当前内容作为一次提交写入仓库。
+
+        与 commit_files 不同，这里不经过 git add / git commit，而是：
+        git hash-object -w --stdin-paths 一次写入所有文件的 blob，
+        git update-index --index-info 一次更新暂存区，git write-tree 生成树，
+        git commit-tree 创建提交，最后 git update-ref 移动 HEAD。
+        已不存在的文件通过 git update-index --force-remove --stdin 一次从暂存区中移除（记为删除），
+        与仓库的对象格式（SHA-1/SHA-256）无关。
+        无论文件多少，总共最多启动 7 个 git 进程，适合批量提交程序生成的输出。
+
+        Args:
+            file_paths: 要提交的文件路径列表，必须位于仓库内。
+            message: 提交信息。
+            role: 提交者的角色，如果提供，将添加到提交信息中。
+
+        Returns:
+            包含 Git 操作结果的字典。
+        """
+        if not self.repo_path:
+            return {"git_status": "失败", "message": "未找到 Git 仓库根目录"}
+        if not file_paths:
+            return {"git_status": "成功", "message": "没有更改需要提交", "repo_root": self.repo_path}
+
+        try:
+            existing = []
+            removed = []
+            for file_path in file_paths:
+                rel_path = self._repo_relative_path(file_path)
+                if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep) or os.path.isabs(rel_path):
+                    return {"git_status": "失败", "message": f"文件不在仓库内: {file_path}"}
+                if "\n" in rel_path:
+                    return {"git_status": "失败", "message": f"不支持包含换行符的文件路径: {file_path!r}"}
+                abs_path = os.path.join(self.repo_path, rel_path)
+                # 符号链接应以链接本身入库，而 hash-object --stdin-paths 会跟随链接读取目标内容
+                if os.path.islink(abs_path):
+                    return {"git_status": "失败", "message": f"bulk_commit 不支持符号链接，请改用 commit_files: {file_path}"}
+                if os.path.isfile(abs_path):
+                    existing.append((rel_path, abs_path))
+                else:
+                    removed.append(rel_path)
+
+            index_lines = []
+            if existing:
+                hash_result = self._run_git_command(
+                    ['hash-object', '-w', '--stdin-paths'],
+                    input=''.join(f"{_git_stdin_path(rel_path)}\n" for rel_path, _ in existing)
+                )
+                if hash_result["status"] == "失败":
+                    return {"git_status": "失败", "message": f"Git hash-object 失败: {hash_result['message']}"}
+                blob_shas = hash_result["message"].split()
+                for (rel_path, abs_path), blob_sha in zip(existing, blob_shas):
+                    mode = "100755" if os.stat(abs_path).st_mode & 0o111 else "100644"
+                    index_lines.append(f"{mode} {blob_sha}\t{rel_path.replace(os.sep, '/')}\0")
+
+            if index_lines:
+                index_result = self._run_git_command(['update-index', '-z', '--index-info'], input=''.join(index_lines))
+                if index_result["status"] == "失败":
+                    return {"git_status": "失败", "message": f"Git update-index 失败: {index_result['message']}"}
+            if removed:
+                remove_result = self._run_git_command(
+                    ['update-index', '--force-remove', '-z', '--stdin'],
+                    input=''.join(f"{rel_path.replace(os.sep, '/')}\0" for rel_path in removed)
+                )
+                if remove_result["status"] == "失败":
+                    return {"git_status": "失败", "message": f"Git update-index 失败: {remove_result['message']}"}
+
+            tree_result = self._run_git_command(['write-tree'])
+            if tree_result["status"] == "失败":
+                return {"git_status": "失败", "message": f"Git write-tree 失败: {tree_result['message']}"}
+            tree_sha = tree_result["message"]
+
+            # 新仓库还没有 HEAD，此时创建的是没有父提交的根提交
+            head_result = self._run_git_command(['rev-parse', 'HEAD', 'HEAD^{tree}'])
+            parent_sha = None
+            if head_result["status"] == "成功":
+                parent_sha, head_tree_sha = head_result["message"].split()
+                if head_tree_sha == tree_sha:
+                    return {"git_status": "成功", "message": "没有更改需要提交", "repo_root": self.repo_path}
+
+            commit_message = f"[{role}] {message}" if role else message
+            commit_command = ['commit-tree', tree_sha, '-m', commit_message]
+            if parent_sha:
+                commit_command[2:2] = ['-p', parent_sha]
+            commit_result = self._run_git_command(commit_command)
+            if commit_result["status"] == "失败":
+                return {"git_status": "失败", "message": f"Git commit-tree 失败: {commit_result['message']}"}
+            commit_sha = commit_result["message"]
+
+            # 提供旧值时 update-ref 会校验 HEAD 未被并发修改
+            update_command = ['update-ref', '-m', f"commit: {commit_message}", 'HEAD', commit_sha]
+            if parent_sha:
+                update_command.append(parent_sha)
+            update_result = self._run_git_command(update_command)
+            if update_result["status"] == "失败":
+                return {"git_status": "失败", "message": f"Git update-ref 失败: {update_result['message']}"}
+
+            return {
+                "git_status": "成功",
+                "message": f"已提交 {len(file_paths)} 个文件的更改: {commit_message}",
+                "commit": commit_sha,
+                "repo_root": self.repo_path
+            }
+        except Exception as e:
+            return {"git_status": "失败", "message": f"Git 批量提交失败: {str(e)}"}
+
+    def _repo_relative_path(self, file_path: str) -> str:
+        """
+        返回文件相对于仓库根目录的路径。
+
+        仓库根目录的规范化前缀按仓库路径缓存；文件已是绝对路径时不再调用 abspath（避免 getcwd），
+        位于仓库内的文件直接截去前缀，只有仓库外或无法按前缀匹配的路径才交给 os.path.relpath。
+        """
+        if self._repo_prefix is None or self._repo_prefix[0] != self.repo_path:
+            self._repo_prefix = (self.repo_path, os.path.join(os.path.abspath(self.repo_path), ""))
+        prefix = self._repo_prefix[1]
+
+        abs_path = os.path.normpath(file_path) if os.path.isabs(file_path) else os.path.abspath(file_path)
+        if abs_path.startswith(prefix):
+            return abs_path[len(prefix):]
+        return os.path.relpath(abs_path, prefix)
+
     def init_repo(self, path: Optional[str] = None, bare: bool = False, user_name: Optional[str] = None, user_email: Optional[str] = None) -> Dict[str, Any]: # MODIFIED
         """
         初始化一个新的 Git 仓库。
@@ -3130,6 +4513,7 @@ def init_repo(self, path: Optional[str] = None, bare: bool = False, user_name: O
 
         result = self._run_git_command(command, cwd=init_path)
         if result["status"] == "成功":
+            _GIT_ROOT_CACHE.clear()
             self.repo_path = init_path
             self.user_name = user_name
             self.user_email = user_email
@@ -3156,8 +4540,10 @@ def clone(self, url: str, target_path: Optional[str] = None, branch: Optional[st
             command.append(target_path)
 
         result = self._run_git_command(command, cwd=os.path.dirname(target_path) if target_path else None)
-        if result["status"] == "成功" and target_path:
-            self.repo_path = os.path.abspath(target_path)
+        if result["status"] == "成功":
+            _GIT_ROOT_CACHE.clear()
+            if target_path:
+                self.repo_path = os.path.abspath(target_path)
         return result
 
     def create_branch(self, branch_name: str, start_point: Optional[str] = None) -> Dict[str, Any]:
@@ -3279,8 +4665,12 @@ def add(self, paths: Union[str, List[str]]) -> Dict[str, Any]:
         """
         if isinstance(paths, str):
             paths = [paths]
-        command = ['add'] + paths
-        return self._run_git_command(command)
+        # 路径很多时分批执行，避免超出命令行长度限制；任一批失败即返回该批的结果
+        for chunk in _chunk_paths(paths) or [[]]:
+            result = self._run_git_command(['add'] + chunk)
+            if result["status"] == "失败":
+                break
+        return result
 
     def _set_user_info(self) -> Dict[str, Any]:
         """
@@ -3419,6 +4809,15 @@ def get_current_branch(self) -> str:
         Returns:
             当前分支名称，如果发生错误则返回空字符串。
         """
+        repo = self._get_pygit2_repo()
+        if repo is not None:
+            try:
+                if repo.head_is_unborn:
+                    return ""  # 与 git rev-parse 在尚无提交时失败的行为一致
+                return "HEAD" if repo.head_is_detached else repo.head.shorthand
+            except Exception:
+                pass  # 回退到 git 命令行
+
         result = self._run_git_command(['rev-parse', '--abbrev-ref', 'HEAD'])
         return result.get("message", "") if result["status"] == "成功" else ""
 
@@ -3432,13 +4831,26 @@ def get_repo_info(self) -> Dict[str, Any]:
         if not self.repo_path:
             return {"status": "失败", "message": "未找到 Git 仓库根目录"}
 
+        repo = self._get_pygit2_repo()
+        if repo is not None:
+            try:
+                return {"status": "成功", "info": self._get_repo_info_pygit2(repo)}
+            except Exception:
+                pass  # 回退到 git 命令行
+
+        # 当前分支、远程仓库、最近提交三条查询互不依赖，并发执行
+        branch_result, remote_result, log_result = self._run_git_commands([
+            ['rev-parse', '--abbrev-ref', 'HEAD'],
+            ['remote', '-v'],
+            ['log', '--max-count=1', '--pretty=format:%H|%an|%ae|%at|%s']
+        ])
+
         info = {
             "repo_path": self.repo_path,
-            "current_branch": self.get_current_branch()
+            "current_branch": branch_result.get("message", "") if branch_result["status"] == "成功" else ""
         }
 
         # 获取远程仓库信息
-        remote_result = self._run_git_command(['remote', '-v'])
         if remote_result["status"] == "成功":
             remotes = {}
             for line in remote_result["message"].splitlines():
@@ -3451,7 +4863,6 @@ def get_repo_info(self) -> Dict[str, Any]:
             info["remotes"] = remotes
 
         # 获取最近的提交
-        log_result = self._run_git_command(['log', '--max-count=1', '--pretty=format:%H|%an|%ae|%at|%s'])
         if log_result["status"] == "成功" and log_result["message"]:
             commit_parts = log_result["message"].split('|')
             if len(commit_parts) >= 5:
@@ -3465,3 +4876,24 @@ def get_repo_info(self) -> Dict[str, Any]:
 
         return {"status": "成功", "info": info}
 
+    def _get_repo_info_pygit2(self, repo: "pygit2.Repository") -> Dict[str, Any]:
+        """使用 pygit2 在进程内读取仓库信息，字段与 get_repo_info 的命令行实现一致。"""
+        info = {
+            "repo_path": self.repo_path,
+            "current_branch": self.get_current_branch(),
+            # git remote -v 的每个远程会列出 fetch 和 push 两行，原实现保留的是后出现的 push 地址
+            "remotes": {remote.name: remote.push_url or remote.url for remote in repo.remotes}
+        }
+        if not repo.head_is_unborn:
+            commit = repo.head.peel(pygit2.Commit)
+            # %s 为提交信息的第一段，段内换行以空格连接
+            subject = ' '.join(commit.message.strip().split('\n\n', 1)[0].split('\n'))
+            info["last_commit"] = {
+                "hash": str(commit.id),
+                "author_name": commit.author.name,
+                "author_email": commit.author.email,
+                "timestamp": str(commit.author.time),
+                "message": subject
+            }
+        return info
+
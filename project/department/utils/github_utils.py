@@ -6,10 +6,68 @@
 """
 
 import os
+import re
 import json
+import time
+import asyncio
+import binascii
+import threading
 import requests
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any, Optional, Union, Tuple, Annotated
-import base64
+
+# orjson 解析和序列化 JSON 的速度是标准库的数倍，大的搜索结果和列表尤为明显
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("提示：未能导入 orjson，将使用标准库 json 解析和序列化 GitHub 响应。可运行 'pip install orjson' 安装。")
+
+# pybase64 使用 SIMD 实现 base64 编解码，大文件的编解码速度明显快于标准库
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+    print("提示：未能导入 pybase64，将使用标准库进行 base64 编解码。可运行 'pip install pybase64' 安装。")
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """解析 JSON 文本，优先使用 orjson。解析失败时统一抛出 json.JSONDecodeError"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # 交给标准库给出一致的错误信息
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    """将对象序列化为 JSON 文本（不转义非 ASCII 字符），优先使用 orjson"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:  # orjson 无法序列化的对象（如超出 64 位的整数）回退到标准库
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _b64decode(data: str) -> bytes:
+    """解码 base64 文本，忽略其中的换行等非 base64 字符"""
+    if PYBASE64_AVAILABLE:
+        return pybase64.b64decode(data, validate=False)
+    return binascii.a2b_base64(data)
+
+
+def _b64encode(data: bytes) -> str:
+    """将字节编码为不含换行的 base64 文本"""
+    if PYBASE64_AVAILABLE:
+        return pybase64.b64encode(data).decode("ascii")
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
 
 # 尝试导入 AutoGen 相关模块
 try:
@@ -19,9 +77,58 @@
     AUTOGEN_AVAILABLE = False
     print("未能导入 AutoGen 工具模块 (autogen_core.tools)，将无法注册为 AutoGen 的 tools")
 
+class _GitHubRetry(Retry):
+    """
+    GitHub 请求的连接层重试策略
+
+    429 和带 Retry-After 的 403（GitHub 的次级速率限制）表示请求没有被处理，
+    任何方法（包括 POST）都可以安全重试；502/503/504 只重试幂等方法，
+    避免重复创建问题、拉取请求等。
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429 or (status_code == 403 and has_retry_after):
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _make_retry() -> Retry:
+    """创建 GitHub 请求的重试配置，urllib3 支持时为退避时间加入随机抖动"""
+    options = dict(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    try:
+        # backoff_jitter 需要 urllib3 2.0 及以上版本
+        return _GitHubRetry(backoff_jitter=0.5, **options)
+    except TypeError:
+        return _GitHubRetry(**options)
+
+
 class GitHubUtils:
     """GitHub 操作工具类"""
 
+    # 获取全部分页时同时进行的请求数上限
+    _PAGE_CONCURRENCY = 10
+    # 从 Link 响应头中解析最后一页的页码
+    _LAST_PAGE_PATTERN = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+    # 完整的 40 位提交 SHA，按 SHA 指定的内容永远不会改变
+    _COMMIT_SHA_PATTERN = re.compile(r"[0-9a-f]{40}")
+
+    # 响应缓存的最大条目数
+    _RESPONSE_CACHE_SIZE = 1024
+    # 只读查询结果在缓存中的有效期（秒），有效期内直接返回缓存，不发出请求
+    _REPOSITORY_CACHE_TTL = 300
+    _BRANCHES_CACHE_TTL = 30
+    _LIST_CACHE_TTL = 60
+
+    # 速率限制用尽时，请求前最多等待的秒数；需要等待更久时直接返回错误，说明重置时间
+    _MAX_RATE_LIMIT_WAIT = 60
+
     def __init__(self, token: str = None, base_url: str = "https://api.github.com"):
         """
         初始化 GitHub 操作工具类
@@ -35,14 +142,223 @@ def __init__(self, token: str = None, base_url: str = "https://api.github.com"):
             print("警告: 未提供 GitHub 令牌，API 调用可能受到限制")
 
         self.base_url = base_url
-        self.headers = {
+        # GraphQL 端点：api.github.com 为 /graphql；GitHub Enterprise 的 REST 基础 URL 以 /api/v3 结尾，对应 /api/graphql
+        self._graphql_url = base_url[:-len("/v3")] + "/graphql" if base_url.endswith("/v3") else base_url + "/graphql"
+
+        # 复用同一个会话：连接保持在连接池中，重复调用无需每次重新进行 TCP 和 TLS 握手
+        self._session = requests.Session()
+
+        # 公共请求头只在会话上设置一次，各请求不再单独传入再合并。
+        # self.headers 就是会话的请求头，之后对它的修改会直接作用于所有请求
+        self.headers = self._session.headers
+        self.headers.update({
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "AutoGen-GitHub-Tools"
-        }
+        })
 
         if self.token:
             self.headers["Authorization"] = f"token {self.token}"
 
+        # 速率限制（429、带 Retry-After 的 403）和暂时性的 5xx 错误在连接层自动重试，
+        # 退避时间带随机抖动，并遵守响应中的 Retry-After（见 _GitHubRetry）；
+        # 重试用尽后返回最后一次响应，由调用处的 raise_for_status 报告错误
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=_make_retry()
+        ))
+
+        # 已用尽的速率限制：资源类别（core、search、graphql）-> 重置时间（Unix 时间戳）
+        self._rate_limit_resets: Dict[str, float] = {}
+
+        # 响应缓存：请求键 -> (ETag, 响应正文, 获取时间)，按最近使用顺序淘汰
+        self._response_cache: "OrderedDict[Tuple[str, Tuple], Tuple[Optional[str], bytes, float]]" = OrderedDict()
+        # 正在进行中的 GET 请求：请求键 -> Task，相同参数的并发调用共享同一次网络往返
+        self._inflight: Dict[Tuple[str, Tuple], asyncio.Task] = {}
+
+    async def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        发送 HTTP 请求
+
+        requests 是同步库，直接在协程中调用会阻塞事件循环，并发的 GitHub 调用也会依次排队执行。
+        请求放到线程池中执行后，多个并发调用的总耗时约等于其中最慢的一次往返。
+
+        如果之前的响应表明该类接口的速率限制已用尽（X-RateLimit-Remaining 为 0），
+        先异步等待到 X-RateLimit-Reset 再发出请求，而不是发出注定失败的请求。
+        需要等待超过 _MAX_RATE_LIMIT_WAIT 秒时不等待，直接抛出说明重置时间的错误。
+
+        Args:
+            method: HTTP 方法，如 "GET"、"POST"、"PUT"
+            url: 请求 URL
+            **kwargs: 传递给 requests.request 的其他参数（params、json 等）
+
+        Returns:
+            requests 的响应对象
+
+        Raises:
+            RuntimeError: 速率限制已用尽且距离重置超过 _MAX_RATE_LIMIT_WAIT 秒时
+        """
+        resource = self._rate_limit_resource(url)
+        reset_at = self._rate_limit_resets.get(resource)
+        if reset_at is not None:
+            wait = reset_at - time.time()
+            if wait > self._MAX_RATE_LIMIT_WAIT:
+                reset_time = time.strftime("%H:%M:%S", time.localtime(reset_at))
+                raise RuntimeError(f"GitHub {resource} 接口的速率限制已用尽，将于 {reset_time} 重置（约 {int(wait)} 秒后）")
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._rate_limit_resets.pop(resource, None)
+
+        response = await asyncio.to_thread(self._session.request, method, url, **kwargs)
+
+        # GraphQL 端点只用于查询，其余非 GET 请求都可能修改数据
+        if method != "GET" and url != self._graphql_url:
+            self._evict_cached_responses(url)
+
+        if response.headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in response.headers:
+            self._rate_limit_resets[response.headers.get("X-RateLimit-Resource", resource)] = float(response.headers["X-RateLimit-Reset"])
+        return response
+
+    def _evict_cached_responses(self, url: str) -> None:
+        """
+        写操作之后移除可能已过期的缓存响应，之后的读取会重新请求而不是返回修改前的结果
+
+        移除同一仓库（/repos/{owner}/{repo}）下所有接口的缓存，以及仓库列表的缓存。
+        搜索结果不移除：GitHub 的搜索索引本身就是延迟更新的。
+
+        Args:
+            url: 写请求的 URL
+        """
+        prefixes = [f"{self.base_url}/user/repos", f"{self.base_url}/users/"]
+        parts = url[len(self.base_url):].split("/") if url.startswith(self.base_url) else []
+        # parts: ["", "repos", owner, repo, ...]
+        if len(parts) >= 4 and parts[1] == "repos":
+            prefixes.append(f"{self.base_url}/repos/{parts[2]}/{parts[3]}")
+
+        for key in [key for key in self._response_cache
+                    if any(key[0] == prefix or key[0].startswith(prefix.rstrip("/") + "/") for prefix in prefixes)]:
+            del self._response_cache[key]
+
+    def _rate_limit_resource(self, url: str) -> str:
+        """返回请求 URL 所属的速率限制类别，与响应头 X-RateLimit-Resource 的取值一致"""
+        if url == self._graphql_url:
+            return "graphql"
+        if url.startswith(self.base_url + "/search/"):
+            return "search"
+        return "core"
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None, ttl: Optional[float] = None) -> Any:
+        """
+        发送 GET 请求并返回解析后的 JSON
+
+        提供 ttl 时，如果缓存的响应获取于 ttl 秒之内，直接返回缓存内容而不发出请求。
+        多个协程同时以相同的 URL 和参数调用时，只发出一个请求，其余调用等待同一个结果；
+        请求完成后立即移出，之后的调用照常发出新请求。每个调用方各自解析正文，
+        得到互不影响的对象。
+
+        Args:
+            url: 请求 URL
+            params: 查询参数
+            ttl: 缓存有效期（秒），为 None 时总是发出（条件）请求
+
+        Returns:
+            解析后的 JSON 数据
+
+        Raises:
+            requests.HTTPError: 响应状态码表示错误时
+        """
+        key = (url, tuple(sorted(params.items())) if params else ())
+        if ttl is not None:
+            cached = self._response_cache.get(key)
+            if cached and time.monotonic() - cached[2] < ttl:
+                self._response_cache.move_to_end(key)
+                return _json_loads(cached[1])
+
+        task = self._inflight.get(key)
+        # 同步封装函数可能在不同的事件循环中调用，只共享当前事件循环中的请求
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch_body(key, url, params))
+            self._inflight[key] = task
+
+            def _forget(done: asyncio.Task) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            task.add_done_callback(_forget)
+        # shield：某个调用方被取消时，不影响其他等待同一请求的调用方
+        return _json_loads(await asyncio.shield(task))
+
+    async def _fetch_body(self, key: Tuple[str, Tuple], url: str, params: Optional[Dict[str, Any]]) -> bytes:
+        """
+        发送 GET 请求并返回响应正文，使用 ETag 进行条件请求
+
+        响应正文都会写入缓存。带 ETag 的响应之后再请求时会带上 If-None-Match 头；
+        GitHub 在内容未变化时返回 304（无正文，且不计入主速率限制），此时直接使用缓存的正文。
+        缓存保存原始正文而非解析结果，调用方修改返回值不会影响缓存。
+
+        Raises:
+            requests.HTTPError: 响应状态码表示错误时
+        """
+        cached = self._response_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached and cached[0] else None
+
+        response = await self._request("GET", url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            body = cached[1]
+            etag = cached[0]
+        else:
+            response.raise_for_status()
+            body = response.content
+            etag = response.headers.get("ETag")
+
+        self._response_cache[key] = (etag, body, time.monotonic())
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self._RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return body
+
+    async def _get_all_pages(self, url: str, params: Optional[Dict[str, Any]] = None,
+                             items_key: Optional[str] = None) -> Tuple[Any, List[Any]]:
+        """
+        获取分页列表接口的全部结果
+
+        先请求第一页，从 Link 响应头中读出最后一页的页码，再并发请求其余各页
+        （最多同时 _PAGE_CONCURRENCY 个），总耗时约为两次往返，而不是逐页依次请求。
+
+        Args:
+            url: 列表接口 URL
+            params: 查询参数（不含 page）
+            items_key: 每页结果所在的字段名。列表接口的每页就是一个数组，为 None；
+                       搜索接口的每页是 {"total_count": ..., "items": [...]}，为 "items"
+
+        Returns:
+            元组 (第一页的完整响应, 按页码顺序拼接的全部结果)
+
+        Raises:
+            requests.HTTPError: 任意一页的响应状态码表示错误时
+        """
+        params = dict(params or {})
+        first = await self._request("GET", url, params={**params, "page": 1})
+        first.raise_for_status()
+        first_page = _json_loads(first.content)
+        items = list(first_page[items_key] if items_key else first_page)
+
+        match = self._LAST_PAGE_PATTERN.search(first.headers.get("Link", ""))
+        last_page = int(match.group(1)) if match else 1
+        if last_page <= 1:
+            return first_page, items
+
+        semaphore = asyncio.Semaphore(self._PAGE_CONCURRENCY)
+
+        async def fetch_page(page: int) -> List[Any]:
+            async with semaphore:
+                page_data = await self._get_json(url, params={**params, "page": page})
+                return page_data[items_key] if items_key else page_data
+
+        for page_items in await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1))):
+            items.extend(page_items)
+        return first_page, items
+
     async def get_user(self) -> Dict[str, Any]:
         """
         获取当前认证用户的信息
@@ -51,31 +367,30 @@ async def get_user(self) -> Dict[str, Any]:
             包含用户信息或错误信息的字典
         """
         try:
-            response = requests.get(f"{self.base_url}/user", headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            return await self._get_json(f"{self.base_url}/user")
         except Exception as e:
             return {"error": f"获取用户信息时出错: {str(e)}"}
 
-    async def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
+    async def get_repository(self, owner: str, repo: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         获取仓库信息
 
         Args:
             owner: 仓库所有者
             repo: 仓库名称
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含仓库信息或错误信息的字典
         """
         try:
-            response = requests.get(f"{self.base_url}/repos/{owner}/{repo}", headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            ttl = None if force_refresh else self._REPOSITORY_CACHE_TTL
+            return await self._get_json(f"{self.base_url}/repos/{owner}/{repo}", ttl=ttl)
         except Exception as e:
             return {"error": f"获取仓库信息时出错: {str(e)}"}
 
-    async def list_repositories(self, username: str = None, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+    async def list_repositories(self, username: str = None, page: int = 1, per_page: int = 30,
+                                force_refresh: bool = False) -> Dict[str, Any]:
         """
         列出用户的仓库
 
@@ -83,6 +398,7 @@ async def list_repositories(self, username: str = None, page: int = 1, per_page:
             username: 用户名，如果为 None 则列出当前认证用户的仓库
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含仓库列表或错误信息的字典
@@ -90,9 +406,26 @@ async def list_repositories(self, username: str = None, page: int = 1, per_page:
         try:
             url = f"{self.base_url}/user/repos" if username is None else f"{self.base_url}/users/{username}/repos"
             params = {"page": page, "per_page": per_page}
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            ttl = None if force_refresh else self._LIST_CACHE_TTL
+            return await self._get_json(url, params=params, ttl=ttl)
+        except Exception as e:
+            return {"error": f"列出仓库时出错: {str(e)}"}
+
+    async def list_repositories_all(self, username: str = None, per_page: int = 100) -> Dict[str, Any]:
+        """
+        列出用户的全部仓库（自动获取所有分页）
+
+        Args:
+            username: 用户名，如果为 None 则列出当前认证用户的仓库
+            per_page: 每页结果数，最大为 100
+
+        Returns:
+            与搜索接口相同形状的字典 {"total_count": 仓库数, "items": 全部仓库}，或包含错误信息的字典
+        """
+        try:
+            url = f"{self.base_url}/user/repos" if username is None else f"{self.base_url}/users/{username}/repos"
+            _, items = await self._get_all_pages(url, params={"per_page": per_page})
+            return {"total_count": len(items), "items": items}
         except Exception as e:
             return {"error": f"列出仓库时出错: {str(e)}"}
 
@@ -114,13 +447,14 @@ async def create_repository(self, name: str, description: str = "", private: boo
                 "description": description,
                 "private": private
             }
-            response = requests.post(f"{self.base_url}/user/repos", headers=self.headers, json=data)
+            response = await self._request("POST", f"{self.base_url}/user/repos", json=data)
             response.raise_for_status()
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             return {"error": f"创建仓库时出错: {str(e)}"}
 
-    async def get_file_contents(self, owner: str, repo: str, path: str, ref: str = None) -> Dict[str, Any]:
+    async def get_file_contents(self, owner: str, repo: str, path: str, ref: str = None,
+                                decode_text: bool = True, stream: bool = False) -> Dict[str, Any]:
         """
         获取文件内容
 
@@ -129,6 +463,12 @@ async def get_file_contents(self, owner: str, repo: str, path: str, ref: str = N
             repo: 仓库名称
             path: 文件路径
             ref: 分支、标签或提交 SHA
+            decode_text: 是否将文件内容按 UTF-8 解码为文本。为 False 时 decoded_content
+                         为原始字节，适用于图片、压缩包等二进制文件
+            stream: 是否以流的方式获取原始文件内容。为 True 时通过 raw 媒体类型请求，
+                    返回的 content_stream 每次产出最多 64 KB 的字节块，不经过 JSON 和 base64，
+                    内存占用与文件大小无关，适合大文件。流为同步迭代器，读取时会阻塞，
+                    在事件循环中使用时应放到线程中读取；读取完毕或不再需要时应调用 close()
 
         Returns:
             包含文件内容或错误信息的字典
@@ -139,14 +479,28 @@ async def get_file_contents(self, owner: str, repo: str, path: str, ref: str = N
             if ref:
                 params["ref"] = ref
 
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-
-            content_data = response.json()
+            if stream:
+                response = await self._request(
+                    "GET", url, params=params, stream=True,
+                    headers={"Accept": "application/vnd.github.v3.raw"}
+                )
+                if response.status_code >= 400:
+                    response.close()
+                response.raise_for_status()
+                return {
+                    "path": path,
+                    "size": int(response.headers["Content-Length"]) if "Content-Length" in response.headers else None,
+                    "content_stream": response.iter_content(chunk_size=65536),
+                    "close": response.close
+                }
+
+            # ref 是完整的提交 SHA 时内容不可变，缓存中有就直接使用，无需再发请求
+            ttl = float("inf") if ref and self._COMMIT_SHA_PATTERN.fullmatch(ref) else None
+            content_data = await self._get_json(url, params=params, ttl=ttl)
             if "content" in content_data and content_data.get("encoding") == "base64":
-                # 解码 base64 内容
-                decoded_content = base64.b64decode(content_data["content"]).decode("utf-8")
-                content_data["decoded_content"] = decoded_content
+                # 解码 base64 内容（GitHub 每 60 个字符插入一个换行，解码时直接跳过）
+                raw_content = _b64decode(content_data["content"])
+                content_data["decoded_content"] = raw_content.decode("utf-8") if decode_text else raw_content
 
             return content_data
         except Exception as e:
@@ -175,7 +529,7 @@ async def create_or_update_file(self, owner: str, repo: str, path: str,
 
             # 将内容编码为 base64
             content_bytes = content.encode("utf-8")
-            base64_content = base64.b64encode(content_bytes).decode("utf-8")
+            base64_content = _b64encode(content_bytes)
 
             data = {
                 "message": message,
@@ -188,14 +542,15 @@ async def create_or_update_file(self, owner: str, repo: str, path: str,
             if sha:
                 data["sha"] = sha
 
-            response = requests.put(url, headers=self.headers, json=data)
+            response = await self._request("PUT", url, json=data)
             response.raise_for_status()
 
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             return {"error": f"创建或更新文件时出错: {str(e)}"}
 
-    async def list_branches(self, owner: str, repo: str, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+    async def list_branches(self, owner: str, repo: str, page: int = 1, per_page: int = 30,
+                            force_refresh: bool = False) -> Dict[str, Any]:
         """
         列出仓库的分支
 
@@ -204,6 +559,7 @@ async def list_branches(self, owner: str, repo: str, page: int = 1, per_page: in
             repo: 仓库名称
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含分支列表或错误信息的字典
@@ -212,10 +568,27 @@ async def list_branches(self, owner: str, repo: str, page: int = 1, per_page: in
             url = f"{self.base_url}/repos/{owner}/{repo}/branches"
             params = {"page": page, "per_page": per_page}
 
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+            ttl = None if force_refresh else self._BRANCHES_CACHE_TTL
+            return await self._get_json(url, params=params, ttl=ttl)
+        except Exception as e:
+            return {"error": f"列出分支时出错: {str(e)}"}
+
+    async def list_branches_all(self, owner: str, repo: str, per_page: int = 100) -> Dict[str, Any]:
+        """
+        列出仓库的全部分支（自动获取所有分页）
 
-            return response.json()
+        Args:
+            owner: 仓库所有者
+            repo: 仓库名称
+            per_page: 每页结果数，最大为 100
+
+        Returns:
+            与搜索接口相同形状的字典 {"total_count": 分支数, "items": 全部分支}，或包含错误信息的字典
+        """
+        try:
+            url = f"{self.base_url}/repos/{owner}/{repo}/branches"
+            _, items = await self._get_all_pages(url, params={"per_page": per_page})
+            return {"total_count": len(items), "items": items}
         except Exception as e:
             return {"error": f"列出分支时出错: {str(e)}"}
 
@@ -240,10 +613,10 @@ async def create_branch(self, owner: str, repo: str, branch: str, sha: str) -> D
                 "sha": sha
             }
 
-            response = requests.post(url, headers=self.headers, json=data)
+            response = await self._request("POST", url, json=data)
             response.raise_for_status()
 
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             return {"error": f"创建分支时出错: {str(e)}"}
 
@@ -262,12 +635,53 @@ async def get_issue(self, owner: str, repo: str, issue_number: int) -> Dict[str,
         try:
             url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}"
 
-            response = requests.get(url, headers=self.headers)
+            return await self._get_json(url)
+        except Exception as e:
+            return {"error": f"获取问题详情时出错: {str(e)}"}
+
+    async def get_issues_batch(self, owner: str, repo: str, numbers: List[int]) -> Dict[str, Any]:
+        """
+        批量获取多个问题的详情
+
+        通过一次 GraphQL 查询（每个问题一个别名字段）获取所有问题，只需一次网络往返，
+        也只消耗一次速率限制额度，而不是每个问题各调用一次 REST 接口。
+
+        Args:
+            owner: 仓库所有者
+            repo: 仓库名称
+            numbers: 问题编号列表
+
+        Returns:
+            包含问题列表（与 numbers 顺序一致，不存在的问题为 None）或错误信息的字典
+        """
+        try:
+            numbers = [int(number) for number in numbers]
+            if not numbers:
+                return {"issues": []}
+
+            issue_fields = (
+                "number title body state url createdAt updatedAt closedAt "
+                "author { login } labels(first: 20) { nodes { name } } "
+                "assignees(first: 10) { nodes { login } } comments { totalCount }"
+            )
+            selections = " ".join(f"i{index}: issue(number: {number}) {{ {issue_fields} }}" for index, number in enumerate(numbers))
+            query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {selections} }} }}"
+
+            response = await self._request("POST", self._graphql_url, json={"query": query, "variables": {"owner": owner, "name": repo}})
             response.raise_for_status()
+            payload = _json_loads(response.content)
 
-            return response.json()
+            repository = (payload.get("data") or {}).get("repository")
+            if repository is None:
+                return {"error": f"批量获取问题时出错: {payload.get('errors') or '仓库不存在'}"}
+
+            result = {"issues": [repository.get(f"i{index}") for index in range(len(numbers))]}
+            # 部分问题不存在时 GraphQL 仍返回 200，其余问题正常返回，错误信息放在 errors 中
+            if payload.get("errors"):
+                result["errors"] = payload["errors"]
+            return result
         except Exception as e:
-            return {"error": f"获取问题详情时出错: {str(e)}"}
+            return {"error": f"批量获取问题时出错: {str(e)}"}
 
     async def create_issue(self, owner: str, repo: str, title: str, body: str = "",
                           labels: List[str] = None, assignees: List[str] = None) -> Dict[str, Any]:
@@ -299,10 +713,10 @@ async def create_issue(self, owner: str, repo: str, title: str, body: str = "",
             if assignees:
                 data["assignees"] = assignees
 
-            response = requests.post(url, headers=self.headers, json=data)
+            response = await self._request("POST", url, json=data)
             response.raise_for_status()
 
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             return {"error": f"创建问题时出错: {str(e)}"}
 
@@ -326,10 +740,10 @@ async def add_issue_comment(self, owner: str, repo: str, issue_number: int, body
                 "body": body
             }
 
-            response = requests.post(url, headers=self.headers, json=data)
+            response = await self._request("POST", url, json=data)
             response.raise_for_status()
 
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             return {"error": f"添加评论时出错: {str(e)}"}
 
@@ -348,10 +762,7 @@ async def get_pull_request(self, owner: str, repo: str, pull_number: int) -> Dic
         try:
             url = f"{self.base_url}/repos/{owner}/{repo}/pulls/{pull_number}"
 
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-
-            return response.json()
+            return await self._get_json(url)
         except Exception as e:
             return {"error": f"获取拉取请求详情时出错: {str(e)}"}
 
@@ -383,10 +794,10 @@ async def create_pull_request(self, owner: str, repo: str, title: str, head: str
                 "draft": draft
             }
 
-            response = requests.post(url, headers=self.headers, json=data)
+            response = await self._request("POST", url, json=data)
             response.raise_for_status()
 
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             return {"error": f"创建拉取请求时出错: {str(e)}"}
 
@@ -420,16 +831,16 @@ async def merge_pull_request(self, owner: str, repo: str, pull_number: int,
             if commit_message:
                 data["commit_message"] = commit_message
 
-            response = requests.put(url, headers=self.headers, json=data)
+            response = await self._request("PUT", url, json=data)
             response.raise_for_status()
 
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             return {"error": f"合并拉取请求时出错: {str(e)}"}
 
     async def search_repositories(self, query: str, sort: str = None,
                                  order: str = None, page: int = 1,
-                                 per_page: int = 30) -> Dict[str, Any]:
+                                 per_page: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
         """
         搜索仓库
 
@@ -439,6 +850,7 @@ async def search_repositories(self, query: str, sort: str = None,
             order: 排序顺序，可选值为 "asc" 或 "desc"
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含搜索结果或错误信息的字典
@@ -458,16 +870,14 @@ async def search_repositories(self, query: str, sort: str = None,
             if order:
                 params["order"] = order
 
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-
-            return response.json()
+            ttl = None if force_refresh else self._LIST_CACHE_TTL
+            return await self._get_json(url, params=params, ttl=ttl)
         except Exception as e:
             return {"error": f"搜索仓库时出错: {str(e)}"}
 
     async def search_issues(self, query: str, sort: str = None,
                            order: str = None, page: int = 1,
-                           per_page: int = 30) -> Dict[str, Any]:
+                           per_page: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
         """
         搜索问题和拉取请求
 
@@ -477,6 +887,7 @@ async def search_issues(self, query: str, sort: str = None,
             order: 排序顺序，可选值为 "asc" 或 "desc"
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含搜索结果或错误信息的字典
@@ -496,10 +907,72 @@ async def search_issues(self, query: str, sort: str = None,
             if order:
                 params["order"] = order
 
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+            ttl = None if force_refresh else self._LIST_CACHE_TTL
+            return await self._get_json(url, params=params, ttl=ttl)
+        except Exception as e:
+            return {"error": f"搜索问题时出错: {str(e)}"}
+
+    async def _search_all(self, url: str, query: str, sort: str = None, order: str = None,
+                          per_page: int = 100) -> Dict[str, Any]:
+        """
+        获取搜索接口的全部结果页，并将各页的 items 拼接为一个响应
+
+        GitHub 的搜索接口最多只返回前 1000 条结果，total_count 可能大于 items 的数量。
+
+        Returns:
+            {"total_count": ..., "incomplete_results": ..., "items": 全部结果}
+
+        Raises:
+            requests.HTTPError: 任意一页的响应状态码表示错误时
+        """
+        params = {"q": query, "per_page": per_page}
+        if sort:
+            params["sort"] = sort
+        if order:
+            params["order"] = order
+
+        first_page, items = await self._get_all_pages(url, params=params, items_key="items")
+        return {
+            "total_count": first_page.get("total_count", len(items)),
+            "incomplete_results": first_page.get("incomplete_results", False),
+            "items": items
+        }
+
+    async def search_repositories_all(self, query: str, sort: str = None,
+                                      order: str = None, per_page: int = 100) -> Dict[str, Any]:
+        """
+        搜索仓库并获取全部结果页
+
+        Args:
+            query: 搜索查询
+            sort: 排序字段
+            order: 排序顺序，可选值为 "asc" 或 "desc"
+            per_page: 每页结果数，最大为 100
+
+        Returns:
+            与 search_repositories 相同形状、包含全部结果的字典，或包含错误信息的字典
+        """
+        try:
+            return await self._search_all(f"{self.base_url}/search/repositories", query, sort, order, per_page)
+        except Exception as e:
+            return {"error": f"搜索仓库时出错: {str(e)}"}
+
+    async def search_issues_all(self, query: str, sort: str = None,
+                                order: str = None, per_page: int = 100) -> Dict[str, Any]:
+        """
+        搜索问题和拉取请求并获取全部结果页
+
+        Args:
+            query: 搜索查询
+            sort: 排序字段
+            order: 排序顺序，可选值为 "asc" 或 "desc"
+            per_page: 每页结果数，最大为 100
 
-            return response.json()
+        Returns:
+            与 search_issues 相同形状、包含全部结果的字典，或包含错误信息的字典
+        """
+        try:
+            return await self._search_all(f"{self.base_url}/search/issues", query, sort, order, per_page)
         except Exception as e:
             return {"error": f"搜索问题时出错: {str(e)}"}
 
@@ -507,34 +980,88 @@ async def search_issues(self, query: str, sort: str = None,
 # 创建默认的 GitHub 工具实例
 default_github_utils = GitHubUtils()
 
+# 同步封装函数共用的后台事件循环，在守护线程中常驻运行。
+# 每次调用都用 asyncio.run 会新建并关闭一个事件循环；常驻循环让正在进行的请求共享、
+# 线程池等与事件循环绑定的状态在多次工具调用之间得以保留。
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """返回后台事件循环，首次调用时创建并在守护线程中启动"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="github-utils-loop", daemon=True).start()
+            _background_loop = loop
+    return _background_loop
+
+
+def _run_sync(coro) -> Any:
+    """
+    在后台事件循环中运行协程，阻塞等待并返回其结果
+
+    调用方所在线程是否已有正在运行的事件循环（例如在 AutoGen 的异步代理中调用）都可以使用，
+    不会像 asyncio.run 那样报错，也不需要为每次调用新建线程和事件循环。
+    唯一的例外是在后台事件循环自身之中调用：阻塞等待会使该循环永远无法执行协程。
+    """
+    loop = _get_background_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError("不能在 GitHub 工具的后台事件循环中调用同步工具函数，请直接 await 对应的异步方法")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _call_tool(coro) -> str:
+    """
+    同步工具函数的公共调用路径：在后台事件循环中运行协程，并将结果序列化为 JSON 字符串
+
+    Args:
+        coro: GitHubUtils 方法返回的协程
+    """
+    return _json_dumps(_run_sync(coro))
+
 # 便捷函数
 async def get_user() -> Dict[str, Any]:
     """获取当前认证用户的信息"""
     return await default_github_utils.get_user()
 
-async def get_repository(owner: str, repo: str) -> Dict[str, Any]:
+async def get_repository(owner: str, repo: str, force_refresh: bool = False) -> Dict[str, Any]:
     """获取仓库信息"""
-    return await default_github_utils.get_repository(owner, repo)
+    return await default_github_utils.get_repository(owner, repo, force_refresh)
 
-async def list_repositories(username: str = None, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+async def list_repositories(username: str = None, page: int = 1, per_page: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
     """列出用户的仓库"""
-    return await default_github_utils.list_repositories(username, page, per_page)
+    return await default_github_utils.list_repositories(username, page, per_page, force_refresh)
+
+async def list_repositories_all(username: str = None, per_page: int = 100) -> Dict[str, Any]:
+    """列出用户的全部仓库"""
+    return await default_github_utils.list_repositories_all(username, per_page)
 
 async def create_repository(name: str, description: str = "", private: bool = False) -> Dict[str, Any]:
     """创建新仓库"""
     return await default_github_utils.create_repository(name, description, private)
 
-async def get_file_contents(owner: str, repo: str, path: str, ref: str = None) -> Dict[str, Any]:
+async def get_file_contents(owner: str, repo: str, path: str, ref: str = None, decode_text: bool = True, stream: bool = False) -> Dict[str, Any]:
     """获取文件内容"""
-    return await default_github_utils.get_file_contents(owner, repo, path, ref)
+    return await default_github_utils.get_file_contents(owner, repo, path, ref, decode_text, stream)
 
 async def create_or_update_file(owner: str, repo: str, path: str, message: str, content: str, branch: str = None, sha: str = None) -> Dict[str, Any]:
     """创建或更新文件"""
     return await default_github_utils.create_or_update_file(owner, repo, path, message, content, branch, sha)
 
-async def list_branches(owner: str, repo: str, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+async def list_branches(owner: str, repo: str, page: int = 1, per_page: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
     """列出仓库的分支"""
-    return await default_github_utils.list_branches(owner, repo, page, per_page)
+    return await default_github_utils.list_branches(owner, repo, page, per_page, force_refresh)
+
+async def list_branches_all(owner: str, repo: str, per_page: int = 100) -> Dict[str, Any]:
+    """列出仓库的全部分支"""
+    return await default_github_utils.list_branches_all(owner, repo, per_page)
 
 async def create_branch(owner: str, repo: str, branch: str, sha: str) -> Dict[str, Any]:
     """创建新分支"""
@@ -544,6 +1071,10 @@ async def get_issue(owner: str, repo: str, issue_number: int) -> Dict[str, Any]:
     """获取问题详情"""
     return await default_github_utils.get_issue(owner, repo, issue_number)
 
+async def get_issues_batch(owner: str, repo: str, numbers: List[int]) -> Dict[str, Any]:
+    """批量获取多个问题的详情"""
+    return await default_github_utils.get_issues_batch(owner, repo, numbers)
+
 async def create_issue(owner: str, repo: str, title: str, body: str = "", labels: List[str] = None, assignees: List[str] = None) -> Dict[str, Any]:
     """创建新问题"""
     return await default_github_utils.create_issue(owner, repo, title, body, labels, assignees)
@@ -564,13 +1095,21 @@ async def merge_pull_request(owner: str, repo: str, pull_number: int, commit_tit
     """合并拉取请求"""
     return await default_github_utils.merge_pull_request(owner, repo, pull_number, commit_title, commit_message, merge_method)
 
-async def search_repositories(query: str, sort: str = None, order: str = None, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+async def search_repositories(query: str, sort: str = None, order: str = None, page: int = 1, per_page: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
     """搜索仓库"""
-    return await default_github_utils.search_repositories(query, sort, order, page, per_page)
+    return await default_github_utils.search_repositories(query, sort, order, page, per_page, force_refresh)
+
+async def search_repositories_all(query: str, sort: str = None, order: str = None, per_page: int = 100) -> Dict[str, Any]:
+    """搜索仓库并获取全部结果"""
+    return await default_github_utils.search_repositories_all(query, sort, order, per_page)
 
-async def search_issues(query: str, sort: str = None, order: str = None, page: int = 1, per_page: int = 30) -> Dict[str, Any]:
+async def search_issues(query: str, sort: str = None, order: str = None, page: int = 1, per_page: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
     """搜索问题和拉取请求"""
-    return await default_github_utils.search_issues(query, sort, order, page, per_page)
+    return await default_github_utils.search_issues(query, sort, order, page, per_page, force_refresh)
+
+async def search_issues_all(query: str, sort: str = None, order: str = None, per_page: int = 100) -> Dict[str, Any]:
+    """搜索问题和拉取请求并获取全部结果"""
+    return await default_github_utils.search_issues_all(query, sort, order, per_page)
 
 
 # 创建 AutoGen 工具
@@ -583,13 +1122,12 @@ def get_user_sync() -> str:
         Returns:
             包含用户信息或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.get_user())
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.get_user())
 
     def get_repository_sync(
         owner: Annotated[str, "仓库所有者"],
-        repo: Annotated[str, "仓库名称"]
+        repo: Annotated[str, "仓库名称"],
+        force_refresh: Annotated[bool, "是否忽略缓存，强制从 GitHub 重新获取"] = False
     ) -> str:
         """
         获取仓库信息。
@@ -597,18 +1135,18 @@ def get_repository_sync(
         Args:
             owner: 仓库所有者
             repo: 仓库名称
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含仓库信息或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.get_repository(owner, repo))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.get_repository(owner, repo, force_refresh))
 
     def list_repositories_sync(
         username: Annotated[str, "用户名，如果为空则列出当前认证用户的仓库"] = None,
         page: Annotated[int, "页码"] = 1,
-        per_page: Annotated[int, "每页结果数"] = 30
+        per_page: Annotated[int, "每页结果数"] = 30,
+        force_refresh: Annotated[bool, "是否忽略缓存，强制从 GitHub 重新获取"] = False
     ) -> str:
         """
         列出用户的仓库。
@@ -617,13 +1155,12 @@ def list_repositories_sync(
             username: 用户名，如果为空则列出当前认证用户的仓库
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含仓库列表或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.list_repositories(username, page, per_page))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.list_repositories(username, page, per_page, force_refresh))
 
     def create_repository_sync(
         name: Annotated[str, "仓库名称"],
@@ -641,15 +1178,14 @@ def create_repository_sync(
         Returns:
             包含新仓库信息或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.create_repository(name, description, private))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.create_repository(name, description, private))
 
     def get_file_contents_sync(
         owner: Annotated[str, "仓库所有者"],
         repo: Annotated[str, "仓库名称"],
         path: Annotated[str, "文件路径"],
-        ref: Annotated[str, "分支、标签或提交 SHA"] = None
+        ref: Annotated[str, "分支、标签或提交 SHA"] = None,
+        decode_text: Annotated[bool, "是否将内容解码为文本；二进制文件请设为 false，只返回 base64 编码的 content"] = True
     ) -> str:
         """
         获取文件内容。
@@ -659,13 +1195,16 @@ def get_file_contents_sync(
             repo: 仓库名称
             path: 文件路径
             ref: 分支、标签或提交 SHA
+            decode_text: 是否将内容解码为文本；为 False 时只返回 base64 编码的 content 字段
 
         Returns:
             包含文件内容或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.get_file_contents(owner, repo, path, ref))
-        return json.dumps(result, ensure_ascii=False)
+        result = _run_sync(default_github_utils.get_file_contents(owner, repo, path, ref, decode_text))
+        # 原始字节无法序列化为 JSON，二进制文件的内容以 content 字段中的 base64 文本返回
+        if isinstance(result.get("decoded_content"), bytes):
+            del result["decoded_content"]
+        return _json_dumps(result)
 
     def create_or_update_file_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -691,15 +1230,14 @@ def create_or_update_file_sync(
         Returns:
             包含操作结果或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.create_or_update_file(owner, repo, path, message, content, branch, sha))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.create_or_update_file(owner, repo, path, message, content, branch, sha))
 
     def list_branches_sync(
         owner: Annotated[str, "仓库所有者"],
         repo: Annotated[str, "仓库名称"],
         page: Annotated[int, "页码"] = 1,
-        per_page: Annotated[int, "每页结果数"] = 30
+        per_page: Annotated[int, "每页结果数"] = 30,
+        force_refresh: Annotated[bool, "是否忽略缓存，强制从 GitHub 重新获取"] = False
     ) -> str:
         """
         列出仓库的分支。
@@ -709,13 +1247,12 @@ def list_branches_sync(
             repo: 仓库名称
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含分支列表或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.list_branches(owner, repo, page, per_page))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.list_branches(owner, repo, page, per_page, force_refresh))
 
     def create_branch_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -735,9 +1272,7 @@ def create_branch_sync(
         Returns:
             包含操作结果或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.create_branch(owner, repo, branch, sha))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.create_branch(owner, repo, branch, sha))
 
     def get_issue_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -755,9 +1290,29 @@ def get_issue_sync(
         Returns:
             包含问题详情或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.get_issue(owner, repo, issue_number))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.get_issue(owner, repo, issue_number))
+
+    def get_issues_batch_sync(
+        owner: Annotated[str, "仓库所有者"],
+        repo: Annotated[str, "仓库名称"],
+        numbers: Annotated[str, "问题编号列表，JSON 格式，例如 [1, 2, 3]"]
+    ) -> str:
+        """
+        批量获取多个问题的详情，一次请求获取全部问题。
+
+        Args:
+            owner: 仓库所有者
+            repo: 仓库名称
+            numbers: 问题编号列表，JSON 格式
+
+        Returns:
+            包含问题列表或错误信息的 JSON 字符串
+        """
+        try:
+            numbers_list = json.loads(numbers)
+        except json.JSONDecodeError:
+            return _json_dumps({"error": "问题编号列表不是有效的 JSON 格式"})
+        return _call_tool(default_github_utils.get_issues_batch(owner, repo, numbers_list))
 
     def create_issue_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -781,14 +1336,12 @@ def create_issue_sync(
         Returns:
             包含新问题信息或错误信息的 JSON 字符串
         """
-        import asyncio
         try:
             labels_list = json.loads(labels) if labels else None
             assignees_list = json.loads(assignees) if assignees else None
-            result = asyncio.run(default_github_utils.create_issue(owner, repo, title, body, labels_list, assignees_list))
-            return json.dumps(result, ensure_ascii=False)
+            return _call_tool(default_github_utils.create_issue(owner, repo, title, body, labels_list, assignees_list))
         except json.JSONDecodeError:
-            return json.dumps({"error": "标签或受理人列表不是有效的 JSON 格式"}, ensure_ascii=False)
+            return _json_dumps({"error": "标签或受理人列表不是有效的 JSON 格式"})
 
     def add_issue_comment_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -808,9 +1361,7 @@ def add_issue_comment_sync(
         Returns:
             包含评论信息或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.add_issue_comment(owner, repo, issue_number, body))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.add_issue_comment(owner, repo, issue_number, body))
 
     def get_pull_request_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -828,9 +1379,7 @@ def get_pull_request_sync(
         Returns:
             包含拉取请求详情或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.get_pull_request(owner, repo, pull_number))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.get_pull_request(owner, repo, pull_number))
 
     def create_pull_request_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -856,9 +1405,7 @@ def create_pull_request_sync(
         Returns:
             包含新拉取请求信息或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.create_pull_request(owner, repo, title, head, base, body, draft))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.create_pull_request(owner, repo, title, head, base, body, draft))
 
     def merge_pull_request_sync(
         owner: Annotated[str, "仓库所有者"],
@@ -882,16 +1429,15 @@ def merge_pull_request_sync(
         Returns:
             包含合并结果或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.merge_pull_request(owner, repo, pull_number, commit_title, commit_message, merge_method))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.merge_pull_request(owner, repo, pull_number, commit_title, commit_message, merge_method))
 
     def search_repositories_sync(
         query: Annotated[str, "搜索查询"],
         sort: Annotated[str, "排序字段"] = None,
         order: Annotated[str, "排序顺序，可选值为 asc 或 desc"] = None,
         page: Annotated[int, "页码"] = 1,
-        per_page: Annotated[int, "每页结果数"] = 30
+        per_page: Annotated[int, "每页结果数"] = 30,
+        force_refresh: Annotated[bool, "是否忽略缓存，强制从 GitHub 重新获取"] = False
     ) -> str:
         """
         搜索仓库。
@@ -902,20 +1448,20 @@ def search_repositories_sync(
             order: 排序顺序，可选值为 asc 或 desc
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含搜索结果或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.search_repositories(query, sort, order, page, per_page))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.search_repositories(query, sort, order, page, per_page, force_refresh))
 
     def search_issues_sync(
         query: Annotated[str, "搜索查询"],
         sort: Annotated[str, "排序字段"] = None,
         order: Annotated[str, "排序顺序，可选值为 asc 或 desc"] = None,
         page: Annotated[int, "页码"] = 1,
-        per_page: Annotated[int, "每页结果数"] = 30
+        per_page: Annotated[int, "每页结果数"] = 30,
+        force_refresh: Annotated[bool, "是否忽略缓存，强制从 GitHub 重新获取"] = False
     ) -> str:
         """
         搜索问题和拉取请求。
@@ -926,15 +1472,14 @@ def search_issues_sync(
             order: 排序顺序，可选值为 asc 或 desc
             page: 页码
             per_page: 每页结果数
+            force_refresh: 是否忽略缓存，强制从 GitHub 重新获取
 
         Returns:
             包含搜索结果或错误信息的 JSON 字符串
         """
-        import asyncio
-        result = asyncio.run(default_github_utils.search_issues(query, sort, order, page, per_page))
-        return json.dumps(result, ensure_ascii=False)
+        return _call_tool(default_github_utils.search_issues(query, sort, order, page, per_page, force_refresh))
 
-    # 创建 AutoGen 工具
+    # AutoGen 工具定义
     get_user_tool = FunctionTool(
         name="get_github_user",
         description="获取当前认证 GitHub 用户的信息",
@@ -989,6 +1534,12 @@ def search_issues_sync(
         func=get_issue_sync
     )
 
+    get_issues_batch_tool = FunctionTool(
+        name="get_github_issues_batch",
+        description="批量获取 GitHub 仓库中多个问题的详情（一次请求）",
+        func=get_issues_batch_sync
+    )
+
     create_issue_tool = FunctionTool(
         name="create_github_issue",
         description="在 GitHub 仓库中创建新问题",
@@ -1042,6 +1593,7 @@ def search_issues_sync(
         list_branches_tool,
         create_branch_tool,
         get_issue_tool,
+        get_issues_batch_tool,
         create_issue_tool,
         add_issue_comment_tool,
         get_pull_request_tool,
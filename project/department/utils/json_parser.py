@@ -19,9 +19,40 @@
 """
 
 # 标准库导入
+import io
 import json
+import asyncio
 import re
-from typing import Dict, List, Tuple, Optional
+import sys
+import hashlib
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Optional, Union
+
+# orjson 解析和序列化 JSON 的速度是标准库的数倍，工具调用中较大的参数尤为明显
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("提示：未能导入 orjson，将使用标准库 json 解析工具调用。可运行 'pip install orjson' 安装。")
+
+# ijson 以流式事件解析 JSON，可以从截断或损坏的输出中取回已完整的工具调用
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    print("提示：未能导入 ijson，损坏的工具调用JSON将只用正则表达式提取。可运行 'pip install ijson' 安装。")
+
+# regex 模块支持占有量词和递归子模式，可以线性地匹配嵌套的参数对象
+try:
+    import regex
+    REGEX_AVAILABLE = True
+except ImportError:
+    REGEX_AVAILABLE = False
+    print("提示：未能导入 regex，工具调用的正则提取将无法处理嵌套参数。可运行 'pip install regex' 安装。")
 
 # 第三方库导入 (在使用时动态导入，避免启动时依赖错误)
 # from autogen_agentchat.agents import AssistantAgent
@@ -29,6 +60,66 @@
 # from autogen_agentchat.messages import TextMessage
 # from autogen_core.tools import StaticWorkbench
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """解析 JSON 文本，优先使用 orjson。解析失败时统一抛出 json.JSONDecodeError"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # 交给标准库给出一致的错误信息（标准库也接受 NaN 等扩展写法）
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> str:
+    """将对象序列化为 JSON 文本，优先使用 orjson"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:  # orjson 无法序列化的对象（如非字符串键、超出 64 位的整数）回退到标准库
+            pass
+    return json.dumps(obj)
+
+# 预编译的正则表达式，避免每次调用时查找模式缓存
+_JSON_OBJ_RE = re.compile(r'(\{[\s\S]*\})')
+_TOOL_CALLS_ARRAY_RE = re.compile(r'"tool_calls"\s*:\s*\[')
+_NON_SPACE_RE = re.compile(r'\S')
+_WORD_RE = re.compile(r'\w+')
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+if REGEX_AVAILABLE:
+    # 参数对象用递归子模式 (?&args) 匹配配对的花括号，并跳过字符串中的花括号；
+    # 占有量词避免回溯
+    _TOOL_CALL_RE = regex.compile(
+        r'"type"\s*+:\s*+"function"\s*+,\s*+"function"\s*+:\s*+\{\s*+"name"\s*+:\s*+"([^"]++)"\s*+,\s*+"arguments"\s*+:\s*+'
+        r'(?P<args>\{(?:[^{}"]++|"(?:[^"\\]++|\\.)*+"|(?&args))*+\})\s*+\}',
+        regex.DOTALL
+    )
+else:
+    _TOOL_CALL_RE = re.compile(
+        r'"type"\s*:\s*"function"\s*,\s*"function"\s*:\s*\{\s*"name"\s*:\s*"([^"]+)"\s*,\s*"arguments"\s*:\s*(\{[\s\S]*?\})\s*\}'
+    )
+
+# JSON字符串中合法的转义字符
+_VALID_ESCAPES = frozenset('"\\/bfnrtu')
+
+# 包含工具调用的内容的最小长度，更短的消息（如简短的对话回复）直接跳过解析
+_MIN_TOOL_CALL_LENGTH = 20
+
+# 可以并发执行的只读工具名称前缀
+_PARALLEL_SAFE_PREFIXES = ('get_', 'read_', 'search_', 'list_')
+
+# 工具执行结果缓存的最大条目数（仅在 use_cache=True 时使用）
+_RESULT_CACHE_SIZE = 256
+# 工具执行结果缓存: (代理名称, 内容的sha256) -> 格式化后的结果内容
+_RESULT_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+@dataclass(slots=True)
+class ToolResult:
+    """单个工具调用的执行结果"""
+    index: int       # 调用序号（从1开始）
+    name: str        # 工具名称
+    arguments: str   # 参数JSON字符串
+    success: bool    # 是否执行成功
+    content: str     # 执行结果内容
+
 def extract_json_from_text(text: str) -> str:
     """
     从文本中提取JSON对象
@@ -43,12 +134,109 @@ def extract_json_from_text(text: str) -> str:
     clean_text = text.replace("IGNORE_WHEN_COPYING_START", "").replace("IGNORE_WHEN_COPYING_END", "")
 
     # 尝试找到完整的JSON对象
-    json_match = re.search(r'(\{[\s\S]*\})', clean_text)
+    json_match = _JSON_OBJ_RE.search(clean_text)
     if json_match:
         return json_match.group(1)
 
     return clean_text
 
+def _fix_json_fast(json_str: str) -> str:
+    """
+    单次扫描修复JSON字符串
+
+    从左到右扫描一次，跟踪当前是否位于字符串内以及花括号深度，同时完成：
+    删除尾随逗号、为未引用的键加引号、修复非法转义、补全未闭合的字符串和缺失的右花括号。
+    字符串内容除转义修复外保持不变；空白和字符串内容借助正则整段跳过。
+
+    Args:
+        json_str: 可能包含错误的JSON字符串
+
+    Returns:
+        修复后的JSON字符串
+    """
+    parts = []
+    n = len(json_str)
+    i = 0
+    start = 0  # 尚未输出的原文片段起点
+    depth = 0
+    prev = ''  # 字符串外上一个非空白字符
+    unterminated = False  # 文本在字符串内部结束（例如输出被截断）
+
+    while True:
+        # 跳过空白
+        m = _NON_SPACE_RE.search(json_str, i)
+        if m is None:
+            break
+        i = m.start()
+        ch = json_str[i]
+
+        if ch == '"':
+            # 字符串内部: 直接跳到下一个引号或反斜杠
+            i += 1
+            while True:
+                m = _STRING_SPECIAL_RE.search(json_str, i)
+                if m is None:
+                    i = n
+                    unterminated = True
+                    break
+                i = m.start()
+                if json_str[i] == '"':
+                    i += 1
+                    break
+                nxt = json_str[i + 1:i + 2]
+                if nxt and nxt in _VALID_ESCAPES:
+                    i += 2
+                    continue
+                parts.append(json_str[start:i])
+                if nxt == '\n':
+                    # 反斜杠后紧跟换行
+                    parts.append('\\n')
+                    i += 2
+                else:
+                    # 非法转义，转义反斜杠本身
+                    parts.append('\\\\')
+                    i += 1
+                start = i
+            prev = '"'
+        elif ch == ',':
+            # 尾随逗号: 逗号后只有空白和右括号时删除逗号及空白
+            m = _NON_SPACE_RE.search(json_str, i + 1)
+            if m is not None and json_str[m.start()] in '}]':
+                parts.append(json_str[start:i])
+                i = start = m.start()
+            else:
+                prev = ','
+                i += 1
+        elif prev in ('{', ',') and (ch.isalnum() or ch == '_'):
+            # 可能是未引用的键
+            word_end = _WORD_RE.match(json_str, i).end()
+            m = _NON_SPACE_RE.search(json_str, word_end)
+            if m is not None and json_str[m.start()] == ':':
+                parts.append(json_str[start:i])
+                parts.append('"' + json_str[i:word_end] + '"')
+                start = word_end
+            prev = json_str[word_end - 1]
+            i = word_end
+        else:
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+            prev = ch
+            i += 1
+
+    parts.append(json_str[start:])
+
+    # 补全未闭合的字符串，之后补的右花括号才不会落在字符串里
+    if unterminated:
+        parts.append('"')
+
+    # 修复括号不匹配
+    if depth > 0:
+        parts.append('}' * depth)
+
+    return ''.join(parts)
+
 def fix_json_string(json_str: str) -> str:
     """
     修复常见的JSON格式错误
@@ -59,28 +247,14 @@ def fix_json_string(json_str: str) -> str:
     Returns:
         修复后的JSON字符串
     """
-    # 修复尾随逗号
-    fixed_json = re.sub(r',\s*}', '}', json_str)
-    fixed_json = re.sub(r',\s*]', ']', fixed_json)
-
-    # 修复未引用的键
-    fixed_json = re.sub(r'([{,]\s*)(\w+)(\s*:)', r'\1"\2"\3', fixed_json)
+    fixed_json = json_str
 
     # 修复单引号
     if "'" in fixed_json and '"' not in fixed_json:
         fixed_json = fixed_json.replace("'", '"')
 
-    # 修复转义字符
-    fixed_json = fixed_json.replace("\\\n", "\\n")
-    fixed_json = re.sub(r'(?<!\\)\\(?!["\\/bfnrtu])', r'\\\\', fixed_json)
-
-    # 修复括号不匹配
-    open_braces = fixed_json.count('{')
-    close_braces = fixed_json.count('}')
-    if open_braces > close_braces:
-        fixed_json += '}' * (open_braces - close_braces)
-
-    return fixed_json
+    # 尾随逗号、未引用的键、转义字符和括号不匹配在一次扫描中修复
+    return _fix_json_fast(fixed_json)
 
 def parse_json_safely(json_str: str) -> Tuple[Dict, bool, str]:
     """
@@ -94,18 +268,96 @@ def parse_json_safely(json_str: str) -> Tuple[Dict, bool, str]:
     """
     try:
         # 尝试直接解析
-        result = json.loads(json_str)
+        result = _json_loads(json_str)
         return result, True, ""
     except json.JSONDecodeError as e:
         # 尝试修复并重新解析
         try:
             fixed_json = fix_json_string(json_str)
-            result = json.loads(fixed_json)
+            result = _json_loads(fixed_json)
             return result, True, f"已修复JSON格式问题: {str(e)}"
         except json.JSONDecodeError as e2:
             # 如果修复后仍然失败，返回错误
             return {}, False, f"JSON解析失败: {str(e2)}"
 
+def _stream_tool_calls(json_str: str) -> Tuple[List[Dict], int]:
+    """
+    使用 ijson 流式提取 tool_calls 数组中已完整解析的元素
+
+    遇到语法错误时停止，并保留出错位置之前的工具调用。出错位置之后可能还有完整的工具调用
+    （例如两个调用之间夹着注释），因此同时返回最后一个已提取元素在 json_str 中的结束位置，
+    由调用方对剩余文本继续提取。
+
+    Args:
+        json_str: 可能不完整的JSON字符串
+
+    Returns:
+        元组 (工具调用列表, 剩余文本的起始位置)；ijson 不可用、没有提取到，
+        或无法定位已提取元素的结束位置时为 ([], 0)
+    """
+    if not IJSON_AVAILABLE:
+        return [], 0
+
+    items = []
+    try:
+        for item in ijson.items(io.BytesIO(json_str.encode("utf-8")), "tool_calls.item", use_float=True):
+            items.append(item)
+    except ijson.JSONError:
+        pass
+    if not items:
+        return [], 0
+
+    # 逐个跳过已提取的数组元素，定位最后一个元素的结束位置
+    array_match = _TOOL_CALLS_ARRAY_RE.search(json_str)
+    if not array_match:
+        return [], 0
+    decoder = json.JSONDecoder()
+    pos = array_match.end()
+    try:
+        for _ in items:
+            pos = _NON_SPACE_RE.search(json_str, pos).start()
+            if json_str[pos] == ',':
+                pos = _NON_SPACE_RE.search(json_str, pos + 1).start()
+            _, pos = decoder.raw_decode(json_str, pos)
+    except (AttributeError, IndexError, json.JSONDecodeError):
+        return [], 0
+
+    return [item for item in items if isinstance(item, dict)], pos
+
+def _regex_tool_calls(text: str) -> Tuple[List[Tuple[str, Any]], str]:
+    """
+    使用正则表达式直接从文本中提取工具调用
+
+    Args:
+        text: 包含工具调用的文本
+
+    Returns:
+        元组 ((函数名, 参数) 列表, 提取过程中的错误信息)
+    """
+    extracted_tool_calls = []
+    errors = ""
+    for match in _TOOL_CALL_RE.finditer(text):
+        try:
+            tool_name = match.group(1)
+            arguments_str = match.group(2)
+
+            # 尝试解析参数
+            try:
+                arguments = _json_loads(arguments_str)
+            except json.JSONDecodeError:
+                # 修复参数并重新解析
+                fixed_args = fix_json_string(arguments_str)
+                try:
+                    arguments = _json_loads(fixed_args)
+                except json.JSONDecodeError:
+                    # 如果仍然失败，使用原始字符串
+                    arguments = {"raw_arguments": arguments_str}
+
+            extracted_tool_calls.append((tool_name, arguments))
+        except Exception as e:
+            errors += f"\n提取工具调用时出错: {str(e)}"
+    return extracted_tool_calls, errors
+
 def extract_tool_calls(text: str) -> Tuple[List[Dict], bool, str]:
     """
     从文本中提取工具调用
@@ -116,6 +368,27 @@ def extract_tool_calls(text: str) -> Tuple[List[Dict], bool, str]:
     Returns:
         元组 (工具调用列表, 是否成功, 错误消息)
     """
+    tool_calls, pairs, success, error_message = _extract_tool_calls(text)
+    if pairs:
+        tool_calls = [
+            {"type": "function", "function": {"name": name, "arguments": arguments}}
+            for name, arguments in pairs
+        ]
+    return tool_calls, success, error_message
+
+def _extract_tool_calls(text: str) -> Tuple[List[Dict], List[Tuple[str, Any]], bool, str]:
+    """
+    extract_tool_calls 的内部实现
+
+    正则表达式提取的工具调用以 (函数名, 参数) 元组返回，格式已由正则保证，
+    可以跳过嵌套字典的构造和验证，直接交给 _prepare_from_pair。
+
+    Args:
+        text: 包含工具调用的文本
+
+    Returns:
+        元组 (工具调用列表, 正则提取的 (函数名, 参数) 列表, 是否成功, 错误消息)
+    """
     # 提取JSON
     json_str = extract_json_from_text(text)
 
@@ -123,50 +396,31 @@ def extract_tool_calls(text: str) -> Tuple[List[Dict], bool, str]:
     parsed_json, success, error_message = parse_json_safely(json_str)
 
     if not success:
-        # 尝试使用正则表达式直接提取工具调用
-        extracted_tool_calls = []
-        tool_matches = re.finditer(
-            r'"type"\s*:\s*"function"\s*,\s*"function"\s*:\s*\{\s*"name"\s*:\s*"([^"]+)"\s*,\s*"arguments"\s*:\s*(\{[\s\S]*?\})\s*\}',
-            text
-        )
+        # 先尝试流式解析，取回出错位置之前的完整工具调用
+        streamed_tool_calls, tail_start = _stream_tool_calls(json_str)
+        if streamed_tool_calls:
+            # 出错位置之后的文本再用正则表达式提取，避免丢掉后面完整的工具调用
+            tail_pairs, tail_errors = _regex_tool_calls(json_str[tail_start:])
+            tool_calls = streamed_tool_calls + [
+                {"type": "function", "function": {"name": name, "arguments": arguments}}
+                for name, arguments in tail_pairs
+            ]
+            return tool_calls, [], True, f"使用流式解析提取了 {len(tool_calls)} 个工具调用。{error_message}{tail_errors}"
 
-        for match in tool_matches:
-            try:
-                tool_name = match.group(1)
-                arguments_str = match.group(2)
-
-                # 尝试解析参数
-                try:
-                    arguments = json.loads(arguments_str)
-                except json.JSONDecodeError:
-                    # 修复参数并重新解析
-                    fixed_args = fix_json_string(arguments_str)
-                    try:
-                        arguments = json.loads(fixed_args)
-                    except json.JSONDecodeError:
-                        # 如果仍然失败，使用原始字符串
-                        arguments = {"raw_arguments": arguments_str}
-
-                extracted_tool_calls.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool_name,
-                        "arguments": arguments
-                    }
-                })
-            except Exception as e:
-                error_message += f"\n提取工具调用时出错: {str(e)}"
+        # 尝试使用正则表达式直接提取工具调用
+        extracted_tool_calls, regex_errors = _regex_tool_calls(text)
+        error_message += regex_errors
 
         if extracted_tool_calls:
-            return extracted_tool_calls, True, f"使用正则表达式提取了 {len(extracted_tool_calls)} 个工具调用。{error_message}"
+            return [], extracted_tool_calls, True, f"使用正则表达式提取了 {len(extracted_tool_calls)} 个工具调用。{error_message}"
 
-        return [], False, error_message
+        return [], [], False, error_message
 
     # 从解析的JSON中提取工具调用
     if "tool_calls" in parsed_json and isinstance(parsed_json["tool_calls"], list):
-        return parsed_json["tool_calls"], True, error_message
+        return parsed_json["tool_calls"], [], True, error_message
 
-    return [], False, "JSON中未找到有效的工具调用"
+    return [], [], False, "JSON中未找到有效的工具调用"
 
 def validate_tool_call(tool_call: Dict) -> Tuple[bool, str]:
     """
@@ -199,7 +453,7 @@ def validate_tool_call(tool_call: Dict) -> Tuple[bool, str]:
     # 如果参数是字符串，尝试解析为JSON
     if isinstance(function_data["arguments"], str):
         try:
-            json.loads(function_data["arguments"])
+            _json_loads(function_data["arguments"])
         except json.JSONDecodeError:
             return False, "函数参数必须是有效的JSON字符串"
 
@@ -222,45 +476,68 @@ def prepare_function_call(tool_call: Dict) -> Dict:
 
     function_data = tool_call["function"]
 
-    # 确保参数是JSON字符串
+    # 确保参数是JSON字符串。字符串参数在验证时已确认是有效的JSON，直接使用，无需再次解析
     arguments = function_data["arguments"]
-    if isinstance(arguments, dict):
-        arguments_str = json.dumps(arguments)
+    if isinstance(arguments, str):
+        arguments_str = arguments
     else:
-        # 如果已经是字符串，确保是有效的JSON
-        try:
-            json.loads(arguments)
-            arguments_str = arguments
-        except json.JSONDecodeError:
-            # 尝试修复
-            fixed_args = fix_json_string(arguments)
-            try:
-                json.loads(fixed_args)
-                arguments_str = fixed_args
-            except json.JSONDecodeError:
-                # 如果仍然失败，包装为原始参数
-                arguments_str = json.dumps({"raw_arguments": arguments})
+        arguments_str = _json_dumps(arguments)
 
     return {
         "name": function_data["name"],
         "arguments": arguments_str
     }
 
+def _prepare_from_pair(name: str, arguments: Any) -> Tuple[str, str]:
+    """
+    由正则提取的 (函数名, 参数) 直接准备函数调用，跳过 validate_tool_call 的字典遍历
+
+    Args:
+        name: 函数名称（正则保证非空）
+        arguments: 已解析的参数
+
+    Returns:
+        元组 (函数名, 参数JSON字符串)
+    """
+    return name, _json_dumps(arguments)
+
 def process_tool_calls_json(content: str) -> Tuple[List[Dict], bool, str]:
     """
     处理包含工具调用的JSON内容
 
+    解析过程是纯函数，结果按内容缓存；每次调用都返回新的列表和字典，
+    调用方可以放心修改。
+
     Args:
         content: 包含工具调用的文本
 
     Returns:
         元组 (处理后的函数调用列表, 是否成功, 错误消息)
     """
+    calls, success, error_message = _process_tool_calls_json_cached(content)
+    return [{"name": name, "arguments": arguments} for name, arguments in calls], success, error_message
+
+@functools.lru_cache(maxsize=256)
+def _process_tool_calls_json_cached(content: str) -> Tuple[Tuple[Tuple[str, str], ...], bool, str]:
+    """
+    process_tool_calls_json 的缓存实现，以不可变的 (name, arguments) 元组保存结果
+
+    Args:
+        content: 包含工具调用的文本
+
+    Returns:
+        元组 ((函数名, 参数JSON字符串) 元组, 是否成功, 错误消息)
+    """
     # 提取工具调用
-    tool_calls, success, error_message = extract_tool_calls(content)
+    tool_calls, pairs, success, error_message = _extract_tool_calls(content)
+
+    # 正则提取的结果格式已确定，直接构造
+    if pairs:
+        calls = tuple(_prepare_from_pair(name, arguments) for name, arguments in pairs)
+        return calls, True, error_message
 
     if not success or not tool_calls:
-        return [], success, error_message
+        return (), success, error_message
 
     # 准备函数调用
     function_calls = []
@@ -271,7 +548,17 @@ def process_tool_calls_json(content: str) -> Tuple[List[Dict], bool, str]:
         except ValueError as e:
             error_message += f"\n工具调用 {i+1} 无效: {str(e)}"
 
-    return function_calls, bool(function_calls), error_message
+    calls = tuple((call["name"], call["arguments"]) for call in function_calls)
+    return calls, bool(calls), error_message
+
+def clear_memo_cache() -> None:
+    """
+    清空工具调用解析缓存和工具执行结果缓存
+
+    在会话边界或工具状态发生变化（例如文件被外部修改）后调用。
+    """
+    _process_tool_calls_json_cached.cache_clear()
+    _RESULT_CACHE.clear()
 
 async def _create_function_calls(function_calls_data):
     """
@@ -309,74 +596,112 @@ async def _create_function_calls(function_calls_data):
         return [], False, error_msg
 
 
-async def _execute_function_calls(function_calls, workbench, agent_name, cancellation_token):
+async def _execute_single_call(index, total, function_call, workbench, agent_name, cancellation_token, concurrent=False):
     """
-    执行函数调用并返回结果
+    执行单个函数调用并返回结果记录
+
+    开始执行的提示立即输出，执行结果的日志收集起来在执行完后一次性写出；
+    并发执行时开始提示也一并缓冲，各工具的日志不会交错。
 
     Args:
-        function_calls: FunctionCall对象列表
+        index: 调用序号（从0开始）
+        total: 本次调用总数
+        function_call: FunctionCall对象
         workbench: 工具工作台
         agent_name: 代理名称
         cancellation_token: 取消令牌
+        concurrent: 是否与其他工具调用并发执行
 
     Returns:
-        元组 (执行结果列表, 是否成功, 错误消息)
+        ToolResult 执行结果
     """
     # 动态导入，避免启动时依赖错误
     from autogen_agentchat.agents import AssistantAgent
 
-    all_results = []
+    i = index
+    start_line = f"[系统] 执行工具调用 {i+1}/{total}: {function_call.name}\n"
+    if concurrent:
+        log_lines = [start_line]
+    else:
+        sys.stdout.write(start_line)
+        sys.stdout.flush()
+        log_lines = []
     try:
-        for i, function_call in enumerate(function_calls):
+        # 使用AssistantAgent._execute_tool_call方法执行工具调用
+        result_tuple = await AssistantAgent._execute_tool_call(
+            tool_call=function_call,
+            workbench=workbench,
+            handoff_tools=[],
+            agent_name=agent_name,
+            cancellation_token=cancellation_token
+        )
+
+        result = result_tuple[1]  # 获取执行结果
+
+        status = "成功" if not result.is_error else "失败"
+        log_lines.append(f"[系统] 工具调用 {i+1} 执行{status}\n")
+
+        # 显示文件操作信息
+        if function_call.name == "write_file" and not result.is_error:
             try:
-                print(f"[系统] 执行工具调用 {i+1}/{len(function_calls)}: {function_call.name}")
-
-                # 使用AssistantAgent._execute_tool_call方法执行工具调用
-                result_tuple = await AssistantAgent._execute_tool_call(
-                    tool_call=function_call,
-                    workbench=workbench,
-                    handoff_tools=[],
-                    agent_name=agent_name,
-                    cancellation_token=cancellation_token
-                )
+                args = _json_loads(function_call.arguments)
+                log_lines.append(f"[系统] 已创建/修改文件: {args.get('file_path', '未知文件')}\n")
+            except (json.JSONDecodeError, AttributeError, TypeError):
+                pass
+        elif function_call.name == "read_file" and not result.is_error:
+            try:
+                args = _json_loads(function_call.arguments)
+                log_lines.append(f"[系统] 已读取文件: {args.get('file_path', '未知文件')}\n")
+            except (json.JSONDecodeError, AttributeError, TypeError):
+                pass
 
-                result = result_tuple[1]  # 获取执行结果
-
-                # 添加到结果列表
-                all_results.append({
-                    "index": i+1,
-                    "name": function_call.name,
-                    "arguments": function_call.arguments,
-                    "success": not result.is_error,
-                    "content": result.content
-                })
-
-                status = "成功" if not result.is_error else "失败"
-                print(f"[系统] 工具调用 {i+1} 执行{status}")
-
-                # 显示文件操作信息
-                if function_call.name == "write_file" and not result.is_error:
-                    try:
-                        args = json.loads(function_call.arguments)
-                        print(f"[系统] 已创建/修改文件: {args.get('file_path', '未知文件')}")
-                    except:
-                        pass
-                elif function_call.name == "read_file" and not result.is_error:
-                    try:
-                        args = json.loads(function_call.arguments)
-                        print(f"[系统] 已读取文件: {args.get('file_path', '未知文件')}")
-                    except:
-                        pass
-            except Exception as e:
-                print(f"[错误] 执行工具调用 {i+1} 时出错: {e}")
-                all_results.append({
-                    "index": i+1,
-                    "name": function_call.name,
-                    "arguments": function_call.arguments,
-                    "success": False,
-                    "content": f"执行失败: {str(e)}"
-                })
+        return ToolResult(i+1, function_call.name, function_call.arguments, not result.is_error, result.content)
+    except Exception as e:
+        log_lines.append(f"[错误] 执行工具调用 {i+1} 时出错: {e}\n")
+        return ToolResult(i+1, function_call.name, function_call.arguments, False, f"执行失败: {str(e)}")
+    finally:
+        sys.stdout.write("".join(log_lines))
+
+
+async def _execute_function_calls(function_calls, workbench, agent_name, cancellation_token):
+    """
+    执行函数调用并返回结果
+
+    连续出现的只读工具调用（名称以 _PARALLEL_SAFE_PREFIXES 中的前缀开头）使用
+    asyncio.gather 并发执行，其余工具调用按顺序执行，保证与写操作之间的先后顺序不变。
+
+    Args:
+        function_calls: FunctionCall对象列表
+        workbench: 工具工作台
+        agent_name: 代理名称
+        cancellation_token: 取消令牌
 
+    Returns:
+        元组 (执行结果列表, 是否成功, 错误消息)
+    """
+    all_results = []
+    total = len(function_calls)
+    try:
+        i = 0
+        while i < total:
+            # 找出从当前位置开始的连续只读工具调用
+            j = i
+            while j < total and function_calls[j].name.startswith(_PARALLEL_SAFE_PREFIXES):
+                j += 1
+
+            if j - i > 1:
+                all_results.extend(await asyncio.gather(*(
+                    _execute_single_call(k, total, function_calls[k], workbench, agent_name, cancellation_token, concurrent=True)
+                    for k in range(i, j)
+                )))
+                i = j
+            else:
+                all_results.append(await _execute_single_call(
+                    i, total, function_calls[i], workbench, agent_name, cancellation_token
+                ))
+                i += 1
+
+        sys.stdout.flush()
         return all_results, True, ""
     except Exception as e:
         error_msg = f"执行函数调用时出错: {e}"
@@ -384,72 +709,87 @@ async def _execute_function_calls(function_calls, workbench, agent_name, cancell
         return all_results, False, error_msg
 
 
+@functools.lru_cache(maxsize=256)
+def _format_arguments(arguments: str) -> Optional[str]:
+    """
+    将参数JSON字符串格式化为逐行的 "  键: 值" 文本
+
+    迭代执行时同一组参数（例如反复读取同一文件）经常重复出现，结果按参数字符串缓存。
+
+    Args:
+        arguments: 参数JSON字符串
+
+    Returns:
+        格式化后的参数文本，无法解析为对象时返回 None
+    """
+    try:
+        args = _json_loads(arguments)
+        return "\n".join([f"  {k}: {v}" for k, v in args.items()])
+    except (json.JSONDecodeError, AttributeError, TypeError):
+        return None
+
+
 def _format_tool_results(all_results, json_error_message=""):
     """
     格式化工具执行结果为易于理解的文本
 
     Args:
-        all_results: 工具执行结果列表
+        all_results: 工具执行结果（ToolResult）列表
         json_error_message: JSON解析过程中的错误信息
 
     Returns:
         格式化后的结果文本
     """
-    result_content = ""
+    # 先收集片段再一次性拼接，避免结果较多时反复复制整个字符串
+    parts = []
     try:
         # 如果有JSON解析错误，添加到结果开头
         if json_error_message:
-            result_content += f"⚠️ JSON解析警告: {json_error_message}\n\n"
-            result_content += "请在下次工具调用时注意JSON格式，确保符合标准格式。\n\n"
+            parts.append(f"⚠️ JSON解析警告: {json_error_message}\n\n")
+            parts.append("请在下次工具调用时注意JSON格式，确保符合标准格式。\n\n")
 
         if len(all_results) == 1:
             result = all_results[0]
-            status = "成功" if result["success"] else "失败"
+            status = "成功" if result.success else "失败"
 
             # 为命令行工具提供更详细的输出格式
-            if result['name'] in ['execute_command', 'launch-process']:
-                result_content += f"工具 {result['name']} 执行{status}:\n\n"
-                result_content += f"{result['content']}"
+            if result.name in ['execute_command', 'launch-process']:
+                parts.append(f"工具 {result.name} 执行{status}:\n\n")
+                parts.append(f"{result.content}")
             else:
                 # 其他工具保持原有格式
-                result_content += f"工具 {result['name']} 执行{status}:\n\n"
+                parts.append(f"工具 {result.name} 执行{status}:\n\n")
                 # 添加参数信息
-                try:
-                    args = json.loads(result["arguments"])
-                    args_str = "\n".join([f"  {k}: {v}" for k, v in args.items()])
-                    result_content += f"参数:\n{args_str}\n\n"
-                except:
-                    pass
+                args_str = _format_arguments(result.arguments)
+                if args_str is not None:
+                    parts.append(f"参数:\n{args_str}\n\n")
 
-                result_content += f"结果:\n{result['content']}"
+                parts.append(f"结果:\n{result.content}")
         else:
-            result_content += f"所有工具调用的执行结果 (共 {len(all_results)} 次调用):\n\n"
+            parts.append(f"所有工具调用的执行结果 (共 {len(all_results)} 次调用):\n\n")
             for result in all_results:
-                status = "成功" if result["success"] else "失败"
-                result_content += f"=== 工具: {result['name']} (调用 {result['index']}/{len(all_results)}) ===\n"
-                result_content += f"状态: {status}\n"
+                status = "成功" if result.success else "失败"
+                parts.append(f"=== 工具: {result.name} (调用 {result.index}/{len(all_results)}) ===\n")
+                parts.append(f"状态: {status}\n")
 
                 # 添加参数信息
-                try:
-                    args = json.loads(result["arguments"])
-                    args_str = "\n".join([f"  {k}: {v}" for k, v in args.items()])
-                    result_content += f"参数:\n{args_str}\n\n"
-                except:
-                    pass
+                args_str = _format_arguments(result.arguments)
+                if args_str is not None:
+                    parts.append(f"参数:\n{args_str}\n\n")
 
                 # 为命令行工具保持原始格式，其他工具添加额外格式
-                if result['name'] in ['execute_command', 'launch-process']:
-                    result_content += f"结果:\n{result['content']}\n\n"
+                if result.name in ['execute_command', 'launch-process']:
+                    parts.append(f"结果:\n{result.content}\n\n")
                 else:
-                    result_content += f"结果:\n{result['content']}\n\n"
+                    parts.append(f"结果:\n{result.content}\n\n")
 
-        return result_content
+        return "".join(parts)
     except Exception as e:
         print(f"[错误] 格式化工具结果时出错: {e}")
         return f"格式化工具结果时出错: {e}\n\n原始结果: {all_results}"
 
 
-async def process_and_execute_tool_calls(content, workbench, agent_name, cancellation_token):
+async def process_and_execute_tool_calls(content, workbench, agent_name, cancellation_token, use_cache=False):
     """
     处理并执行AI助手回复中的工具调用。
 
@@ -465,6 +805,8 @@ async def process_and_execute_tool_calls(content, workbench, agent_name, cancell
         workbench: 工具工作台
         agent_name: 代理名称
         cancellation_token: 取消令牌
+        use_cache: 是否复用相同内容的上一次执行结果。仅适用于幂等的工具调用，
+            只有全部工具都执行成功的结果才会被缓存，可用 clear_memo_cache() 清空
 
     Returns:
         元组 (结果内容, 是否成功, 错误消息)
@@ -472,9 +814,20 @@ async def process_and_execute_tool_calls(content, workbench, agent_name, cancell
         - 如果失败，结果内容为原始内容或错误信息
     """
 
-    if not isinstance(content, str) or "tool_calls" not in content:
+    # 先做 O(1) 的长度检查，再做子串查找
+    if (not isinstance(content, str) or len(content) < _MIN_TOOL_CALL_LENGTH
+            or "tool_calls" not in content or "{" not in content):
         return content, True, ""
 
+    cache_key = None
+    if use_cache:
+        cache_key = (agent_name, hashlib.sha256(content.encode("utf-8")).hexdigest())
+        cached = _RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(cache_key)
+            print("[系统] 使用缓存的工具调用结果")
+            return cached, True, ""
+
     print("\n[系统] 解析工具调用...")
     try:
         # 步骤1: 解析工具调用JSON
@@ -508,6 +861,12 @@ async def process_and_execute_tool_calls(content, workbench, agent_name, cancell
         # 步骤4: 格式化结果，包含JSON解析错误信息
         result_content = _format_tool_results(all_results, json_error_message)
 
+        # 只缓存全部成功的结果
+        if cache_key is not None and success and all(r.success for r in all_results):
+            _RESULT_CACHE[cache_key] = result_content
+            if len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+
         # 返回格式化后的结果内容
         return result_content, True, ""
 
@@ -530,7 +889,9 @@ async def process_and_execute_tool_calls(content, workbench, agent_name, cancell
     'process_tool_calls_json',
 
     # 工具调用执行函数
+    'ToolResult',
     'process_and_execute_tool_calls',
+    'clear_memo_cache',
 
     # 辅助函数 (内部使用)
     '_create_function_calls',
@@ -20,11 +20,6 @@
 # 注意：process_and_execute_tool_calls 会在需要时动态导入
 # 这样可以避免循环导入问题
 
-# 使用全局字典存储消息数据
-_message_data = {}
-# 消息计数器，用于生成唯一ID
-_message_counter = 0
-
 class ToolCallMessage(TextMessage):
     """
     工具调用消息类型，继承自TextMessage
@@ -62,42 +57,39 @@ def __init__(
         # 调用父类初始化方法
         super().__init__(source=source, content=content, metadata=metadata)
 
-        # 生成唯一ID
-        global _message_counter
-        self._message_id = f"msg_{_message_counter}"
-        _message_counter += 1
-
-        # 在全局字典中存储工作台和取消令牌
-        _message_data[self._message_id] = {
-            "workbench": workbench,
-            "cancellation_token": cancellation_token,
-            "processed": processed
-        }
+        # 工作台、取消令牌和处理状态直接保存在实例上（下划线属性不属于模型字段），
+        # 随消息一起释放
+        self._workbench = workbench
+        self._cancellation_token = cancellation_token
+        self._processed = processed
 
     def get_data(self):
         """获取消息关联的数据"""
-        return _message_data.get(self._message_id, {})
+        return {
+            "workbench": self._workbench,
+            "cancellation_token": self._cancellation_token,
+            "processed": self._processed
+        }
 
     @property
     def workbench(self) -> Optional[StaticWorkbench]:
         """获取工作台"""
-        return self.get_data().get("workbench")
+        return self._workbench
 
     @property
     def cancellation_token(self) -> Optional[CancellationToken]:
         """获取取消令牌"""
-        return self.get_data().get("cancellation_token")
+        return self._cancellation_token
 
     @property
     def processed(self) -> bool:
         """获取处理状态"""
-        return self.get_data().get("processed", False)
+        return self._processed
 
     @processed.setter
     def processed(self, value: bool):
         """设置处理状态"""
-        if self._message_id in _message_data:
-            _message_data[self._message_id]["processed"] = value
+        self._processed = value
         # 同时更新元数据中的字符串表示
         self.metadata["processed"] = str(value).lower()
 
@@ -112,8 +104,10 @@ async def process_tool_calls(self) -> str:
             print(f"[调试] {self.source} 的消息已处理或没有工作台，跳过处理")
             return self.content
 
-        # 简化检测逻辑，只检查内容中是否包含"tool_calls"关键字
-        if "tool_calls" not in self.content:
+        # 简化检测逻辑，只检查内容中是否包含"tool_calls"关键字；
+        # 过短的内容不可能包含工具调用，长度下限与 json_parser 共用同一常量
+        from utils.json_parser import _MIN_TOOL_CALL_LENGTH
+        if len(self.content) < _MIN_TOOL_CALL_LENGTH or "tool_calls" not in self.content:
             print(f"[调试] {self.source} 的消息不包含工具调用，跳过处理")
             return self.content
 
@@ -136,8 +130,10 @@ async def process_tool_calls(self) -> str:
             if success:
                 print(f"[系统] 成功处理 {self.source} 的工具调用，处理结果: {processed_content[:200]}...")
 
-                # 检查处理后的内容是否仍然包含工具调用
-                if "tool_calls" in processed_content:
+                # 检查处理后的内容是否仍然是工具调用JSON。格式化后的结果文本
+                # 可能只是提到了 tool_calls（例如命令输出），此时不应再次解析执行
+                if ('"tool_calls"' in processed_content
+                        and processed_content.lstrip().startswith(('{', '['))):
                     print(f"[警告] 处理后的内容仍然包含工具调用，尝试递归处理")
                     # 递归处理
                     recursive_processed_content, recursive_success, recursive_error = await process_and_execute_tool_calls(
@@ -15,11 +15,15 @@
 """
 
 import os
+import copy
 import json
+import mmap
 import re
 import shutil
+import stat
+import threading
 import time
-from typing import Dict, Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Tuple, Union
 from typing_extensions import Annotated
 import datetime
 
@@ -34,6 +38,25 @@ def __init__(self, func, **kwargs):
             self.func = func
             self.kwargs = kwargs
 
+# 尝试导入 orjson 用于加速任务、模板和配置文件的读写
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("提示：未能导入 orjson，任务文件读写将使用标准库 json。可运行 'pip install orjson' 安装。")
+
+# 尝试导入 pysimdjson，用于只读取少量字段的场景（按需物化，避免构建完整对象树）
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+    # 解析器可复用，但同一时刻只能有一份文档存活，因此通过锁串行化访问
+    _SIMD_PARSER = simdjson.Parser()
+    _SIMD_LOCK = threading.Lock()
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+    print("提示：未能导入 pysimdjson，模板和团队成员的只读查询将完整解析 JSON。可运行 'pip install pysimdjson' 安装。")
+
 # 默认配置
 DEFAULT_CONFIG = {
     "models": {
@@ -226,8 +249,165 @@ def __init__(self, func, **kwargs):
 # 任务优先级常量
 TASK_PRIORITY = ["high", "medium", "low"]
 
+# 用户自定义模板的必要字段（元组保持报错时的字段顺序，集合用于一次性检查）
+_REQUIRED_TEMPLATE_FIELDS = ("title", "description", "status", "priority")
+_REQUIRED_TEMPLATE_FIELD_SET = frozenset(_REQUIRED_TEMPLATE_FIELDS)
+
+# 超过该大小（字节）的任务文件通过 mmap 读取；小文件上 mmap 的固定开销反而比 read() 更大
+_MMAP_MIN_SIZE = 64 * 1024
+
+# clean_json_string 使用的预编译正则
+_JSON_COMMENT_RE = re.compile(r'//.*?$|/\*.*?\*/', re.MULTILINE | re.DOTALL)
+_CONTROL_CHAR_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_SINGLE_QUOTE_RE = re.compile(r'(?<!\\)\'')
+_UNQUOTED_KEY_RE = re.compile(r'([{,])\s*([a-zA-Z0-9_]+)\s*:')
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_MISSING_VALUE_RE = re.compile(r'("[\w\s]+"\s*:)\s*([,}])')
+_PY_TRUE_RE = re.compile(r':\s*True\b')
+_PY_FALSE_RE = re.compile(r':\s*False\b')
+_PY_NONE_RE = re.compile(r':\s*None\b')
+
+# 只读查询结果的缓存: {文件绝对路径: (st_mtime_ns, st_size, {缓存键: 提取结果})}
+_JSON_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
 # 工具函数
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """解析 JSON 文本，优先使用 orjson。解析失败时统一抛出 json.JSONDecodeError"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # 交给标准库给出一致的错误信息（以及对 NaN 等扩展语法的兼容）
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """
+    将对象序列化为 2 空格缩进、不转义非 ASCII 字符的 UTF-8 JSON 字节串，优先使用 orjson
+
+    输出格式与 json.dump(obj, f, indent=2, ensure_ascii=False) 一致，可直接以二进制写盘。
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson 无法序列化的对象（如超出 64 位的整数）回退到标准库
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _read_json(path: str) -> Any:
+    """读取并解析 JSON 文件"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+def _write_json(path: str, obj: Any) -> None:
+    """
+    将对象以 2 空格缩进的 JSON 格式原子地写入文件
+
+    先完整写入同目录下的临时文件并 fsync，再用 os.replace 替换目标文件，
+    写入中途出错或进程崩溃时不会留下截断的 JSON 文件。
+    目标是符号链接时替换的是链接指向的文件，已有文件的权限会保留。
+    """
+    data = memoryview(_json_dumps(obj))
+    real_path = os.path.realpath(path)
+    tmp_path = f"{real_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(real_path).st_mode))
+        except FileNotFoundError:
+            pass  # 新建文件，沿用 os.open 按 umask 得到的权限
+        os.replace(tmp_path, real_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _JSON_CACHE.pop(os.path.abspath(path), None)
+    _JSON_CACHE.pop(real_path, None)
+
+def _to_python(value: Any) -> Any:
+    """将 simdjson 的惰性代理对象转换为普通的 dict/list，其他值原样返回"""
+    if SIMDJSON_AVAILABLE:
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+    return value
+
+def _read_json_view(path: str, extract, cache_key: Optional[str] = None) -> Any:
+    """
+    读取 JSON 文件，并只物化 extract 取出的部分
+
+    可用 pysimdjson 时，extract 接收惰性代理对象，只有被访问的字段才会转换为 Python 对象；
+    否则接收完整解析的结果。extract 的返回值不能引用代理对象（必要时使用 _to_python 转换），
+    因为解析器复用后旧文档即失效。
+
+    指定 cache_key 时，提取结果按文件的 (st_mtime_ns, st_size) 缓存，文件未变化时直接返回，
+    不再读取和解析。缓存的结果由所有调用方共享，调用方不得修改。
+
+    Args:
+        path: JSON 文件路径
+        extract: 从解析结果中取出所需数据的函数
+        cache_key: 缓存键，同一文件上不同的 extract 需使用不同的键；为None时不缓存
+
+    Returns:
+        extract 的返回值
+
+    Raises:
+        json.JSONDecodeError: 文件内容不是合法的 JSON
+    """
+    if cache_key is not None:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        entry = _JSON_CACHE.get(path)
+        if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            entry = (st.st_mtime_ns, st.st_size, {})
+            _JSON_CACHE[path] = entry
+        views = entry[2]
+        if cache_key not in views:
+            views[cache_key] = _read_json_view(path, extract)
+        return views[cache_key]
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    if SIMDJSON_AVAILABLE:
+        with _SIMD_LOCK:
+            try:
+                doc = _SIMD_PARSER.parse(data)
+            except (ValueError, RuntimeError):
+                doc = None  # 交给下面的完整解析给出一致的错误（或兼容 NaN 等扩展语法）
+            if doc is not None:
+                try:
+                    return extract(doc)
+                finally:
+                    del doc
+    return extract(_json_loads(data))
+
+def _load_json_mmap(path: str) -> Tuple[Any, Optional[str]]:
+    """
+    通过 mmap 将文件内容直接交给 orjson 解析，省去中间的 bytes 和 str 副本
+
+    Returns:
+        (result, content): 解析成功时为 (解析结果, None)；
+        解析失败时为 (None, 解码后的文件文本)，供后续的修复流程使用
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view), None
+            except orjson.JSONDecodeError:
+                return None, mm[:].decode('utf-8')
+            finally:
+                view.release()
+
 def find_tasks_json_path(project_root: Optional[str] = None) -> str:
     """
     查找tasks.json文件的路径
@@ -267,11 +447,20 @@ def load_tasks(tasks_path: str) -> Dict:
         任务数据字典
     """
     try:
-        with open(tasks_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        result = content = None
+        if ORJSON_AVAILABLE and os.path.getsize(tasks_path) > _MMAP_MIN_SIZE:
+            result, content = _load_json_mmap(tasks_path)
+
+        if result is not None:
+            success, error = True, None
+        else:
+            if content is None:
+                with open(tasks_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+
+            # 使用安全的JSON解析
+            success, result, error = safe_json_loads(content)
 
-        # 使用安全的JSON解析
-        success, result, error = safe_json_loads(content)
         if success:
             # 验证基本结构
             if "tasks" not in result:
@@ -288,7 +477,7 @@ def load_tasks(tasks_path: str) -> Dict:
             print("尝试修复JSON格式...")
             cleaned_content = clean_json_string(content)
             try:
-                result = json.loads(cleaned_content)
+                result = _json_loads(cleaned_content)
                 # 验证基本结构
                 if "tasks" not in result:
                     result["tasks"] = []
@@ -322,8 +511,7 @@ def save_tasks(tasks_data: Dict, tasks_path: str) -> None:
     # 确保目录存在
     os.makedirs(os.path.dirname(tasks_path), exist_ok=True)
 
-    with open(tasks_path, 'w', encoding='utf-8') as f:
-        json.dump(tasks_data, f, indent=2, ensure_ascii=False)
+    _write_json(tasks_path, tasks_data)
 
 # 核心功能函数
 
@@ -338,78 +526,86 @@ def list_templates(
     if project_root is None:
         project_root = os.getcwd()
 
+    # 取出报告需要的字段: (名称, 标题, 优先级, 子任务数, 标签)
+    def summarize(templates):
+        return [
+            (name, template['title'], template['priority'],
+             len(template.get("subtasks", [])), ", ".join(template.get("tags", [])) or "无")
+            for name, template in templates.items()
+        ]
+
     # 获取系统预定义模板
-    system_templates = DEFAULT_TEMPLATES.keys()
+    system_templates = summarize(DEFAULT_TEMPLATES)
 
     # 获取用户自定义模板
     user_templates = []
     templates_path = os.path.join(project_root, ".taskmaster", "templates.json")
     if os.path.isfile(templates_path):
         try:
-            with open(templates_path, 'r', encoding='utf-8') as f:
-                user_templates_data = json.load(f)
-                user_templates = user_templates_data.keys()
+            user_templates = _read_json_view(templates_path, summarize, cache_key="summary")
         except (json.JSONDecodeError, FileNotFoundError):
             pass
 
     # 生成报告
     report = ["可用的任务模板:"]
+    report_append = report.append
 
     # 系统预定义模板
-    report.append("\n系统预定义模板:")
-    for template_name in system_templates:
-        template = DEFAULT_TEMPLATES[template_name]
-        subtasks_count = len(template.get("subtasks", []))
-        tags = ", ".join(template.get("tags", [])) or "无"
-        report.append(f"  - {template_name}: {template['title']} (优先级: {template['priority']}, 子任务: {subtasks_count}, 标签: {tags})")
+    report_append("\n系统预定义模板:")
+    for template_name, title, priority, subtasks_count, tags in system_templates:
+        report_append(f"  - {template_name}: {title} (优先级: {priority}, 子任务: {subtasks_count}, 标签: {tags})")
 
     # 用户自定义模板
     if user_templates:
-        report.append("\n用户自定义模板:")
-        try:
-            with open(templates_path, 'r', encoding='utf-8') as f:
-                user_templates_data = json.load(f)
-                for template_name in user_templates:
-                    template = user_templates_data[template_name]
-                    subtasks_count = len(template.get("subtasks", []))
-                    tags = ", ".join(template.get("tags", [])) or "无"
-                    report.append(f"  - {template_name}: {template['title']} (优先级: {template['priority']}, 子任务: {subtasks_count}, 标签: {tags})")
-        except (json.JSONDecodeError, FileNotFoundError):
-            report.append("  无法读取用户自定义模板")
+        report_append("\n用户自定义模板:")
+        for template_name, title, priority, subtasks_count, tags in user_templates:
+            report_append(f"  - {template_name}: {title} (优先级: {priority}, 子任务: {subtasks_count}, 标签: {tags})")
     else:
-        report.append("\n没有用户自定义模板")
+        report_append("\n没有用户自定义模板")
 
     return "\n".join(report)
 
-def get_template(
-    template_name: Annotated[str, "模板名称"],
-    project_root: Annotated[str, "项目根目录，默认为当前目录"] = None
-) -> Dict:
+def _get_template_readonly(template_name: str, project_root: str) -> Dict:
     """
-    获取指定名称的任务模板
+    获取指定名称的任务模板，不做拷贝
 
+    返回的对象是系统预定义模板本身或缓存中的用户模板，调用方只能读取，不得修改。
     如果找不到指定模板，返回默认模板
     """
-    if project_root is None:
-        project_root = os.getcwd()
-
     # 首先检查系统预定义模板
     if template_name in DEFAULT_TEMPLATES:
-        return DEFAULT_TEMPLATES[template_name].copy()
+        return DEFAULT_TEMPLATES[template_name]
 
     # 然后检查用户自定义模板
     templates_path = os.path.join(project_root, ".taskmaster", "templates.json")
     if os.path.isfile(templates_path):
         try:
-            with open(templates_path, 'r', encoding='utf-8') as f:
-                user_templates = json.load(f)
-                if template_name in user_templates:
-                    return user_templates[template_name].copy()
+            template = _read_json_view(
+                templates_path,
+                lambda templates: _to_python(templates[template_name]) if template_name in templates else None,
+                cache_key=f"template:{template_name}"
+            )
+            if template is not None:
+                return template
         except (json.JSONDecodeError, FileNotFoundError):
             pass
 
     # 如果找不到指定模板，返回默认模板
-    return DEFAULT_TEMPLATES["default"].copy()
+    return DEFAULT_TEMPLATES["default"]
+
+def get_template(
+    template_name: Annotated[str, "模板名称"],
+    project_root: Annotated[str, "项目根目录，默认为当前目录"] = None
+) -> Dict:
+    """
+    获取指定名称的任务模板
+
+    如果找不到指定模板，返回默认模板。返回的是深拷贝，修改它不会影响模板本身
+    """
+    if project_root is None:
+        project_root = os.getcwd()
+
+    return copy.deepcopy(_get_template_readonly(template_name, project_root))
 
 def save_template(
     template_name: Annotated[str, "模板名称"],
@@ -429,10 +625,10 @@ def save_template(
         return f"错误: 不能覆盖系统预定义模板 '{template_name}'"
 
     # 确保模板数据包含必要的字段
-    required_fields = ["title", "description", "status", "priority"]
-    for field in required_fields:
-        if field not in template_data:
-            return f"错误: 模板数据缺少必要字段 '{field}'"
+    missing_fields = _REQUIRED_TEMPLATE_FIELD_SET.difference(template_data)
+    if missing_fields:
+        field = next(f for f in _REQUIRED_TEMPLATE_FIELDS if f in missing_fields)
+        return f"错误: 模板数据缺少必要字段 '{field}'"
 
     # 确保目录存在
     templates_dir = os.path.join(project_root, ".taskmaster")
@@ -443,8 +639,7 @@ def save_template(
     templates = {}
     if os.path.isfile(templates_path):
         try:
-            with open(templates_path, 'r', encoding='utf-8') as f:
-                templates = json.load(f)
+            templates = _read_json(templates_path)
         except json.JSONDecodeError:
             pass
 
@@ -452,8 +647,7 @@ def save_template(
     templates[template_name] = template_data
 
     # 保存模板
-    with open(templates_path, 'w', encoding='utf-8') as f:
-        json.dump(templates, f, indent=2, ensure_ascii=False)
+    _write_json(templates_path, templates)
 
     return f"模板 '{template_name}' 已保存"
 
@@ -479,8 +673,7 @@ def delete_template(
         return f"错误: 找不到用户自定义模板 '{template_name}'"
 
     try:
-        with open(templates_path, 'r', encoding='utf-8') as f:
-            templates = json.load(f)
+        templates = _read_json(templates_path)
     except json.JSONDecodeError:
         return f"错误: 无法读取模板文件"
 
@@ -492,8 +685,7 @@ def delete_template(
     del templates[template_name]
 
     # 保存模板
-    with open(templates_path, 'w', encoding='utf-8') as f:
-        json.dump(templates, f, indent=2, ensure_ascii=False)
+    _write_json(templates_path, templates)
 
     return f"模板 '{template_name}' 已删除"
 
@@ -523,8 +715,8 @@ def add_task(
     if status not in TASK_STATUS:
         return f"错误: 无效的状态 '{status}'。有效状态: {', '.join(TASK_STATUS)}"
 
-    # 获取模板
-    template_data = get_template(template, project_root)
+    # 获取模板（只读，新任务中的字段都会重新构建）
+    template_data = _get_template_readonly(template, project_root)
 
     try:
         tasks_path = find_tasks_json_path(project_root)
@@ -537,7 +729,7 @@ def add_task(
         dependencies = []
 
     tasks = tasks_data.get("tasks", [])
-    task_ids = [task.get("id") for task in tasks]
+    task_ids = {task.get("id") for task in tasks}
 
     invalid_deps = [dep_id for dep_id in dependencies if dep_id not in task_ids]
     if invalid_deps:
@@ -555,7 +747,7 @@ def add_task(
         "priority": priority if priority is not None else template_data.get("priority", "medium"),
         "dependencies": dependencies,
         "subtasks": [],
-        "tags": tags if tags is not None else template_data.get("tags", [])
+        "tags": tags if tags is not None else list(template_data.get("tags", []))
     }
 
     # 如果模板中有子任务，添加到新任务中
@@ -583,6 +775,48 @@ def add_task(
     else:
         return f"已添加新任务 '{new_task_id}'，标题为 '{title}'"
 
+def _ensure_group_chat_file(groups_by_id: Dict[Any, Dict], group: Dict, project_root: str) -> str:
+    """
+    获取组的群聊文件路径，组还没有群聊文件时按"上上级-上级-组名"的层级创建
+
+    Args:
+        groups_by_id: 以组ID为键的组索引
+        group: 组数据，创建群聊文件后会更新其 chat_file 字段
+        project_root: 项目根目录
+
+    Returns:
+        群聊文件相对于项目根目录的路径
+    """
+    chat_file = group.get("chat_file")
+    if chat_file:
+        return chat_file
+
+    # 自下而上收集该组及其所有上级组的名称，构建完整的组路径名称
+    names = [group.get("name", "")]
+    parent_id = group.get("parent_id")
+    while parent_id:
+        parent = groups_by_id.get(parent_id)
+        if parent is None:
+            break
+        names.append(parent.get("name", ""))
+        parent_id = parent.get("parent_id")
+    full_path = "-".join(reversed(names))
+
+    # 将路径名称转换为文件系统路径，一次性创建层级目录结构
+    group_path_parts = full_path.split("-")
+    os.makedirs(os.path.join(project_root, "ProjectTask", "GroupChat", "Groups", *group_path_parts), exist_ok=True)
+
+    # 创建群聊文件
+    chat_file = os.path.join("ProjectTask", "GroupChat", "Groups", *group_path_parts, "group_chat.txt")
+    full_chat_path = os.path.join(project_root, chat_file)
+    if not os.path.exists(full_chat_path):
+        with open(full_chat_path, 'w', encoding='utf-8') as f:
+            f.write(f"# {full_path} 群聊\n创建时间: {datetime.datetime.now().isoformat()}\n\n")
+
+    # 更新组的群聊文件路径
+    group["chat_file"] = chat_file
+    return chat_file
+
 def add_team_member(
     username: Annotated[str, "用户名"],
     role: Annotated[str, "角色名称，例如：产品经理、开发工程师、UI设计师、测试工程师等，支持自定义"],
@@ -605,8 +839,7 @@ def add_team_member(
         return f"错误: 找不到配置文件。请先初始化项目。"
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = _read_json(config_path)
     except json.JSONDecodeError:
         return f"错误: 无法解析配置文件。"
 
@@ -648,154 +881,51 @@ def add_team_member(
     parent_group_id = None
 
     if group_id:
-        group_found = False
-        group_name = ""
-
-        for group in config["team"].get("groups", []):
-            if group.get("id") == group_id:
-                group_found = True
-                group_name = group.get("name", "")
-
-                # 检查该组是否已有组长
-                if "leader" in group and group["leader"]:
-                    # 如果组已有组长，则新成员为普通成员
-                    if "members" not in group:
-                        group["members"] = []
-                    group["members"].append(username)
-                else:
-                    # 如果组没有组长，则新成员为组长
-                    group["leader"] = username
-                    if "members" not in group:
-                        group["members"] = []
-                    group["members"].append(username)
-                    is_group_leader = True
-
-                # 获取父组ID
-                parent_group_id = group.get("parent_id")
-
-                # 获取组的群聊文件路径
-                group_chat_file = None
-                for g in config["team"].get("groups", []):
-                    if g.get("id") == group_id:
-                        group_chat_file = g.get("chat_file")
-                        break
-
-                if not group_chat_file:
-                    # 如果找不到群聊文件，创建一个新的
-                    # 构建完整的组路径名称
-                    full_path = group_name
-                    parent_id = group.get("parent_id")
-
-                    # 递归查找父组路径
-                    while parent_id:
-                        for g in config["team"].get("groups", []):
-                            if g.get("id") == parent_id:
-                                parent_name = g.get("name", "")
-                                full_path = f"{parent_name}-{full_path}"
-                                parent_id = g.get("parent_id")
-                                break
-                        else:
-                            parent_id = None
-
-                    # 创建群组目录和群聊文件
-                    groups_dir = os.path.join(project_root, "ProjectTask", "GroupChat", "Groups")
-
-                    # 将路径名称转换为文件系统路径
-                    group_path_parts = full_path.split("-")
-                    current_path = groups_dir
-
-                    # 创建层级目录结构
-                    for i, part in enumerate(group_path_parts):
-                        current_path = os.path.join(current_path, part)
-                        os.makedirs(current_path, exist_ok=True)
-
-                    # 创建群聊文件
-                    group_chat_file = os.path.join("ProjectTask", "GroupChat", "Groups", *group_path_parts, "group_chat.txt")
-                    full_group_chat_path = os.path.join(project_root, group_chat_file)
-
-                    if not os.path.exists(full_group_chat_path):
-                        with open(full_group_chat_path, 'w', encoding='utf-8') as f:
-                            f.write(f"# {full_path} 群聊\n创建时间: {datetime.datetime.now().isoformat()}\n\n")
-
-                    # 更新组的群聊文件路径
-                    group["chat_file"] = group_chat_file
-
-                # 添加到通讯地址列表
-                communication_files.append({
-                    "type": "group_chat",
-                    "group_id": group_id,
-                    "file_path": group_chat_file,
-                    "description": f"{group_name} 组群聊"
-                })
-
-                break
+        # 按ID索引所有组，重复ID时与线性查找一样以第一个为准
+        groups_by_id = {g.get("id"): g for g in reversed(config["team"].get("groups", []))}
 
-        if not group_found:
+        group = groups_by_id.get(group_id)
+        if group is None:
             return f"错误: 找不到ID为 '{group_id}' 的组。"
 
-        # 如果是组长且父组存在，添加父组群聊通讯文件
-        if is_group_leader and parent_group_id:
-            parent_group_name = ""
-            for group in config["team"].get("groups", []):
-                if group.get("id") == parent_group_id:
-                    parent_group_name = group.get("name", "")
-                    break
-
-            # 获取父组的群聊文件路径
-            parent_group_chat_file = None
-            for g in config["team"].get("groups", []):
-                if g.get("id") == parent_group_id:
-                    parent_group_chat_file = g.get("chat_file")
-                    break
-
-            if not parent_group_chat_file:
-                # 如果找不到父组群聊文件，创建一个新的
-                # 构建完整的父组路径名称
-                full_path = parent_group_name
-                parent_id = None
-
-                # 查找父组的父组ID
-                for g in config["team"].get("groups", []):
-                    if g.get("id") == parent_group_id:
-                        parent_id = g.get("parent_id")
-                        break
-
-                # 递归查找父组路径
-                while parent_id:
-                    for g in config["team"].get("groups", []):
-                        if g.get("id") == parent_id:
-                            parent_name = g.get("name", "")
-                            full_path = f"{parent_name}-{full_path}"
-                            parent_id = g.get("parent_id")
-                            break
-                    else:
-                        parent_id = None
+        group_name = group.get("name", "")
 
-                # 创建群组目录和群聊文件
-                groups_dir = os.path.join(project_root, "ProjectTask", "GroupChat", "Groups")
+        # 检查该组是否已有组长
+        if "leader" in group and group["leader"]:
+            # 如果组已有组长，则新成员为普通成员
+            if "members" not in group:
+                group["members"] = []
+            group["members"].append(username)
+        else:
+            # 如果组没有组长，则新成员为组长
+            group["leader"] = username
+            if "members" not in group:
+                group["members"] = []
+            group["members"].append(username)
+            is_group_leader = True
 
-                # 将路径名称转换为文件系统路径
-                group_path_parts = full_path.split("-")
-                current_path = groups_dir
+        # 获取父组ID
+        parent_group_id = group.get("parent_id")
 
-                # 创建层级目录结构
-                for i, part in enumerate(group_path_parts):
-                    current_path = os.path.join(current_path, part)
-                    os.makedirs(current_path, exist_ok=True)
+        # 获取组的群聊文件路径，不存在时创建
+        group_chat_file = _ensure_group_chat_file(groups_by_id, group, project_root)
 
-                # 创建群聊文件
-                parent_group_chat_file = os.path.join("ProjectTask", "GroupChat", "Groups", *group_path_parts, "group_chat.txt")
-                full_parent_group_chat_path = os.path.join(project_root, parent_group_chat_file)
+        # 添加到通讯地址列表
+        communication_files.append({
+            "type": "group_chat",
+            "group_id": group_id,
+            "file_path": group_chat_file,
+            "description": f"{group_name} 组群聊"
+        })
 
-                if not os.path.exists(full_parent_group_chat_path):
-                    with open(full_parent_group_chat_path, 'w', encoding='utf-8') as f:
-                        f.write(f"# {full_path} 群聊\n创建时间: {datetime.datetime.now().isoformat()}\n\n")
+        # 如果是组长且父组存在，添加父组群聊通讯文件
+        if is_group_leader and parent_group_id:
+            # 父组不存在时按空组处理
+            parent_group = groups_by_id.get(parent_group_id, {})
+            parent_group_name = parent_group.get("name", "")
 
-                # 更新父组的群聊文件路径
-                for g in config["team"].get("groups", []):
-                    if g.get("id") == parent_group_id:
-                        g["chat_file"] = parent_group_chat_file
-                        break
+            # 获取父组的群聊文件路径，不存在时创建
+            parent_group_chat_file = _ensure_group_chat_file(groups_by_id, parent_group, project_root)
 
             # 添加到通讯地址列表
             communication_files.append({
@@ -819,8 +949,7 @@ def add_team_member(
     config["team"]["members"].append(new_member)
 
     # 保存配置
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    _write_json(config_path, config)
 
     result = f"已添加团队成员 '{username}' 并分配角色 '{role}'"
 
@@ -853,8 +982,7 @@ def remove_team_member(
         return f"错误: 找不到配置文件。请先初始化项目。"
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = _read_json(config_path)
     except json.JSONDecodeError:
         return f"错误: 无法解析配置文件。"
 
@@ -881,30 +1009,23 @@ def remove_team_member(
     if not found:
         return f"错误: 找不到用户 '{username}'。"
 
-    # 检查用户是否是任何组的组长
-    is_leader = False
+    # 一次遍历所有组：检查用户是否是组长，同时将其从组成员中移除
+    # （如果是组长则直接返回错误，配置不会保存，移除操作随之丢弃）
     leader_groups = []
 
-    if "groups" in config["team"]:
-        for group in config["team"]["groups"]:
-            if group.get("leader") == username:
-                is_leader = True
-                leader_groups.append(group.get("name", group.get("id", "")))
+    for group in config["team"].get("groups", []):
+        if group.get("leader") == username:
+            leader_groups.append(group.get("name", group.get("id", "")))
+        if username in group.get("members", []):
+            group["members"].remove(username)
 
-    if is_leader:
+    if leader_groups:
         # 恢复删除的成员
         members.append(removed_member)
         return f"错误: 用户 '{username}' 是以下组的组长，不能移除: {', '.join(leader_groups)}。请先更换组长或删除这些组。"
 
-    # 从所有组中移除该成员
-    if "groups" in config["team"]:
-        for group in config["team"]["groups"]:
-            if username in group.get("members", []):
-                group["members"].remove(username)
-
     # 保存配置
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    _write_json(config_path, config)
 
     # 处理通讯文件（归档个人通讯文件，保留群聊文件）
     archived_files = []
@@ -926,10 +1047,12 @@ def remove_team_member(
                 archive_path = os.path.join(archive_dir, archive_file_name)
 
                 try:
-                    # 复制到归档
-                    shutil.copy2(full_file_path, archive_path)
-                    # 删除原文件
-                    os.remove(full_file_path)
+                    # 移动到归档（同一文件系统内只是重命名，不复制文件内容）
+                    try:
+                        os.replace(full_file_path, archive_path)
+                    except OSError:
+                        # 跨文件系统等无法重命名的情况，回退为复制后删除
+                        shutil.move(full_file_path, archive_path)
                     archived_files.append(file_path)
                 except Exception as e:
                     return f"已移除团队成员 '{username}'，但处理通讯文件时出错: {str(e)}"
@@ -958,35 +1081,32 @@ def list_team_members(
         return f"错误: 找不到配置文件。请先初始化项目。"
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        # 只物化 team 部分，模型等其他配置不会被转换为 Python 对象
+        team = _read_json_view(config_path, lambda config: _to_python(config.get("team")), cache_key="team")
     except json.JSONDecodeError:
         return f"错误: 无法解析配置文件。"
 
     # 确保配置中有team字段
-    if "team" not in config or "members" not in config["team"]:
+    if team is None or "members" not in team:
         return f"项目中没有团队成员。"
 
-    members = config["team"]["members"]
+    members = team["members"]
 
     if not members:
         return f"项目中没有团队成员。"
 
+    # 按ID索引所有组，重复ID时与线性查找一样以第一个为准
+    groups_by_id = {g.get("id"): g for g in reversed(team.get("groups", []))}
+
     # 如果指定了组ID，筛选该组的成员
     if group_id:
         # 先检查组是否存在
-        group_found = False
-        group_name = ""
-
-        for group in config["team"].get("groups", []):
-            if group.get("id") == group_id:
-                group_found = True
-                group_name = group.get("name", "")
-                break
-
-        if not group_found:
+        group = groups_by_id.get(group_id)
+        if group is None:
             return f"错误: 找不到ID为 '{group_id}' 的组。"
 
+        group_name = group.get("name", "")
+
         # 筛选该组的成员
         filtered_members = []
         for member in members:
@@ -1009,20 +1129,21 @@ def list_team_members(
         report = ["团队成员:"]
 
     # 生成报告
+    report_append = report.append
     for member in members:
-        username = member.get("username", "")
-        role = member.get("role", "")
-        description = member.get("description", "")
-        is_group_leader = member.get("is_group_leader", False)
-        member_group_id = member.get("group_id", "")
+        member_get = member.get
+        username = member_get("username", "")
+        role = member_get("role", "")
+        description = member_get("description", "")
+        is_group_leader = member_get("is_group_leader", False)
+        member_group_id = member_get("group_id", "")
 
         # 获取成员所属组的名称
         group_name = ""
         if member_group_id:
-            for group in config["team"].get("groups", []):
-                if group.get("id") == member_group_id:
-                    group_name = group.get("name", "")
-                    break
+            group = groups_by_id.get(member_group_id)
+            if group is not None:
+                group_name = group.get("name", "")
 
         # 构建成员信息
         if is_group_leader and group_name:
@@ -1035,13 +1156,15 @@ def list_team_members(
         if description:
             member_info += f" 描述: {description}"
 
-        report.append(member_info)
+        report_append(member_info)
 
         # 添加通讯地址信息
         if "communication_files" in member:
-            report.append(f"    通讯地址:")
-            for comm_file in member["communication_files"]:
-                report.append(f"    - {comm_file.get('description', '')}: {comm_file.get('file_path', '')}")
+            report_append("    通讯地址:")
+            report.extend(
+                f"    - {comm_file.get('description', '')}: {comm_file.get('file_path', '')}"
+                for comm_file in member["communication_files"]
+            )
 
     return "\n".join(report)
 
@@ -4573,28 +4696,35 @@ def clean_json_string(json_str: str) -> str:
     if not json_str:
         return "{}"
 
+    # 以下各步骤先用 in 检查是否存在相关字符，不存在时跳过正则替换
+
     # 移除注释
-    json_str = re.sub(r'//.*?$|/\*.*?\*/', '', json_str, flags=re.MULTILINE | re.DOTALL)
+    if '/' in json_str:
+        json_str = _JSON_COMMENT_RE.sub('', json_str)
 
     # 移除可能导致问题的控制字符
-    json_str = ''.join(ch for ch in json_str if ch >= ' ' or ch in '\n\r\t')
+    json_str = _CONTROL_CHAR_RE.sub('', json_str)
 
     # 替换单引号为双引号（但不替换转义的单引号）
-    json_str = re.sub(r'(?<!\\)\'', '"', json_str)
+    if "'" in json_str:
+        json_str = _SINGLE_QUOTE_RE.sub('"', json_str)
 
     # 修复键没有引号的问题
-    json_str = re.sub(r'([{,])\s*([a-zA-Z0-9_]+)\s*:', r'\1"\2":', json_str)
+    json_str = _UNQUOTED_KEY_RE.sub(r'\1"\2":', json_str)
 
     # 修复多余的逗号
-    json_str = re.sub(r',\s*([}\]])', r'\1', json_str)
+    json_str = _TRAILING_COMMA_RE.sub(r'\1', json_str)
 
     # 修复缺少值的键（将null作为默认值）
-    json_str = re.sub(r'("[\w\s]+"\s*:)\s*([,}])', r'\1null\2', json_str)
+    json_str = _MISSING_VALUE_RE.sub(r'\1null\2', json_str)
 
     # 修复错误的布尔值和null值（小写）
-    json_str = re.sub(r':\s*True\b', r':true', json_str)
-    json_str = re.sub(r':\s*False\b', r':false', json_str)
-    json_str = re.sub(r':\s*None\b', r':null', json_str)
+    if 'True' in json_str:
+        json_str = _PY_TRUE_RE.sub(r':true', json_str)
+    if 'False' in json_str:
+        json_str = _PY_FALSE_RE.sub(r':false', json_str)
+    if 'None' in json_str:
+        json_str = _PY_NONE_RE.sub(r':null', json_str)
 
     # 检查并修复未闭合的括号
     open_braces = json_str.count('{')
@@ -4609,7 +4739,7 @@ def clean_json_string(json_str: str) -> str:
         json_str += ']' * (open_brackets - close_brackets)
 
     # 确保JSON字符串至少是一个有效的对象
-    if not json_str.strip().startswith('{') and not json_str.strip().startswith('['):
+    if not json_str.lstrip().startswith(('{', '[')):
         json_str = '{' + json_str + '}'
 
     return json_str
@@ -4629,7 +4759,7 @@ def safe_json_loads(json_str: str) -> tuple:
 
     try:
         # 尝试直接解析
-        result = json.loads(json_str)
+        result = _json_loads(json_str)
         return True, result, None
     except json.JSONDecodeError as e:
         # 记录原始错误
@@ -4637,7 +4767,7 @@ def safe_json_loads(json_str: str) -> tuple:
         try:
             # 尝试清理并重新解析
             cleaned_json = clean_json_string(json_str)
-            result = json.loads(cleaned_json)
+            result = _json_loads(cleaned_json)
             return True, result, None
         except json.JSONDecodeError as e2:
             # 如果仍然失败，返回详细错误信息
@@ -0,0 +1,42 @@
+"""
+file_utils 的回归测试
+"""
+
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_utils  # noqa: E402
+
+
+def _random_file(tmp_path, size):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(size))
+    return str(path)
+
+
+def test_crc32_chunked_matches_zlib(tmp_path):
+    # 大于一个读取块（1 MiB），分块累计的结果必须与整段 zlib.crc32 一致
+    file_path = _random_file(tmp_path, 3 * 1024 * 1024 + 12345)
+    with open(file_path, 'rb') as file:
+        expected = f"{zlib.crc32(file.read()):08x}"
+
+    assert file_utils._hash_file(file_path, 'crc32') == expected
+
+
+def test_crc32_mmap_matches_zlib(tmp_path):
+    file_path = _random_file(tmp_path, file_utils._MMAP_HASH_THRESHOLD + 1)
+    with open(file_path, 'rb') as file:
+        expected = f"{zlib.crc32(file.read()):08x}"
+
+    assert file_utils._hash_file(file_path, 'crc32') == expected
+
+
+def test_crc32_hasher_continues_from_previous_value():
+    hasher = file_utils._Crc32Hasher()
+    for chunk in (b"", b"hello", b" ", b"world" * 1000):
+        hasher.update(chunk)
+
+    assert hasher.hexdigest() == f"{zlib.crc32(b'hello ' + b'world' * 1000):08x}"
@@ -0,0 +1,88 @@
+"""
+json_parser 工具调用提取的回归测试
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_parser  # noqa: E402
+
+
+def _call(name, arguments):
+    return (
+        '{"type": "function", "function": {"name": "%s", "arguments": %s}}' % (name, arguments)
+    )
+
+
+def test_calls_after_unparsable_separator_are_kept():
+    # 两个工具调用之间夹着注释，整体无法解析；注释之后的调用不能被丢掉
+    content = (
+        '{"tool_calls": ['
+        + _call("read_file", '{"path": "a.txt"}')
+        + ', // next\n'
+        + _call("write_file", '{"path": "b.txt", "content": "x"}')
+        + ']}'
+    )
+    json_parser.clear_memo_cache()
+
+    calls, success, _ = json_parser.process_tool_calls_json(content)
+
+    assert success
+    assert [call["name"] for call in calls] == ["read_file", "write_file"]
+    assert json_parser._json_loads(calls[1]["arguments"]) == {"path": "b.txt", "content": "x"}
+
+
+def test_truncated_tool_calls_keep_completed_calls():
+    content = (
+        '{"tool_calls": ['
+        + _call("read_file", '{"path": "a.txt", "options": {"encoding": "utf-8"}}')
+        + ', {"type": "function", "function": {"name": "write_fi'
+    )
+    json_parser.clear_memo_cache()
+
+    calls, success, _ = json_parser.process_tool_calls_json(content)
+
+    assert success
+    assert [call["name"] for call in calls] == ["read_file"]
+    assert json_parser._json_loads(calls[0]["arguments"]) == {"path": "a.txt", "options": {"encoding": "utf-8"}}
+
+
+@pytest.mark.parametrize("broken, expected", [
+    # 对象和数组中的尾随逗号
+    ('{"a": 1, "b": 2,}', {"a": 1, "b": 2}),
+    ('[1, 2, ]', [1, 2]),
+    ('{"a": [1, 2,\n],\n}', {"a": [1, 2]}),
+    # 未引用的键
+    ('{a: 1, b_2: "x"}', {"a": 1, "b_2": "x"}),
+    ('{"a": 1, b: {c: [1, 2,],},}', {"a": 1, "b": {"c": [1, 2]}}),
+    # 字符串值里的逗号、冒号和括号保持原样
+    ('{"a": "x, }", "b": ": {"}', {"a": "x, }", "b": ": {"}),
+    ('{"a": "1,]", "b": "k: v"}', {"a": "1,]", "b": "k: v"}),
+    ('{"a": "x {", b: 1}', {"a": "x {", "b": 1}),
+    ('{"k": "a\\"b, c: 1"}', {"k": 'a"b, c: 1'}),
+    # 非法转义与反斜杠后紧跟换行
+    ('{"path": "C:\\Users\\new"}', {"path": "C:\\Users\n" + "ew"}),
+    ('{"a": "c:\\d"}', {"a": "c:\\d"}),
+    ('{"a": "line\\\nnext"}', {"a": "line\nnext"}),
+    ('{"a": "x\\\\"}', {"a": "x\\"}),
+    # 缺失的右花括号
+    ('{"a": {"b": 1}', {"a": {"b": 1}}),
+    ('{"a": {"b": 1', {"a": {"b": 1}}),
+    # 未闭合的字符串
+    ('{"a": "abc', {"a": "abc"}),
+    ('{"a": {"b": "x, }', {"a": {"b": "x, }"}}),
+    # 单引号
+    ("{'a': 1}", {"a": 1}),
+])
+def test_fix_json_string(broken, expected):
+    assert json.loads(json_parser.fix_json_string(broken)) == expected
+
+
+def test_fix_json_string_leaves_valid_json_unchanged():
+    text = '{"a": [1, {"b": "c,}"}], "d": "e\\\\f", "g": null}'
+    assert json_parser.fix_json_string(text) == text